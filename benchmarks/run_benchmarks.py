@@ -0,0 +1,267 @@
+"""
+Benchmark suite for the databricks generator.
+
+Synthesizes dbx_context_param.xlsx-shaped workbooks of increasing schema width
+(and pipeline count for batch mode), times each generator and the end-to-end
+dbx_main / dbx_batch_main, writes the results as JSON and compares them with a
+stored baseline.
+
+Run from the repo root:
+
+    python -m benchmarks.run_benchmarks                  # full suite
+    python -m benchmarks.run_benchmarks --quick          # 10/100 columns, 1/10 pipelines
+    python -m benchmarks.run_benchmarks --save-baseline  # record this machine's baseline
+
+The baseline is machine specific and is not committed; record one on the
+machine you compare on, before the change under test.
+"""
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import contextlib
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.synthetic import REPO_ROOT, make_base_path, schema_rows
+from components import c_dbx_generator as dbx
+from components.c_output_writer import OutputWriter
+from components.c_template_engine import load_template, render_template
+from components.c_workbook_loader import SchemaColumn, SchemaModel
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_RESULTS = BENCH_DIR / "results.json"
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+WIDTHS = [10, 100, 1000, 5000]
+PIPELINES = [1, 10, 100, 500]
+QUICK_WIDTHS = [10, 100]
+QUICK_PIPELINES = [1, 10]
+# Schema width used for the batch (pipeline count) cases.
+BATCH_WIDTH = 100
+
+TEXT_TEMPLATES = [
+    "dbx_job_template.txt",
+    "dev_s3_bucket_config_template.txt",
+    "pet_s3_pet_json_config_template.txt",
+    "data_sync_runner.txt",
+    "grants_dev_pet_prod.txt",
+    "instructions.txt",
+]
+
+
+def _schema(columns: int) -> SchemaModel:
+    return SchemaModel(columns=[
+        SchemaColumn(*["" if value is None else str(value) for value in row])
+        for row in schema_rows(columns)
+    ])
+
+
+def _replacements() -> dict[str, str]:
+    """The generator's own placeholder values for a synthetic pipeline, so renders fill every template."""
+    context = dbx.ContextParam(
+        p_work_space="wde", tier_suffix="_b", p_pipeline="bench_0000", p_tier="bronze",
+        p_table_name="bench_0000", p_data_domain="cu", p_frequency="daily", p_soure_file_format="csv",
+        p_header=True, p_delimeter="|", p_save_mode="append", p_source_directory="/data/bench/",
+        p_file_mask="bench_*.csv", p_file_size="4gb", p_application_name="BENCH - bench_0000",
+        p_task_key_name="bench_task", p_partition_column="txn_date, file_date", p_retention_key="txn_date",
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        return dbx.pipeline_replacements(context, _schema(BATCH_WIDTH))
+
+
+def _time(fn: Callable[[], None], repeats: int) -> list[float]:
+    samples = []
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _generator_cases(widths: list[int], work_dir: Path) -> dict[str, Callable[[], None]]:
+    # A private copy, so the template disk cache never lands in the repo.
+    template_dir = work_dir / "templates"
+    shutil.copytree(REPO_ROOT / "templates" / "phase1", template_dir)
+    out = work_dir / "generators"
+    out.mkdir(parents=True, exist_ok=True)
+    prefix = f"{out}{os.sep}"
+    replacements = _replacements()
+
+    cases: dict[str, Callable[[], None]] = {}
+
+    def render_templates() -> None:
+        for name in TEXT_TEMPLATES:
+            render_template(load_template(template_dir / name), replacements)
+
+    cases["render_templates"] = render_templates
+
+    for width in widths:
+        schema = _schema(width)
+
+        # A fresh writer per call: every artifact is compared with the previous
+        # run's identical file, which is what a regeneration costs in practice.
+        cases[f"generate_sql[{width}]"] = lambda schema=schema: dbx.generate_sql(
+            schema, table_name="bench_0000", output_file=prefix, p_pipeline="bench_0000",
+            p_tier="bronze", p_header="true", writer=OutputWriter()
+        )
+        cases[f"generate_onboarding_ddl[{width}]"] = lambda schema=schema: dbx.generate_onboarding_ddl(
+            schema, table_name="bench_0000", work_space="wde", data_domain="cu", tier_suffix="_b",
+            p_partition_column="txn_date, file_date", p_retention_key="txn_date",
+            output_file=prefix, writer=OutputWriter()
+        )
+        cases[f"generate_table_tags[{width}]"] = lambda schema=schema: dbx.generate_table_tags(
+            schema, table_name="bench_0000", output_file=out / "alter_tags.sql", work_space="wde",
+            data_domain="cu", tier_suffix="_b", writer=OutputWriter()
+        )
+        cases[f"generate_json_standardization[{width}]"] = lambda schema=schema: dbx.generate_json_standardization(
+            schema, p_header="true", p_partition_column="txn_date, file_date"
+        )
+        cases[f"generate_json_config[{width}]"] = lambda schema=schema: dbx.generate_json_config(
+            schema, template_path=template_dir / "dbx_json_template.txt",
+            output_path=out / "bench_config.json", replacements=replacements,
+            p_header="true", p_partition_column="txn_date, file_date", writer=OutputWriter()
+        )
+
+    return cases
+
+
+def _end_to_end_cases(widths: list[int], pipelines: list[int], work_dir: Path) -> dict[str, Callable[[], None]]:
+    cases: dict[str, Callable[[], None]] = {}
+
+    def with_base_path(base: Path, run: Callable[[], None]) -> Callable[[], None]:
+        def call() -> None:
+            previous = os.environ.get("BASE_PATH")
+            os.environ["BASE_PATH"] = f"{base}{os.sep}"
+            try:
+                run()
+            finally:
+                if previous is None:
+                    os.environ.pop("BASE_PATH", None)
+                else:
+                    os.environ["BASE_PATH"] = previous
+        return call
+
+    for width in widths:
+        base = make_base_path(work_dir / f"e2e_{width}", columns=width)
+        # Cold: no sidecar caches, every artifact regenerated.
+        cases[f"dbx_main_cold[{width}]"] = with_base_path(
+            base, lambda: dbx.dbx_main(use_cache=False, incremental=False)
+        )
+        # Warm: workbook/template caches and the output manifest in play.
+        cases[f"dbx_main_warm[{width}]"] = with_base_path(
+            base, lambda: dbx.dbx_main(use_cache=True, incremental=True)
+        )
+
+    for count in pipelines:
+        base = make_base_path(work_dir / f"batch_{count}", columns=BATCH_WIDTH, pipelines=count)
+        cases[f"dbx_batch_main[{count}]"] = with_base_path(
+            base, lambda: dbx.dbx_batch_main(use_cache=False, incremental=False)
+        )
+
+    return cases
+
+
+def run_suite(widths: list[int], pipelines: list[int], repeats: int, only: str = "") -> dict:
+    work_dir = Path(tempfile.mkdtemp(prefix="kaizen-bench-"))
+    results = {}
+    try:
+        cases = _generator_cases(widths, work_dir)
+        cases.update(_end_to_end_cases(widths, pipelines, work_dir))
+
+        for name, fn in cases.items():
+            if only and only not in name:
+                continue
+            _time(fn, 1)  # warm-up; also creates the files later runs compare against
+            samples = _time(fn, repeats)
+            results[name] = {
+                "median": statistics.median(samples),
+                "min": min(samples),
+                "repeats": repeats,
+            }
+            print(f"⏱️  {name:<40} {results[name]['median'] * 1000:10.2f} ms")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta: float) -> list[str]:
+    """Print a comparison table; return the names of cases that regressed."""
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        now_ms = result["median"] * 1000
+        if base is None:
+            print(f"🆕 {name:<40} {now_ms:10.2f} ms  (no baseline)")
+            continue
+
+        base_ms = base["median"] * 1000
+        change = (result["median"] - base["median"]) / base["median"] if base["median"] else 0.0
+        regressed = change > threshold and result["median"] - base["median"] > min_delta
+        status = "❌" if regressed else "✅"
+        print(f"{status} {name:<40} {now_ms:10.2f} ms  baseline {base_ms:10.2f} ms  {change:+7.1%}")
+        if regressed:
+            regressions.append(name)
+
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Kaizen generator benchmarks")
+    parser.add_argument("--quick", action="store_true", help=f"Only {QUICK_WIDTHS} columns and {QUICK_PIPELINES} pipelines")
+    parser.add_argument("--widths", type=int, nargs="+", help=f"Schema widths (default {WIDTHS})")
+    parser.add_argument("--pipelines", type=int, nargs="+", help=f"Pipeline counts for batch mode (default {PIPELINES})")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per case after one warm-up (default 5)")
+    parser.add_argument("--only", default="", help="Run only cases whose name contains this text")
+    parser.add_argument("--output", type=Path, default=DEFAULT_RESULTS, help="Results file (JSON)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown of the median before failing (default 0.25 = 25%%)")
+    parser.add_argument("--min-delta", type=float, default=0.002, help="Ignore slowdowns smaller than this many seconds (default 0.002)")
+    args = parser.parse_args(argv)
+
+    widths = args.widths or (QUICK_WIDTHS if args.quick else WIDTHS)
+    pipelines = args.pipelines or (QUICK_PIPELINES if args.quick else PIPELINES)
+
+    current = run_suite(widths, pipelines, args.repeats, args.only)
+    args.output.write_text(json.dumps(current, indent=2), encoding="utf-8")
+    print(f"📄 Results written to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"📌 Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.is_file():
+        print(f"⚠️  No baseline at {args.baseline}; run with --save-baseline first.")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(current, baseline, args.threshold, args.min_delta)
+    if regressions:
+        print(f"❌ {len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+
+    print("✅ No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import shutil
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+SCHEMA_HEADER = ['iteration', 'fields', 'data type', 'comment', 'Tag Key']
+DATA_TYPES = ['string', 'timestamp', 'date', 'double(10,0)', 'int', 'bigint']
+# Names that hit the special cases in generate_sql / generate_json_standardization.
+SPECIAL_FIELDS = ['msisdn', 'txn_dt', 'file_date', 'file_name', 'file_id', 'dbx_process_dttm']
+
+PIPELINE_KEYS = [
+    'p_work_space', 'tier_suffix', 'p_pipeline', 'p_tier', 'p_table_name', 'p_data_domain',
+    'p_frequency', 'p_soure_file_format', 'p_header', 'p_delimeter', 'p_save_mode',
+    'p_source_directory', 'p_file_mask', 'p_file_size', 'p_application_name',
+    'p_task_key_name', 'p_partition_column', 'p_retention_key',
+]
+
+
+def schema_rows(columns: int) -> list[list]:
+    """Rows for a schema sheet of the given width, mixing types, comments and tags."""
+    rows = []
+    for i in range(columns):
+        field_name = SPECIAL_FIELDS[i] if i < len(SPECIAL_FIELDS) else f'col_{i}'
+        rows.append([
+            f'_c{i}',
+            field_name,
+            DATA_TYPES[i % len(DATA_TYPES)],
+            f"bench column {i}'s comment",
+            'dataprivacy' if i % 7 == 0 else ('infoclass' if i % 11 == 0 else None),
+        ])
+    return rows
+
+
+def pipeline_rows(pipelines: int) -> list[list]:
+    rows = []
+    for i in range(pipelines):
+        name = f'bench_{i:04d}'
+        rows.append([
+            'wde', '_b', name, 'bronze', name, 'cu', 'daily', 'csv', i % 2 == 0, '|', 'append',
+            f'/data/{name}/', f'{name}_*.csv', f'{(i % 40) + 1}gb', f'BENCH - {name}',
+            f'{name}_task', 'txn_date, file_date', 'txn_date',
+        ])
+    return rows
+
+
+def synthesize_context_workbook(dest: Path, columns: int, pipelines: int = 0) -> Path:
+    """
+    Copy the repo's dbx_context_param.xlsx (values only, so formula cells such
+    as tier_suffix keep their cached values) and replace its schema sheet with
+    a synthetic one of the given width. With pipelines > 0 a 'pipelines'
+    manifest sheet is added for batch generation.
+    """
+    wb = load_workbook(REPO_ROOT / 'dbx_context_param.xlsx', data_only=True)
+
+    del wb['schema']
+    ws = wb.create_sheet('schema', 0)
+    ws.append(SCHEMA_HEADER)
+    for row in schema_rows(columns):
+        ws.append(row)
+
+    if pipelines:
+        if 'pipelines' in wb.sheetnames:
+            del wb['pipelines']
+        ws = wb.create_sheet('pipelines')
+        ws.append(PIPELINE_KEYS)
+        for row in pipeline_rows(pipelines):
+            ws.append(row)
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    wb.save(dest)
+    return dest
+
+
+def make_base_path(root: Path, columns: int, pipelines: int = 0) -> Path:
+    """A BASE_PATH sandbox: templates/phase1, a synthetic workbook and output/."""
+    root.mkdir(parents=True, exist_ok=True)
+    shutil.copytree(REPO_ROOT / 'templates' / 'phase1', root / 'templates' / 'phase1', dirs_exist_ok=True)
+    synthesize_context_workbook(root / 'dbx_context_param.xlsx', columns, pipelines)
+    (root / 'output').mkdir(exist_ok=True)
+    return root
@@ -0,0 +1,180 @@
+import io
+import sys
+import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from components.c_profiling import profile_thread
+
+
+@dataclass
+class ArtifactStep:
+    name: str
+    run: Callable[[], None]
+    depends_on: tuple[str, ...] = ()
+    # Files the step writes; used by the output manifest to skip unchanged steps.
+    outputs: tuple[Path, ...] = ()
+
+
+@dataclass
+class StepResult:
+    name: str
+    ok: bool
+    seconds: float
+    log: str = ""
+    error: str = ""
+
+
+class _ThreadLocalStdout(io.TextIOBase):
+    """
+    Routes print() from each worker thread into that thread's own buffer, so
+    concurrent generators can keep printing and the report is replayed in
+    declaration order afterwards. Threads without a buffer write through.
+    """
+
+    def __init__(self, default) -> None:
+        self._default = default
+        self._local = threading.local()
+
+    def set_buffer(self, buffer: Optional[io.StringIO]) -> None:
+        self._local.buffer = buffer
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer if buffer is not None else self._default).write(text)
+
+    def flush(self) -> None:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            self._default.flush()
+
+
+_stdout_lock = threading.Lock()
+_stdout_users = 0
+
+
+def _acquire_stdout() -> _ThreadLocalStdout:
+    global _stdout_users
+    with _stdout_lock:
+        if not isinstance(sys.stdout, _ThreadLocalStdout):
+            sys.stdout = _ThreadLocalStdout(sys.stdout)
+        _stdout_users += 1
+        return sys.stdout
+
+
+def _release_stdout(proxy: _ThreadLocalStdout) -> None:
+    global _stdout_users
+    with _stdout_lock:
+        _stdout_users -= 1
+        if _stdout_users == 0 and sys.stdout is proxy:
+            sys.stdout = proxy._default
+
+
+def _validate(steps: list[ArtifactStep]) -> None:
+    names = [step.name for step in steps]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate artifact step names: {names}")
+
+    known = set(names)
+    for step in steps:
+        missing = [dep for dep in step.depends_on if dep not in known]
+        if missing:
+            raise ValueError(f"Step '{step.name}' depends on unknown step(s): {', '.join(missing)}")
+
+    # Kahn's algorithm, only to reject cycles up front.
+    remaining = {step.name: set(step.depends_on) for step in steps}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Cycle in artifact steps: {', '.join(sorted(remaining))}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def run_artifact_dag(
+    steps: list[ArtifactStep],
+    max_workers: Optional[int] = None,
+    report: bool = True,
+) -> list[StepResult]:
+    """
+    Run the steps on a thread pool as soon as their dependencies succeed.
+    A step whose dependency failed is skipped. Console output of every step is
+    captured and, with report, printed in declaration order once all finish.
+    """
+    _validate(steps)
+
+    results: dict[str, StepResult] = {}
+    proxy = _acquire_stdout()
+
+    def execute(step: ArtifactStep) -> StepResult:
+        buffer = io.StringIO()
+        proxy.set_buffer(buffer)
+        start = time.perf_counter()
+        error = ""
+        try:
+            with profile_thread():
+                step.run()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"❌ {step.name}: {error}")
+        finally:
+            proxy.set_buffer(None)
+
+        log = buffer.getvalue()
+        if not error:
+            # Generators report their own failures as "❌ ..." lines.
+            failures = [line for line in log.splitlines() if line.startswith("❌")]
+            error = failures[0] if failures else ""
+
+        return StepResult(
+            name=step.name,
+            ok=not error,
+            seconds=time.perf_counter() - start,
+            log=log,
+            error=error,
+        )
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers or min(8, len(steps) or 1)) as executor:
+            pending: dict[Future, str] = {}
+            waiting = list(steps)
+
+            while waiting or pending:
+                for step in list(waiting):
+                    if any(dep not in results for dep in step.depends_on):
+                        continue
+                    waiting.remove(step)
+                    failed = [dep for dep in step.depends_on if not results[dep].ok]
+                    if failed:
+                        results[step.name] = StepResult(
+                            name=step.name,
+                            ok=False,
+                            seconds=0.0,
+                            error=f"skipped, dependency failed: {', '.join(failed)}",
+                        )
+                    else:
+                        pending[executor.submit(execute, step)] = step.name
+
+                if not pending:
+                    continue
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+    finally:
+        _release_stdout(proxy)
+
+    ordered = [results[step.name] for step in steps]
+    if report:
+        for result in ordered:
+            if result.log:
+                sys.stdout.write(result.log)
+            elif not result.ok:
+                print(f"⏭️  {result.name}: {result.error}")
+
+    return ordered
@@ -0,0 +1,290 @@
+import io
+import os
+import re
+import time
+import hashlib
+import contextlib
+import pandas as pd
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Callable, Optional
+
+from components.c_disk_cache import DiskCache
+from components.c_instrumentation import StageEvent, recorder
+from components.c_template_engine import set_template_disk_cache
+from components.c_workbook_loader import (
+    SchemaModel,
+    WorkbookModel,
+    read_schema,
+    schema_from_json,
+    schema_to_json,
+    workbook_cache_stats,
+)
+
+
+# p_pipeline names an output directory (output/<pipeline>/) and the files in it.
+PIPELINE_NAME_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]*")
+
+EXAMPLE_MANIFEST_PATH = Path(__file__).resolve().parent.parent / "templates" / "pipelines_example.csv"
+
+
+@dataclass
+class PipelineResult:
+    pipeline: str
+    ok: bool
+    seconds: float
+    output_dir: str
+    log: str = ""
+    error: str = ""
+    # Stages recorded in the worker process, merged into the parent's recorder.
+    events: list[StageEvent] = field(default_factory=list)
+
+
+def read_pipeline_manifest(file_path: str | Path, sheet: str = 'pipelines') -> pd.DataFrame:
+    """
+    Read the batch manifest: one row per pipeline, one column per ContextParam
+    field (p_work_space, p_pipeline, ...). Optional columns:
+      schema_sheet - sheet holding this pipeline's schema (default 'schema')
+      workbook     - workbook holding that sheet (default: the manifest itself,
+                     or the default context workbook for a CSV manifest)
+    """
+    file_path = Path(file_path)
+    if file_path.suffix.lower() == ".csv":
+        df = pd.read_csv(file_path, dtype=object)
+    else:
+        with pd.ExcelFile(file_path) as xls:
+            if sheet not in xls.sheet_names:
+                raise ValueError(
+                    f"{file_path.name} has no '{sheet}' sheet. Add one with a row per pipeline and a column "
+                    f"per context field (p_pipeline, p_table_name, ...), or pass --manifest with a CSV "
+                    f"manifest. templates/{EXAMPLE_MANIFEST_PATH.name} shows the columns."
+                )
+            df = pd.read_excel(xls, sheet_name=sheet, dtype=object)
+
+    df = df.dropna(how="all")
+    if df.empty:
+        raise ValueError(f"Pipeline manifest is empty: {file_path}")
+    if "p_pipeline" not in df.columns:
+        raise ValueError("Pipeline manifest must have a 'p_pipeline' column.")
+
+    # Header is row 1, so data row i is spreadsheet/CSV row i + 2.
+    invalid = [
+        f"row {index + 2}: {'(empty)' if pd.isna(name) else repr(name)}"
+        for index, name in df["p_pipeline"].items()
+        if not _valid_pipeline_name(name)
+    ]
+    if invalid:
+        raise ValueError(
+            "p_pipeline must be a plain name (letters, digits, '_', '.', '-'); "
+            f"invalid in {file_path.name}: {', '.join(invalid)}"
+        )
+
+    return df
+
+
+def _valid_pipeline_name(name) -> bool:
+    return isinstance(name, str) and PIPELINE_NAME_PATTERN.fullmatch(name) is not None
+
+
+def _read_schema_sheets(workbook_path: Path, sheets: list[str]) -> dict[str, SchemaModel]:
+    with pd.ExcelFile(workbook_path) as xls:
+        return {sheet: read_schema(xls, sheet) for sheet in sheets}
+
+
+def load_schema_sheets(workbook_path: str | Path, sheets: list[str], use_cache: bool = True) -> dict[str, SchemaModel]:
+    """Parse every requested schema sheet from one open of the workbook."""
+    workbook_path = Path(workbook_path)
+    sheets = sorted(set(sheets))
+
+    def build() -> dict[str, SchemaModel]:
+        return _read_schema_sheets(workbook_path, sheets)
+
+    if not use_cache:
+        return build()
+
+    sheet_key = hashlib.sha256("|".join(sheets).encode("utf-8")).hexdigest()[:12]
+    cache = DiskCache(
+        namespace=f"schemas-{sheet_key}",
+        encode=lambda schemas: {sheet: schema_to_json(schema) for sheet, schema in schemas.items()},
+        decode=lambda data: {sheet: schema_from_json(rows) for sheet, rows in data.items()},
+        stats=workbook_cache_stats,
+    )
+    return cache.get_or_build(workbook_path, build)
+
+
+def load_pipeline_models(
+    manifest_path: str | Path,
+    context_cls: type,
+    default_workbook: Optional[str | Path] = None,
+    sheet: str = 'pipelines',
+    use_cache: bool = True,
+) -> list[WorkbookModel]:
+    manifest_path = Path(manifest_path)
+    df = read_pipeline_manifest(manifest_path, sheet=sheet)
+
+    if default_workbook is None:
+        default_workbook = manifest_path
+    default_workbook = Path(default_workbook)
+
+    valid_keys = [f.name for f in fields(context_cls)]
+    rows = []
+    sheets_by_workbook: dict[Path, list[str]] = {}
+
+    for _, row in df.iterrows():
+        schema_sheet = row.get("schema_sheet")
+        schema_sheet = "schema" if pd.isna(schema_sheet) else str(schema_sheet).strip()
+
+        workbook = row.get("workbook")
+        workbook = default_workbook if pd.isna(workbook) else manifest_path.parent / str(workbook).strip()
+
+        values = {key: row[key] for key in valid_keys if key in row.index}
+        if isinstance(values.get("p_header"), str):
+            values["p_header"] = values["p_header"].strip().lower() == "true"
+
+        context = context_cls(**values)
+        rows.append((context, workbook, schema_sheet))
+        sheets_by_workbook.setdefault(workbook, []).append(schema_sheet)
+
+    schemas = {
+        workbook: load_schema_sheets(workbook, sheets, use_cache=use_cache)
+        for workbook, sheets in sheets_by_workbook.items()
+    }
+
+    return [
+        WorkbookModel(context=context, schema=schemas[workbook][schema_sheet])
+        for context, workbook, schema_sheet in rows
+    ]
+
+
+def _run_pipeline(
+    generate_pipeline: Callable[..., None],
+    model: WorkbookModel,
+    template_dir: Path,
+    output_dir: Path,
+    use_cache: bool = True,
+    incremental: bool = True,
+) -> PipelineResult:
+    """Worker entry point: generate one pipeline with its console output captured."""
+    set_template_disk_cache(use_cache)
+    recorder.reset()
+    pipeline = str(model.context.p_pipeline)
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    error = ""
+
+    try:
+        with contextlib.redirect_stdout(buffer):
+            generate_pipeline(
+                context=model.context,
+                schema=model.schema,
+                template_dir=template_dir,
+                output_dir=output_dir,
+                incremental=incremental
+            )
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    log = buffer.getvalue()
+    if not error:
+        failures = [line for line in log.splitlines() if line.startswith("❌")]
+        error = failures[0] if failures else ""
+
+    return PipelineResult(
+        pipeline=pipeline,
+        ok=not error,
+        seconds=time.perf_counter() - start,
+        output_dir=str(output_dir),
+        log=log,
+        error=error,
+        events=recorder.drain(),
+    )
+
+
+def run_batch(
+    models: list[WorkbookModel],
+    generate_pipeline: Callable[..., None],
+    template_dir: Path,
+    output_root: Path,
+    max_workers: Optional[int] = None,
+    use_cache: bool = True,
+    incremental: bool = True,
+) -> list[PipelineResult]:
+    """
+    Fan the pipelines out over a process pool, one output directory per
+    pipeline. Results come back in manifest order.
+    """
+    names = [str(model.context.p_pipeline) for model in models]
+    invalid = [name for name in names if not _valid_pipeline_name(name)]
+    if invalid:
+        raise ValueError(f"Invalid p_pipeline values: {', '.join(map(repr, invalid))}")
+    duplicates = sorted(name for name, count in Counter(names).items() if count > 1)
+    if duplicates:
+        raise ValueError(f"Duplicate p_pipeline values in manifest: {', '.join(duplicates)}")
+
+    max_workers = max_workers or min(len(models), os.cpu_count() or 1)
+    results: list[Optional[PipelineResult]] = [None] * len(models)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _run_pipeline, generate_pipeline, model, template_dir, output_root / name,
+                use_cache, incremental
+            ): index
+            for index, (model, name) in enumerate(zip(models, names))
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+                recorder.extend(results[index].events)
+            except Exception as e:
+                results[index] = PipelineResult(
+                    pipeline=names[index],
+                    ok=False,
+                    seconds=0.0,
+                    output_dir=str(output_root / names[index]),
+                    error=f"{type(e).__name__}: {e}",
+                )
+
+    return results
+
+
+def print_batch_report(results: list[PipelineResult], wall_seconds: float) -> None:
+    for result in results:
+        if result.ok:
+            print(f"✅ {result.pipeline:<40} {result.seconds:6.2f}s  {result.output_dir}")
+        else:
+            print(f"❌ {result.pipeline:<40} {result.seconds:6.2f}s  {result.error}")
+
+    succeeded = sum(1 for r in results if r.ok)
+    print(f"📊 BATCH: {succeeded}/{len(results)} pipeline(s) generated in {wall_seconds:.2f}s")
+
+
+def batch_main(
+    manifest_path: str | Path,
+    context_cls: type,
+    generate_pipeline: Callable[..., None],
+    template_dir: Path,
+    output_root: Path,
+    default_workbook: Optional[str | Path] = None,
+    max_workers: Optional[int] = None,
+    use_cache: bool = True,
+    incremental: bool = True,
+) -> list[PipelineResult]:
+    start = time.perf_counter()
+    models = load_pipeline_models(
+        manifest_path,
+        context_cls=context_cls,
+        default_workbook=default_workbook,
+        use_cache=use_cache
+    )
+    print(f"📥 {len(models)} pipeline(s) loaded from {Path(manifest_path).name}")
+
+    results = run_batch(
+        models, generate_pipeline, template_dir, output_root,
+        max_workers=max_workers, use_cache=use_cache, incremental=incremental
+    )
+    print_batch_report(results, time.perf_counter() - start)
+    return results
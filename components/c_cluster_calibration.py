@@ -0,0 +1,279 @@
+import re
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from components.c_cluster_compute import (
+    DEFAULT_CALIBRATION_PATH,
+    WAREHOUSE_SIZES,
+    calibration_key,
+    load_sizing_model,
+    split_format,
+)
+
+# Accepted column names of the run-history export, first match wins.
+HISTORY_COLUMNS = {
+    "pipeline": ("pipeline", "job_name", "pipeline_name"),
+    "bytes": ("bytes_processed", "bytes", "input_bytes"),
+    "format": ("format", "file_format", "source_file_format"),
+    "workers": ("workers", "num_workers", "worker_count"),
+    "node_type": ("node_type", "node_type_id"),
+    "duration_seconds": ("duration_seconds", "duration_s", "duration"),
+}
+DURATION_MS_COLUMNS = ("duration_ms", "run_duration_ms", "execution_duration")
+
+MIN_RUNS = 5
+# A pipeline is flagged when the calibrated class has at most half (over) or
+# at least twice (under) the worker cores it runs with today.
+PROVISIONING_RATIO = 2.0
+
+
+@dataclass
+class FormatFit:
+    """log(duration_s) = intercept + size_exponent·log(GB) + core_exponent·log(worker cores)"""
+    key: str
+    runs: int
+    intercept: float
+    size_exponent: float
+    core_exponent: float
+    r2: float
+
+    @property
+    def usable(self) -> bool:
+        # More data must take longer and more cores must be faster.
+        return self.size_exponent > 0 and self.core_exponent < 0
+
+    def predict_seconds(self, size_gb, cores):
+        return np.exp(self.intercept + self.size_exponent * np.log(size_gb) + self.core_exponent * np.log(cores))
+
+    def max_gb(self, cores: int, target_seconds: float) -> float:
+        """Largest input this many cores finish within target_seconds."""
+        return float(np.exp((np.log(target_seconds) - self.intercept - self.core_exponent * np.log(cores)) / self.size_exponent))
+
+    def gb_per_core_hour(self, size_gb: float = 10.0, cores: int = 32) -> float:
+        return size_gb / (float(self.predict_seconds(size_gb, cores)) / 3600 * cores)
+
+
+def node_vcpus(node_type: str) -> int:
+    """vCPUs of an AWS instance type from its size suffix: large 2, xlarge 4, Nxlarge 4·N."""
+    node_type = str(node_type).strip().lower()
+    match = re.search(r"\.(\d*)(x?)large$", node_type)
+    if not match:
+        return 4
+    if not match.group(2):
+        return 2
+    return 4 * int(match.group(1) or 1)
+
+
+def read_run_history(path: str | Path) -> pd.DataFrame:
+    """
+    Runs from a CSV or Parquet export (Parquet needs pyarrow or fastparquet),
+    normalized to HISTORY_COLUMNS; runs without bytes, workers or a duration
+    are dropped.
+    """
+    path = Path(path)
+    if path.suffix.lower() in (".parquet", ".pq"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+
+    columns = {c.lower().strip(): c for c in df.columns}
+    history = pd.DataFrame(index=df.index)
+    for name, aliases in HISTORY_COLUMNS.items():
+        source = next((columns[a] for a in aliases if a in columns), None)
+        if source is not None:
+            history[name] = df[source]
+    if "duration_seconds" not in history:
+        source = next((columns[a] for a in DURATION_MS_COLUMNS if a in columns), None)
+        if source is not None:
+            history["duration_seconds"] = pd.to_numeric(df[source], errors="coerce") / 1000
+
+    missing = [name for name in HISTORY_COLUMNS if name not in history]
+    if missing:
+        raise ValueError(f"Run history {path.name} has no column for: {', '.join(missing)}")
+
+    for name in ("bytes", "workers", "duration_seconds"):
+        history[name] = pd.to_numeric(history[name], errors="coerce")
+    history = history[(history["bytes"] > 0) & (history["workers"] > 0) & (history["duration_seconds"] > 0)]
+    return history.reset_index(drop=True)
+
+
+# Both helpers resolve each distinct value once (pd.factorize hashes; it does
+# not sort): a history has millions of runs but only a few formats and node types.
+def _format_groups(formats: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """(calibration keys, index into them per run)."""
+    model = load_sizing_model()
+    codes, values = pd.factorize(formats.astype(str))
+    keys, key_codes = np.unique([calibration_key(*split_format(v, model=model)) for v in values], return_inverse=True)
+    return keys, key_codes[codes]
+
+
+def _cores(history: pd.DataFrame) -> np.ndarray:
+    codes, node_types = pd.factorize(history["node_type"].astype(str))
+    vcpus = np.array([node_vcpus(node_type) for node_type in node_types], dtype=float)
+    return history["workers"].to_numpy(float) * vcpus[codes]
+
+
+def fit_throughput(history: pd.DataFrame) -> dict[str, FormatFit]:
+    """
+    One log-log least-squares fit per format, all formats at once: the 3×3
+    normal equations of every group are accumulated with bincount and solved
+    as one stacked system, so the cost is a few passes over the runs.
+    """
+    keys, inverse = _format_groups(history["format"])
+    cores = _cores(history)
+    x = np.column_stack([
+        np.ones(len(history)),
+        np.log(history["bytes"].to_numpy(float) / 1024 ** 3),
+        np.log(cores),
+    ])
+    y = np.log(history["duration_seconds"].to_numpy(float))
+
+    groups = len(keys)
+    counts = np.bincount(inverse, minlength=groups)
+    xtx = np.empty((groups, 3, 3))
+    xty = np.empty((groups, 3))
+    for i in range(3):
+        xty[:, i] = np.bincount(inverse, weights=x[:, i] * y, minlength=groups)
+        for j in range(i, 3):
+            xtx[:, i, j] = xtx[:, j, i] = np.bincount(inverse, weights=x[:, i] * x[:, j], minlength=groups)
+
+    # A small ridge keeps groups with a single worker count or size solvable.
+    beta = np.linalg.solve(xtx + np.eye(3) * 1e-6, xty[..., None])[..., 0]
+
+    residual = y - np.einsum("ij,ij->i", x, beta[inverse])
+    ss_res = np.bincount(inverse, weights=residual ** 2, minlength=groups)
+    y_mean = np.bincount(inverse, weights=y, minlength=groups) / np.maximum(counts, 1)
+    ss_tot = np.bincount(inverse, weights=(y - y_mean[inverse]) ** 2, minlength=groups)
+    r2 = 1 - ss_res / np.where(ss_tot > 0, ss_tot, 1)
+
+    return {
+        str(key): FormatFit(str(key), int(counts[g]), *map(float, beta[g]), float(r2[g]))
+        for g, key in enumerate(keys)
+    }
+
+
+def calibrated_table(fits: dict[str, FormatFit], target_minutes: float) -> dict:
+    """Per format, the largest input each WAREHOUSE_SIZES class finishes within the target runtime."""
+    target_seconds = target_minutes * 60
+    formats = {}
+    for key, fit in sorted(fits.items()):
+        if fit.runs < MIN_RUNS or not fit.usable:
+            continue
+        classes = []
+        for name, specs in WAREHOUSE_SIZES.items():
+            cores = specs["worker_count"] * node_vcpus(specs["node_type_id"])
+            classes.append({
+                "warehouse_size": name,
+                "node_type_id": specs["node_type_id"],
+                "worker_count": specs["worker_count"],
+                "max_gb": round(fit.max_gb(cores, target_seconds), 3),
+            })
+        formats[key] = {
+            "runs": fit.runs,
+            "r2": round(fit.r2, 3),
+            "coefficients": {
+                "intercept": round(fit.intercept, 6),
+                "size_exponent": round(fit.size_exponent, 6),
+                "core_exponent": round(fit.core_exponent, 6),
+            },
+            "classes": classes,
+        }
+    return {"target_minutes": target_minutes, "calibrated_at": datetime.now().isoformat(timespec="seconds"), "formats": formats}
+
+
+def provisioning_report(history: pd.DataFrame, table: dict) -> list[dict]:
+    """
+    Median run of every pipeline against the class the calibrated table
+    picks for its median input: over-provisioned when it runs with at least
+    PROVISIONING_RATIO times the cores it needs, under-provisioned when it
+    has at most 1/PROVISIONING_RATIO of them or misses the target runtime.
+    """
+    keys, inverse = _format_groups(history["format"])
+    history = history.assign(key=keys[inverse], cores=_cores(history))
+    pipelines = history.groupby("pipeline", sort=True).agg(
+        key=("key", "last"),
+        runs=("bytes", "size"),
+        median_bytes=("bytes", "median"),
+        median_seconds=("duration_seconds", "median"),
+        node_type=("node_type", "last"),
+        workers=("workers", "last"),
+        cores=("cores", "last"),
+    )
+    pipelines["median_gb"] = pipelines["median_bytes"] / 1024 ** 3
+    pipelines["median_minutes"] = pipelines["median_seconds"] / 60
+
+    report = []
+    for pipeline, row in pipelines.iterrows():
+        classes = table["formats"].get(row.key, {}).get("classes")
+        if not classes:
+            report.append({"pipeline": pipeline, "format": row.key, "status": "uncalibrated"})
+            continue
+        recommended = next((c for c in classes if row.median_gb <= c["max_gb"]), classes[-1])
+        recommended_cores = recommended["worker_count"] * node_vcpus(recommended["node_type_id"])
+
+        if row.cores >= recommended_cores * PROVISIONING_RATIO:
+            status = "over"
+        elif row.cores * PROVISIONING_RATIO <= recommended_cores or row.median_minutes > table["target_minutes"]:
+            status = "under"
+        else:
+            status = "ok"
+        report.append({
+            "pipeline": pipeline,
+            "format": row.key,
+            "status": status,
+            "runs": int(row.runs),
+            "median_gb": round(row.median_gb, 3),
+            "median_minutes": round(row.median_minutes, 1),
+            "current": f"{row.node_type} × {int(row.workers)}",
+            "recommended": f"{recommended['warehouse_size']} ({recommended['node_type_id']} × {recommended['worker_count']})",
+        })
+    return report
+
+
+def calibrate(history_path: str | Path, output_path: str | Path, target_minutes: float = 30.0) -> dict:
+    """
+    Fit the run history, write the calibrated sizing table and print the
+    provisioning report. Generation only uses the table once it is written
+    to (or copied to) DEFAULT_CALIBRATION_PATH.
+    """
+    output_path = Path(output_path)
+    history = read_run_history(history_path)
+    if history.empty:
+        raise ValueError(f"Run history {Path(history_path).name} has no usable runs")
+
+    fits = fit_throughput(history)
+    table = calibrated_table(fits, target_minutes)
+
+    print(f"📈 CALIBRATION: {len(history):,} runs, target runtime {target_minutes:g} min")
+    for key, fit in sorted(fits.items()):
+        if key in table["formats"]:
+            print(
+                f"✅ {key:<14} {fit.runs:>7,} runs  r²={fit.r2:.2f}  "
+                f"time ∝ GB^{fit.size_exponent:.2f} · cores^{fit.core_exponent:.2f}  "
+                f"≈ {fit.gb_per_core_hour():.2f} GB/core-hour at 10 GB on 32 cores"
+            )
+        else:
+            reason = f"only {fit.runs} runs" if fit.runs < MIN_RUNS else "no consistent size/core trend"
+            print(f"⚠️  {key:<14} not calibrated ({reason}); the sizing ladder stays in use")
+
+    output_path.write_text(json.dumps(table, indent=2), encoding="utf-8")
+    print(f"💾 CALIBRATED TABLE {output_path.resolve()}")
+    if output_path.resolve() != DEFAULT_CALIBRATION_PATH:
+        print(f"ℹ️  Generation sizes from {DEFAULT_CALIBRATION_PATH}; copy the table there to use it")
+
+    report = provisioning_report(history, table)
+    flagged = [r for r in report if r["status"] in ("over", "under")]
+    for row in flagged:
+        icon = "🔻" if row["status"] == "over" else "🔺"
+        print(
+            f"{icon} {row['pipeline']}: {row['status']}-provisioned, {row['current']} for "
+            f"{row['median_gb']:g} GB in {row['median_minutes']:g} min → {row['recommended']}"
+        )
+    print(f"📋 {len(report)} pipeline(s), {len(flagged)} flagged")
+
+    return {"output": str(output_path), "runs": len(history), "formats": sorted(table["formats"]), "pipelines": report}
@@ -1,4 +1,16 @@
 import re
+import json
+import math
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+# Format, compression, width and frequency multipliers (see SizingModel).
+DEFAULT_SIZING_PATH = Path(__file__).resolve().parent.parent / "templates" / "cluster_sizing.json"
+# Written by the calibrate command from job-run history; replaces the ladder
+# for the formats it covers.
+DEFAULT_CALIBRATION_PATH = Path(__file__).resolve().parent.parent / "templates" / "cluster_calibration.json"
 
 # Cluster specs mapping
 WAREHOUSE_SIZES = {
@@ -13,41 +25,201 @@ WAREHOUSE_SIZES = {
     "4X-Large":  {"node_type_id": "i3.16xlarge", "worker_count": 256},
 }
 
-# def parse_file_size(size_str: str) -> int:
-#     """Extract size in GB from a string like '2gb'."""
-#     match = re.match(r"(\d+)", size_str.lower())
-#     return int(match.group(1)) if match else 0
+# Binary multiples, as the original MB → GB conversion used.
+SIZE_UNITS_GB = {
+    "b": 1 / 1024 ** 3, "bytes": 1 / 1024 ** 3,
+    "k": 1 / 1024 ** 2, "kb": 1 / 1024 ** 2, "kib": 1 / 1024 ** 2,
+    "m": 1 / 1024, "mb": 1 / 1024, "mib": 1 / 1024,
+    "": 1.0, "g": 1.0, "gb": 1.0, "gib": 1.0,
+    "t": 1024.0, "tb": 1024.0, "tib": 1024.0,
+}
+
 
-def parse_file_size(size_str: str) -> int:
-    """Extract size in GB from a string like '2gb', '10GB', '500mb'. 
-    Returns size in GB as int (rounded down if MB/KB given).
+@dataclass(frozen=True)
+class SizingModel:
     """
-    if not size_str or not isinstance(size_str, str):
-        return 0
+    Multipliers from the typed file size to the "effective GB" that picks the
+    cluster class. 1.0 everywhere is uncompressed delimited text of
+    baseline_columns columns loaded daily, which is what the ladder in
+    pick_warehouse_size was written for.
+    """
+    format_factors: dict = field(hash=False)
+    compression_factors: dict = field(hash=False)
+    compression_suffixes: dict = field(hash=False)
+    frequency_factors: dict = field(hash=False)
+    columnar_formats: frozenset[str] = frozenset()
+    default_format_factor: float = 1.0
+    default_frequency_factor: float = 1.0
+    baseline_columns: int = 100
+    column_factor_per_column: float = 0.0
+    column_factor_max: float = 1.0
+
+    def column_factor(self, column_count: int) -> float:
+        # Wider rows cost more to parse and cast; narrower ones are not cheaper than the baseline.
+        extra = max(0, column_count - self.baseline_columns)
+        return min(self.column_factor_max, 1.0 + extra * self.column_factor_per_column)
+
+
+@dataclass
+class SizingEstimate:
+    size_gb: float
+    file_format: str
+    compression: str
+    column_count: int
+    frequency: str
+    factors: list[tuple[str, float]]
+    effective_gb: float
+    warehouse_size: str
+    calibrated_runs: int = 0
+
+    @property
+    def explanation(self) -> str:
+        steps = " ".join(f"×{value:g} ({label})" for label, value in self.factors)
+        effective = f"{format_size_gb(self.size_gb)} {steps} = {format_size_gb(self.effective_gb)} effective"
+        if self.calibrated_runs:
+            return (
+                f"{effective}; {format_size_gb(self.size_gb)} raw → {self.warehouse_size} "
+                f"(calibrated on {self.calibrated_runs:,} runs)"
+            )
+        return f"{effective} → {self.warehouse_size}"
+
+
+def parse_sizing_model(data: dict) -> SizingModel:
+    factors = [
+        *data.get("format_factors", {}).values(),
+        *data.get("compression_factors", {}).values(),
+        *data.get("frequency_factors", {}).values(),
+    ]
+    if any(not isinstance(value, (int, float)) or value <= 0 for value in factors):
+        raise ValueError("Cluster sizing factors must be positive numbers")
+
+    return SizingModel(
+        format_factors={k.lower(): float(v) for k, v in data.get("format_factors", {}).items()},
+        compression_factors={k.lower(): float(v) for k, v in data.get("compression_factors", {}).items()},
+        compression_suffixes={k.lower(): v.lower() for k, v in data.get("compression_suffixes", {}).items()},
+        frequency_factors={k.lower(): float(v) for k, v in data.get("frequency_factors", {}).items()},
+        columnar_formats=frozenset(f.lower() for f in data.get("columnar_formats", ())),
+        default_format_factor=float(data.get("default_format_factor", 1.0)),
+        default_frequency_factor=float(data.get("default_frequency_factor", 1.0)),
+        baseline_columns=int(data.get("baseline_columns", 100)),
+        column_factor_per_column=float(data.get("column_factor_per_column", 0.0)),
+        column_factor_max=float(data.get("column_factor_max", 1.0)),
+    )
+
+
+_sizing_models: dict[Path, tuple[int, int, SizingModel]] = {}
+_sizing_models_lock = threading.Lock()
+
+
+def load_sizing_model(path: str | Path = DEFAULT_SIZING_PATH) -> SizingModel:
+    """Parse the sizing table once, again only after it changes."""
+    path = Path(path).resolve()
+    stat = path.stat()
+
+    with _sizing_models_lock:
+        cached = _sizing_models.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    model = parse_sizing_model(json.loads(path.read_text(encoding="utf-8")))
+    with _sizing_models_lock:
+        _sizing_models[path] = (stat.st_mtime_ns, stat.st_size, model)
+    return model
+
+
+_calibrations: dict[Path, tuple[int, int, dict]] = {}
+
+
+def load_calibration(path: str | Path = DEFAULT_CALIBRATION_PATH) -> Optional[dict]:
+    """The calibrated sizing table, or None if calibrate has not been run."""
+    path = Path(path).resolve()
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+
+    with _sizing_models_lock:
+        cached = _calibrations.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    table = json.loads(path.read_text(encoding="utf-8"))
+    _check_calibration(table, path)
+    with _sizing_models_lock:
+        _calibrations[path] = (stat.st_mtime_ns, stat.st_size, table)
+    return table
+
+
+def _check_calibration(table: dict, path: Path) -> None:
+    for key, entry in table.get("formats", {}).items():
+        classes = entry.get("classes")
+        if not classes:
+            raise ValueError(f"Calibration {path.name}: format {key!r} has no classes")
+        for size_class in classes:
+            if size_class.get("warehouse_size") not in WAREHOUSE_SIZES or not isinstance(size_class.get("max_gb"), (int, float)):
+                raise ValueError(f"Calibration {path.name}: format {key!r} has an invalid class {size_class!r}")
 
-    size_str = size_str.strip().lower()
 
-    # Match number + optional unit
-    match = re.match(r"(\d+)\s*([a-z]*)", size_str)
+def calibration_key(file_format: str, compression: str = "none") -> str:
+    """Formats are calibrated separately per compression: 'csv', 'csv+gzip'."""
+    return file_format if compression == "none" else f"{file_format}+{compression}"
+
+
+def parse_file_size(size_str: str) -> float:
+    """
+    Size in GB from a string like '2gb', '10 GB', '500mb', '1.5TB', '1,000mb'
+    or '750000000 bytes'; KB/MB/GB/TB are binary multiples. A bare number is GB.
+    Returns 0.0 if no size can be read.
+    """
+    if not size_str or not isinstance(size_str, str):
+        return 0.0
+
+    # Thousands separators first ('1,000mb', '1,500,000 bytes'); a remaining
+    # comma is a decimal comma ('1,5gb').
+    size_str = re.sub(r",(?=\d{3}(?!\d))", "", size_str.strip().lower())
+    match = re.match(r"(\d+(?:[.,]\d+)?)\s*([a-z]*)", size_str)
     if not match:
-        return 0
+        return 0.0
 
     value, unit = match.groups()
-    value = int(value)
-
-    # Normalize units
-    if unit in ("gb", "g", ""):
-        return value
-    elif unit in ("mb", "m"):
-        return value // 1024   # convert MB → GB
-    elif unit in ("kb", "k"):
-        return value // (1024 * 1024)   # convert KB → GB
-    else:
-        return value   # default: assume GB
+    value = float(value.replace(",", "."))
+    return value * SIZE_UNITS_GB.get(unit, 1.0)   # default: assume GB
+
+
+def format_size_gb(size_gb: float) -> str:
+    if size_gb >= 1024:
+        return f"{size_gb / 1024:.2f} TB"
+    if size_gb >= 1:
+        return f"{size_gb:.2f} GB"
+    return f"{size_gb * 1024:.0f} MB"
+
+
+def split_format(file_format: str = "", file_mask: str = "", model: Optional[SizingModel] = None) -> tuple[str, str]:
+    """
+    (format, compression) from the format cell and the file mask, e.g.
+    'csv.gz' → ('csv', 'gzip'), or 'csv' with mask '*.dat.bz2' → ('csv', 'bzip2').
+    """
+    model = model or load_sizing_model()
+    # Empty Excel cells arrive as NaN.
+    file_format = file_format.strip().lower().lstrip(".") if isinstance(file_format, str) else ""
+    file_mask = file_mask.strip().lower() if isinstance(file_mask, str) else ""
+    compression = "none"
 
+    for suffix, name in model.compression_suffixes.items():
+        if file_format.endswith(suffix):
+            file_format, compression = file_format[: -len(suffix)], name
+            break
+        if file_mask.endswith(suffix):
+            compression = name
 
-def pick_warehouse_size(file_size_gb: int) -> str:
-    """Granular mapping of file size to warehouse size."""
+    # Compression formats named on their own ('gzip') mean gzipped text.
+    if file_format in model.compression_factors and file_format not in model.format_factors:
+        compression, file_format = file_format, "csv"
+    return file_format or "csv", compression
+
+
+def pick_warehouse_size(file_size_gb: float) -> str:
+    """Granular mapping of (effective) file size to warehouse size."""
     if file_size_gb <= 1:
         return "2X-Small"
     elif file_size_gb <= 3:
@@ -67,29 +239,100 @@ def pick_warehouse_size(file_size_gb: int) -> str:
     else:
         return "4X-Large"
 
-def get_cluster_values(file_size: str ="4gb", file_format: str = "csv") -> dict:
+
+def estimate_size(
+    file_size: str = "4gb",
+    file_format: str = "csv",
+    column_count: int = 0,
+    frequency: str = "daily",
+    file_mask: str = "",
+    model: Optional[SizingModel] = None,
+    calibration: Optional[dict] = None,
+) -> SizingEstimate:
+    """
+    Effective GB = typed size × format × compression × width × frequency.
+    Compression only applies to row formats; parquet/orc/avro compress
+    internally and that is already in their format factor.
+
+    If the calibration table covers the format (and compression), its fitted
+    classes replace the ladder. They were fitted on the raw bytes of past
+    runs, so they are matched against the typed size, not the effective GB;
+    the effective GB is still reported for the cluster policy and spark_conf.
+    """
+    model = model or load_sizing_model()
     size_gb = parse_file_size(file_size)
-    warehouse_size = pick_warehouse_size(size_gb)
+    file_format, compression = split_format(file_format, file_mask, model)
+    frequency = (frequency or "").strip().lower() if isinstance(frequency, str) else ""
+    if file_format in model.columnar_formats:
+        compression = "none"
+    calibrated = (calibration or {}).get("formats", {}).get(calibration_key(file_format, compression))
+
+    factors = [(file_format, model.format_factors.get(file_format, model.default_format_factor))]
+    if compression != "none":
+        factors.append((compression, model.compression_factors.get(compression, 1.0)))
+    if column_count:
+        factors.append((f"{column_count} columns", round(model.column_factor(column_count), 3)))
+    factors.append((frequency or "no frequency", model.frequency_factors.get(frequency, model.default_frequency_factor)))
+
+    effective_gb = size_gb * math.prod(value for _, value in factors)
+    if calibrated:
+        classes = calibrated["classes"]
+        warehouse_size = next((c for c in classes if size_gb <= c["max_gb"]), classes[-1])["warehouse_size"]
+    else:
+        warehouse_size = pick_warehouse_size(effective_gb)
+
+    return SizingEstimate(
+        size_gb=size_gb,
+        file_format=file_format,
+        compression=compression,
+        column_count=column_count,
+        frequency=frequency,
+        factors=factors,
+        effective_gb=effective_gb,
+        warehouse_size=warehouse_size,
+        calibrated_runs=calibrated["runs"] if calibrated else 0,
+    )
+
+
+def get_cluster_values(
+    file_size: str = "4gb",
+    file_format: str = "csv",
+    column_count: int = 0,
+    frequency: str = "daily",
+    file_mask: str = "",
+    sizing_path: str | Path = DEFAULT_SIZING_PATH,
+    calibration_path: str | Path = DEFAULT_CALIBRATION_PATH,
+) -> dict:
+    estimate = estimate_size(
+        file_size, file_format, column_count, frequency, file_mask,
+        model=load_sizing_model(sizing_path),
+        calibration=load_calibration(calibration_path),
+    )
+    warehouse_size = estimate.warehouse_size
     specs = WAREHOUSE_SIZES[warehouse_size]
 
     node_type_id = specs["node_type_id"]
     num_workers = specs["worker_count"]
-    min_workers = max(1, num_workers // 2)
-    max_workers = num_workers * 2
-    first_on_demand = num_workers
 
+    # Autoscale bounds and the on-demand split are chosen by c_cluster_policy.
     return {
         "warehouse_size": warehouse_size,
         "node_type_id": node_type_id,
-        "first_on_demand": first_on_demand,
         "num_workers": num_workers,
-        "min_workers": min_workers,
-        "max_workers": max_workers
+        "effective_gb": round(estimate.effective_gb, 3),
+        "explanation": f"{estimate.explanation} ({node_type_id} × {num_workers})",
     }
 
 if __name__ == "__main__":
-    file_size = ""
-    file_format = ""
-
-    config = get_cluster_values(file_size, file_format)
-    print(f"{file_size} ({file_format}): {config}")
+    # Same bytes, different shapes.
+    for file_size, file_format, column_count, frequency in [
+        ("500mb", "csv", 40, "daily"),
+        ("4gb", "csv", 40, "daily"),
+        ("4gb", "csv.gz", 40, "daily"),
+        ("4gb", "parquet", 40, "daily"),
+        ("4gb", "dat", 600, "daily"),
+        ("4gb", "csv", 40, "hourly"),
+        ("1.5tb", "parquet", 250, "monthly"),
+    ]:
+        config = get_cluster_values(file_size, file_format, column_count, frequency)
+        print(f"{file_size} {file_format} ({column_count} cols, {frequency}): {config['explanation']}")
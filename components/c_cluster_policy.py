@@ -0,0 +1,357 @@
+import json
+import math
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from components.c_cluster_calibration import node_vcpus
+from components.c_cluster_compute import get_cluster_values
+
+# Autoscale bounds, on-demand/spot split and timeout per frequency and volume
+# class, plus the prices the simulator uses.
+DEFAULT_POLICY_PATH = Path(__file__).resolve().parent.parent / "templates" / "cluster_policy.json"
+
+AVAILABILITIES = ("ON_DEMAND", "SPOT", "SPOT_WITH_FALLBACK")
+
+
+@dataclass(frozen=True)
+class ClusterPolicy:
+    """
+    One policy rule. It applies when the frequency and volume class match
+    (an empty set matches anything); the first matching rule in table order
+    wins. Worker bounds are ratios of the sized worker count, on_demand_ratio
+    the share of min workers that runs on-demand (the driver always does).
+    """
+    name: str
+    frequencies: frozenset[str] = frozenset()
+    volume_classes: frozenset[str] = frozenset()
+    min_workers_ratio: float = 0.5
+    max_workers_ratio: float = 2.0
+    on_demand_ratio: float = 0.5
+    availability: str = "SPOT_WITH_FALLBACK"
+    spot_bid_price_percent: int = 100
+    timeout_minutes: int = 120
+
+    def matches(self, frequency: str, volume_class: str) -> bool:
+        if self.frequencies and frequency not in self.frequencies:
+            return False
+        return not self.volume_classes or volume_class in self.volume_classes
+
+    def settings(self, num_workers: int) -> "ClusterSettings":
+        min_workers = max(1, round(num_workers * self.min_workers_ratio))
+        max_workers = max(min_workers, round(num_workers * self.max_workers_ratio))
+        if self.availability == "ON_DEMAND":
+            first_on_demand = 1 + max_workers
+        else:
+            first_on_demand = 1 + math.ceil(min_workers * self.on_demand_ratio)
+        return ClusterSettings(
+            policy=self.name,
+            min_workers=min_workers,
+            max_workers=max_workers,
+            first_on_demand=first_on_demand,
+            availability=self.availability,
+            spot_bid_price_percent=self.spot_bid_price_percent,
+            timeout_seconds=self.timeout_minutes * 60,
+        )
+
+
+@dataclass(frozen=True)
+class ClusterSettings:
+    """What a policy renders into the job YAML for one sized cluster."""
+    policy: str
+    min_workers: int
+    max_workers: int
+    first_on_demand: int
+    availability: str
+    spot_bid_price_percent: int
+    timeout_seconds: int
+
+    @property
+    def warning_seconds(self) -> int:
+        # The RUN_DURATION_SECONDS health rule fires halfway to the timeout.
+        return self.timeout_seconds // 2
+
+    @property
+    def spot_workers(self) -> tuple[int, int]:
+        """Spot workers at (min, max) size; first_on_demand counts the driver."""
+        if self.availability == "ON_DEMAND":
+            return 0, 0
+        on_demand_workers = self.first_on_demand - 1
+        return max(0, self.min_workers - on_demand_workers), max(0, self.max_workers - on_demand_workers)
+
+
+def legacy_settings(num_workers: int) -> ClusterSettings:
+    """What get_cluster_values rendered before policies: half to double, every worker on-demand."""
+    return ClusterSettings(
+        policy="legacy",
+        min_workers=max(1, num_workers // 2),
+        max_workers=num_workers * 2,
+        first_on_demand=num_workers,
+        availability="SPOT_WITH_FALLBACK",
+        spot_bid_price_percent=100,
+        timeout_seconds=7200,
+    )
+
+
+@dataclass(frozen=True)
+class Pricing:
+    node_usd_per_hour: dict = field(hash=False)
+    dbu_per_node_hour: dict = field(hash=False)
+    usd_per_dbu: float = 0.15
+    spot_discount: float = 0.6
+    spot_interruptions_per_node_hour: float = 0.05
+    gb_per_core_hour: float = 2.0
+    startup_seconds: float = 300.0
+    scale_up_seconds: float = 240.0
+
+    def node_rates(self, node_type_id: str) -> tuple[float, float]:
+        """USD per hour of one (on-demand, spot) node, DBUs included."""
+        if node_type_id not in self.node_usd_per_hour:
+            raise ValueError(f"No price for node type {node_type_id!r} in the cluster policy table")
+        instance = self.node_usd_per_hour[node_type_id]
+        dbus = self.dbu_per_node_hour.get(node_type_id, 0.0) * self.usd_per_dbu
+        return instance + dbus, instance * (1 - self.spot_discount) + dbus
+
+
+@dataclass(frozen=True)
+class PolicyTable:
+    volume_classes: tuple[tuple[str, Optional[float]], ...]
+    policies: tuple[ClusterPolicy, ...]
+    pricing: Pricing
+
+    def volume_class(self, effective_gb: float) -> str:
+        for name, max_gb in self.volume_classes:
+            if max_gb is None or effective_gb <= max_gb:
+                return name
+        return self.volume_classes[-1][0]
+
+    def choose(self, frequency: str, effective_gb: float) -> ClusterPolicy:
+        frequency = _frequency(frequency)
+        volume_class = self.volume_class(effective_gb)
+        for policy in self.policies:
+            if policy.matches(frequency, volume_class):
+                return policy
+        raise ValueError(f"No cluster policy for {frequency or 'no frequency'} / {volume_class}")
+
+
+def _frequency(frequency) -> str:
+    # Empty Excel cells arrive as NaN.
+    return frequency.strip().lower() if isinstance(frequency, str) else ""
+
+
+def parse_policy_table(data: dict) -> PolicyTable:
+    volume_classes = tuple((c["name"], c.get("max_gb")) for c in data["volume_classes"])
+    if not volume_classes:
+        raise ValueError("Cluster policy table needs at least one volume class")
+
+    policies = []
+    for rule in data["policies"]:
+        policy = ClusterPolicy(
+            name=rule["name"],
+            frequencies=frozenset(f.lower() for f in rule.get("frequencies", ())),
+            volume_classes=frozenset(rule.get("volume_classes", ())),
+            min_workers_ratio=float(rule.get("min_workers_ratio", 0.5)),
+            max_workers_ratio=float(rule.get("max_workers_ratio", 2.0)),
+            on_demand_ratio=float(rule.get("on_demand_ratio", 0.5)),
+            availability=rule.get("availability", "SPOT_WITH_FALLBACK").upper(),
+            spot_bid_price_percent=int(rule.get("spot_bid_price_percent", 100)),
+            timeout_minutes=int(rule.get("timeout_minutes", 120)),
+        )
+        if policy.availability not in AVAILABILITIES:
+            raise ValueError(f"Cluster policy {policy.name!r}: availability must be one of {', '.join(AVAILABILITIES)}")
+        if not 0 < policy.min_workers_ratio <= policy.max_workers_ratio:
+            raise ValueError(f"Cluster policy {policy.name!r}: need 0 < min_workers_ratio <= max_workers_ratio")
+        if not 0 <= policy.on_demand_ratio <= 1:
+            raise ValueError(f"Cluster policy {policy.name!r}: on_demand_ratio must be between 0 and 1")
+        unknown = policy.volume_classes - {name for name, _ in volume_classes}
+        if unknown:
+            raise ValueError(f"Cluster policy {policy.name!r}: unknown volume class {', '.join(sorted(unknown))}")
+        policies.append(policy)
+
+    pricing = data.get("pricing", {})
+    return PolicyTable(
+        volume_classes=volume_classes,
+        policies=tuple(policies),
+        pricing=Pricing(
+            node_usd_per_hour=dict(pricing.get("node_usd_per_hour", {})),
+            dbu_per_node_hour=dict(pricing.get("dbu_per_node_hour", {})),
+            **{k: float(v) for k, v in pricing.items() if k not in ("node_usd_per_hour", "dbu_per_node_hour")},
+        ),
+    )
+
+
+_policy_tables: dict[Path, tuple[int, int, PolicyTable]] = {}
+_policy_tables_lock = threading.Lock()
+
+
+def load_policy_table(path: str | Path = DEFAULT_POLICY_PATH) -> PolicyTable:
+    """Parse the policy table once, again only after it changes."""
+    path = Path(path).resolve()
+    stat = path.stat()
+
+    with _policy_tables_lock:
+        cached = _policy_tables.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    table = parse_policy_table(json.loads(path.read_text(encoding="utf-8")))
+    with _policy_tables_lock:
+        _policy_tables[path] = (stat.st_mtime_ns, stat.st_size, table)
+    return table
+
+
+@dataclass
+class PolicySimulation:
+    settings: ClusterSettings
+    runtime_seconds: float
+    cost_usd: float
+    on_demand_node_hours: float
+    spot_node_hours: float
+    interruptions: float
+
+    @property
+    def within_timeout(self) -> bool:
+        return self.runtime_seconds <= self.settings.timeout_seconds
+
+    def summary(self) -> str:
+        s = self.settings
+        return (
+            f"{s.policy:<24} {s.min_workers:>3}–{s.max_workers:<3} workers, "
+            f"{s.first_on_demand - 1:>3} on-demand  {self.runtime_seconds / 60:6.1f} min  "
+            f"${self.cost_usd:8.2f}  {self.interruptions:4.2f} interruptions"
+            + ("" if self.within_timeout else f"  ⚠️ exceeds {s.timeout_seconds // 60} min timeout")
+        )
+
+
+def simulate(settings: ClusterSettings, node_type_id: str, effective_gb: float, pricing: Pricing) -> PolicySimulation:
+    """
+    Expected runtime and cost of one run. The work, effective_gb /
+    gb_per_core_hour core-hours, starts after startup_seconds on min workers;
+    with autoscaling the cluster grows to max workers after scale_up_seconds.
+    Each expected spot interruption redoes scale_up_seconds of one node's
+    work. The driver is billed as one on-demand node throughout.
+    """
+    cores = node_vcpus(node_type_id)
+    on_demand_rate, spot_rate = pricing.node_rates(node_type_id)
+    spot_min, spot_max = settings.spot_workers
+    # Spot share of the workers over the run, for the interruption estimate.
+    spot_share = (spot_min + spot_max) / (settings.min_workers + settings.max_workers)
+
+    work = effective_gb / pricing.gb_per_core_hour * 3600
+    interruptions = 0.0
+    # Interruptions lengthen the run, which adds spot node-hours: two passes settle it.
+    for _ in range(2):
+        remaining = work + interruptions * cores * pricing.scale_up_seconds
+        ramp = remaining / (settings.min_workers * cores)
+        if settings.max_workers > settings.min_workers:
+            ramp = min(ramp, pricing.scale_up_seconds)
+        remaining -= ramp * settings.min_workers * cores
+        at_max = remaining / (settings.max_workers * cores)
+        worker_seconds = (pricing.startup_seconds + ramp) * settings.min_workers + at_max * settings.max_workers
+        interruptions = worker_seconds / 3600 * spot_share * pricing.spot_interruptions_per_node_hour
+
+    spot_seconds = (pricing.startup_seconds + ramp) * spot_min + at_max * spot_max
+    runtime = pricing.startup_seconds + ramp + at_max
+    on_demand_hours = (worker_seconds - spot_seconds + runtime) / 3600
+    spot_hours = spot_seconds / 3600
+    return PolicySimulation(
+        settings=settings,
+        runtime_seconds=runtime,
+        cost_usd=on_demand_hours * on_demand_rate + spot_hours * spot_rate,
+        on_demand_node_hours=on_demand_hours,
+        spot_node_hours=spot_hours,
+        interruptions=interruptions,
+    )
+
+
+def apply_cluster_policy(config: dict, frequency: str, path: str | Path = DEFAULT_POLICY_PATH) -> dict:
+    """
+    get_cluster_values output with the policy's autoscale bounds, on-demand
+    split and timeouts, the template values of the job cluster.
+    """
+    table = load_policy_table(path)
+    policy = table.choose(frequency, config["effective_gb"])
+    settings = policy.settings(config["num_workers"])
+    expected = simulate(settings, config["node_type_id"], config["effective_gb"], table.pricing)
+
+    return {
+        **config,
+        "min_workers": settings.min_workers,
+        "max_workers": settings.max_workers,
+        "first_on_demand": settings.first_on_demand,
+        "availability": settings.availability,
+        "spot_bid_price_percent": settings.spot_bid_price_percent,
+        "timeout_seconds": settings.timeout_seconds,
+        "run_duration_warning_seconds": settings.warning_seconds,
+        "cluster_policy": settings.policy,
+        "policy_explanation": (
+            f"{settings.policy} ({_frequency(frequency) or 'no frequency'}, "
+            f"{table.volume_class(config['effective_gb'])}): autoscale {settings.min_workers}–{settings.max_workers}, "
+            f"{settings.first_on_demand - 1} on-demand worker(s), {settings.availability}, "
+            f"timeout {settings.timeout_seconds // 60} min; "
+            f"≈ {expected.runtime_seconds / 60:.1f} min, ${expected.cost_usd:.2f} per run"
+        ),
+    }
+
+
+def compare_policies(
+    file_size: str,
+    file_format: str = "csv",
+    column_count: int = 0,
+    frequency: str = "daily",
+    file_mask: str = "",
+    path: str | Path = DEFAULT_POLICY_PATH,
+) -> dict:
+    """
+    Simulate every policy in the table, and the legacy settings, on the
+    cluster sized for this feed, cheapest first, and print the comparison.
+    """
+    config = get_cluster_values(file_size, file_format, column_count, frequency, file_mask)
+    table = load_policy_table(path)
+    chosen = table.choose(frequency, config["effective_gb"])
+    candidates = [legacy_settings(config["num_workers"])]
+    candidates += [policy.settings(config["num_workers"]) for policy in table.policies]
+
+    simulations = sorted(
+        (simulate(settings, config["node_type_id"], config["effective_gb"], table.pricing) for settings in candidates),
+        key=lambda s: (not s.within_timeout, s.cost_usd),
+    )
+    print(f"🧮 CLUSTER: {config['explanation']}")
+    for simulation in simulations:
+        marker = "👉" if simulation.settings.policy == chosen.name else "  "
+        print(f"{marker} {simulation.summary()}")
+
+    return {
+        "warehouse_size": config["warehouse_size"],
+        "node_type_id": config["node_type_id"],
+        "effective_gb": config["effective_gb"],
+        "volume_class": table.volume_class(config["effective_gb"]),
+        "chosen": chosen.name,
+        "policies": [
+            {
+                "policy": s.settings.policy,
+                "min_workers": s.settings.min_workers,
+                "max_workers": s.settings.max_workers,
+                "first_on_demand": s.settings.first_on_demand,
+                "availability": s.settings.availability,
+                "timeout_seconds": s.settings.timeout_seconds,
+                "runtime_minutes": round(s.runtime_seconds / 60, 2),
+                "cost_usd": round(s.cost_usd, 2),
+                "interruptions": round(s.interruptions, 3),
+                "within_timeout": s.within_timeout,
+            }
+            for s in simulations
+        ],
+    }
+
+
+if __name__ == "__main__":
+    for file_size, file_format, frequency in [
+        ("200mb", "csv", "hourly"),
+        ("4gb", "csv.gz", "daily"),
+        ("80gb", "csv", "daily"),
+        ("300gb", "parquet", "monthly"),
+    ]:
+        print(f"\n{file_size} {file_format} {frequency}")
+        compare_policies(file_size, file_format, 40, frequency)
@@ -0,0 +1,120 @@
+import sys
+import importlib
+import importlib.util
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+# Modules that make up the path to the menu; anything else a command needs is
+# imported when the command is selected.
+STARTUP_MODULES = [
+    "components.c_command_registry",
+    "components.c_headless",
+    "components.c_user_option",
+    "components.c_instrumentation",
+    "components.c_profiling",
+]
+MENU_MODULE = "InquirerPy.inquirer"
+TOP_N = 12
+
+
+@dataclass(frozen=True)
+class Command:
+    """
+    One menu entry. target is "module:function" and is only imported when the
+    entry is run, so pandas/openpyxl are never loaded for commands that do not
+    need them. kwargs builds the call's keyword arguments from the parsed CLI
+    arguments.
+    """
+    target: str
+    kwargs: Callable[[Any], dict] = field(default=lambda args: {})
+    announce: Optional[str] = None
+
+    @property
+    def module(self) -> str:
+        return self.target.partition(":")[0]
+
+
+def resolve(target: str) -> Callable:
+    module_name, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def run_command(commands: dict[str, Command], choice: str, args: Any) -> Any:
+    command = commands.get(choice)
+    if command is None:
+        print(f"That feature(s) {choice} is not yet available!")
+        return None
+
+    if command.announce:
+        print(command.announce)
+    return resolve(command.target)(**command.kwargs(args))
+
+
+def _import_times(modules: list[str]) -> list[tuple[int, int, str]]:
+    """
+    (self µs, cumulative µs, module) for every module imported by a fresh
+    interpreter running "import <modules>", from python -X importtime. Run out
+    of process so modules this process has already loaded are still counted.
+    """
+    import subprocess
+
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else code)
+
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times.append((int(self_us), int(cumulative_us), name))
+    return times
+
+
+def _total_ms(times: list[tuple[int, int, str]]) -> float:
+    # Unindented entries are the top-level imports; their cumulative times add up to the whole.
+    return sum(cumulative for _, cumulative, name in times if not name.startswith("  ")) / 1000
+
+
+def print_startup_report(commands: dict[str, Command]) -> None:
+    """Import-time breakdown of the menu itself and of each command on first selection."""
+    startup_modules = list(STARTUP_MODULES)
+    if importlib.util.find_spec(MENU_MODULE.partition(".")[0]) is not None:
+        startup_modules.append(MENU_MODULE)
+    else:
+        print(f"⚠️  {MENU_MODULE} is not installed; the menu prompt's own import is not included.")
+
+    baseline = _import_times(["encodings"])
+    startup = _import_times(startup_modules)
+    interpreter_ms = _total_ms(baseline)
+
+    interpreter_modules = {name.strip() for _, _, name in baseline}
+    packages: dict[str, int] = {}
+    for self_us, _, name in startup:
+        if name.strip() in interpreter_modules:
+            continue
+        package = name.strip().partition(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+
+    print(f"🚀 STARTUP: menu imports in {_total_ms(startup) - interpreter_ms:.1f} ms "
+          f"({len(startup) - len(baseline)} modules, excluding {interpreter_ms:.1f} ms interpreter start-up)")
+    print(f"🚀 {'PACKAGE':<36} {'SELF ms':>10}")
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:TOP_N]:
+        print(f"   {package:<36} {self_us / 1000:>10.1f}")
+
+    print(f"🚀 {'COMMAND (imported on selection)':<36} {'IMPORT ms':>10}  MODULE")
+    for label, command in commands.items():
+        try:
+            times = _import_times(startup_modules + [command.module])
+        except RuntimeError as e:
+            print(f"   {label:<36} {'failed':>10}  {command.module}: {e}")
+            continue
+        # The menu's modules are already loaded by then, so the command's own
+        # top-level entry is exactly what selecting it adds.
+        command_ms = sum(cumulative for _, cumulative, name in times
+                         if name.strip() == command.module and not name.startswith("  ")) / 1000
+        print(f"   {label:<36} {command_ms:>10.1f}  {command.module}")
@@ -1,13 +1,32 @@
 import os
 import math
 import pandas as pd
-import json
 from dotenv import load_dotenv
 from dataclasses import dataclass, fields
+from functools import partial
 from typing import Optional
 from pathlib import Path
 
+from components.c_artifact_dag import ArtifactStep, StepResult, run_artifact_dag
+from components.c_batch_generator import batch_main
 from components.c_cluster_compute import get_cluster_values
+from components.c_cluster_policy import apply_cluster_policy
+from components.c_instrumentation import instrumented, record_rows
+from components.c_json_config import build_json_config, dump_json_config, validate_json_config
+from components.c_output_manifest import run_incremental_dag
+from components.c_output_writer import OutputWriter
+from components.c_select_list import iter_select_blocks, stream_select
+from components.c_source_probe import DEFAULT_MAX_FILES, probe_for_context
+from components.c_spark_conf import derive_spark_conf
+from components.c_standardization import DEFAULT_RULES_PATH, load_rule_table
+from components.c_template_engine import (
+    load_template,
+    render_template,
+    report_placeholders,
+    set_template_disk_cache,
+    template_cache_stats,
+)
+from components.c_workbook_loader import SchemaModel, load_workbook_model, workbook_cache_stats
 
 
 
@@ -38,19 +57,20 @@ class ContextParam:
     p_implementation_date: Optional[str] = None
 
 
+@instrumented
 def generate_job_yml(
     input_path,
     output_path,
-    replacements: dict[str, str],) -> None:
+    replacements: dict[str, str],
+    writer: Optional[OutputWriter] = None) -> None:
 
     try:
         input_path = Path(input_path)
         output_path = Path(output_path)
 
-        content = input_path.read_text()
-        for target, replacement in replacements.items():
-            content = content.replace(target, replacement)
-        output_path.write_text(content)
+        result = render_template(load_template(input_path), replacements)
+        report_placeholders(input_path.name, result)
+        (writer or OutputWriter()).write_text(output_path, result.text)
         print(f"✅ JOB YML: {output_path.name}")
     
     except FileNotFoundError:
@@ -61,16 +81,17 @@ def generate_job_yml(
         print(f"❌ Unexpected error: {e}")
 
 
+@instrumented
 def dev_generate_json_config_data_sync(
     input_path: Path,
     output_path: Path,
-    replacements: dict[str, str],) -> None:
+    replacements: dict[str, str],
+    writer: Optional[OutputWriter] = None) -> None:
 
     try:
-        content = input_path.read_text()
-        for target, replacement in replacements.items():
-            content = content.replace(target, replacement)
-        output_path.write_text(content)
+        result = render_template(load_template(input_path), replacements)
+        report_placeholders(input_path.name, result)
+        (writer or OutputWriter()).write_text(output_path, result.text)
         print(f"✅ DATA-SYNC JSON FILE: {output_path.name}")
     
     except FileNotFoundError:
@@ -80,16 +101,17 @@ def dev_generate_json_config_data_sync(
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
 
+@instrumented
 def pet_generate_json_config_data_sync(
     input_path: Path,
     output_path: Path,
-    replacements: dict[str, str],) -> None:
+    replacements: dict[str, str],
+    writer: Optional[OutputWriter] = None) -> None:
 
     try:
-        content = input_path.read_text()
-        for target, replacement in replacements.items():
-            content = content.replace(target, replacement)
-        output_path.write_text(content)
+        result = render_template(load_template(input_path), replacements)
+        report_placeholders(input_path.name, result)
+        (writer or OutputWriter()).write_text(output_path, result.text)
         print(f"✅ DATA-SYNC JSON FILE: {output_path.name}")
     
     except FileNotFoundError:
@@ -99,16 +121,17 @@ def pet_generate_json_config_data_sync(
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
 
+@instrumented
 def data_sync_runner(
     input_path: Path,
     output_path: Path,
-    replacements: dict[str, str],) -> None:
+    replacements: dict[str, str],
+    writer: Optional[OutputWriter] = None) -> None:
 
     try:
-        content = input_path.read_text(encoding="utf-8")
-        for target, replacement in replacements.items():
-            content = content.replace(target, replacement)
-        output_path.write_text(content, encoding="utf-8")
+        result = render_template(load_template(input_path), replacements)
+        report_placeholders(input_path.name, result)
+        (writer or OutputWriter()).write_text(output_path, result.text, encoding="utf-8")
         print(f"✅ DATA-SYNC RUNNER SCRIPT FILE: {output_path.name}")
     
     except FileNotFoundError:
@@ -119,16 +142,17 @@ def data_sync_runner(
         print(f"❌ Unexpected error: {e}")
 
 
+@instrumented
 def generate_grants(
     input_path: Path,
     output_path: Path,
-    replacements: dict[str, str],) -> None:
+    replacements: dict[str, str],
+    writer: Optional[OutputWriter] = None) -> None:
 
     try:
-        content = input_path.read_text()
-        for target, replacement in replacements.items():
-            content = content.replace(target, replacement)
-        output_path.write_text(content)
+        result = render_template(load_template(input_path), replacements)
+        report_placeholders(input_path.name, result)
+        (writer or OutputWriter()).write_text(output_path, result.text)
         print(f"✅ ONBOARDING GRANTS: {output_path.name}")
     
     except FileNotFoundError:
@@ -139,16 +163,17 @@ def generate_grants(
         print(f"❌ Unexpected error: {e}")
 
 
+@instrumented
 def generate_instructions(
     input_path: Path,
     output_path: Path,
-    replacements: dict[str, str],) -> None:
+    replacements: dict[str, str],
+    writer: Optional[OutputWriter] = None) -> None:
 
     try:
-        content = input_path.read_text()
-        for target, replacement in replacements.items():
-            content = content.replace(target, replacement)
-        output_path.write_text(content)
+        result = render_template(load_template(input_path), replacements)
+        report_placeholders(input_path.name, result)
+        (writer or OutputWriter()).write_text(output_path, result.text)
         print(f"✅ INSTRUCTIONS GENERATED: {output_path.name}")
     
     except FileNotFoundError:
@@ -160,81 +185,50 @@ def generate_instructions(
 
 
 
+# Columns computed in the bronze query instead of read from the file.
+COMPUTED_COLUMNS = {
+    "dbx_process_dttm": "now() dbx_process_dttm",
+}
+
+
+@instrumented
 def generate_sql(
-    file_path: str = 'dbx_context_param.xlsx',
-    sheet: str = 'schema',
+    schema: SchemaModel,
     table_name: str = '',
     output_file: str = '',
     p_pipeline: str = '',
     p_tier: str = '',
-    p_header: str = ''
+    p_header: str = '',
+    writer: Optional[OutputWriter] = None
 ) -> None:
-    df = pd.read_excel(file_path, sheet_name=sheet)
-    df = df.iloc[:, 0:3]  # Columns A (iterator), B (field), C (type)
-
-    lines = []
-
-    if p_header == "true":
-        for _, row in df.iterrows():
-            iterator = str(row.iloc[0])
-            field_name = str(row.iloc[1])
-            data_type = str(row.iloc[2]) if not pd.isna(row.iloc[2]) else ""
-
-            if field_name == "dbx_process_dttm":
-                line = f"now() {field_name}"
-            elif data_type.lower() in {"timestamp", "date"} or field_name in {"file_name", "file_id", "owning_subscriber_id", "msisdn","subscriber_id", "sub_id","ret_min","ret_msisdn","dsp_min","dealer_min"}:
-                line = f"{field_name}"
-            else:
-                line = f"cast({field_name} as {data_type}) {field_name}"
-        
-            lines.append(line.lower())
-
-    else:
-        for _, row in df.iterrows():
-            iterator = str(row.iloc[0])
-            field_name = str(row.iloc[1])
-            data_type = str(row.iloc[2]) if not pd.isna(row.iloc[2]) else ""
-
-            if field_name == "dbx_process_dttm":
-                line = f"now() {field_name}"
-            elif data_type.lower() in {"timestamp", "date"} or field_name in {"file_name", "file_id", "owning_subscriber_id", "msisdn","subscriber_id", "sub_id","ret_min","ret_msisdn","dsp_min","dealer_min"}:
-                line = f"{field_name}"
-            else:
-                line = f"cast({iterator} as {data_type}) {field_name}"
-            
-            lines.append(line.lower())
-
-    sql_lines = []
-    sql_lines.append("select")
-    for i, line in enumerate(lines):
-        suffix = "," if i < len(lines) - 1 else ""
-        sql_lines.append(f" {line}{suffix}")
-    sql_lines.append(f"from {table_name}")
-
+    record_rows(len(schema))
     if not output_file:
         output_file = "generated"
 
+    # Classified and written a block of columns at a time.
+    blocks = iter_select_blocks(schema, p_header, COMPUTED_COLUMNS)
     output_path = Path(f"{output_file}{p_pipeline}.sql")
-    output_path.write_text("\n".join(sql_lines), encoding="utf-8")
+    (writer or OutputWriter()).write_lines(output_path, stream_select(blocks, table_name), encoding="utf-8")
 
     print(f"✅ SQL FILE {output_path.resolve()}")
 
 
 
+@instrumented
 def generate_table_tags(
-    file_path: str = "dbx_context_param.xlsx",
-    sheet: str = "schema",
+    schema: SchemaModel,
     table_name: str = "",
     output_file: str | Path = "tags_output.sql",
     work_space: str = "",
     data_domain: str = "",
     tier_suffix: str = "",
+    writer: Optional[OutputWriter] = None
 ) -> None:
     """
-    Generate ALTER TABLE statements with tags based on Excel metadata,
+    Generate ALTER TABLE statements with tags based on the schema model,
     separated by environment (DEV, PET, BASE).
     """
-    df = pd.read_excel(file_path, sheet_name=sheet).iloc[:, 0:5]
+    record_rows(len(schema))
 
     # map tag_key -> (tag_name, tag_value)
     tag_mapping = {
@@ -249,108 +243,94 @@ def generate_table_tags(
         ("BASE", work_space),
     ]
 
-    sections = []
-
-    for env_label, env_prefix in environments:
-        lines = [f"-- {env_label}"]
-        for _, row in df.iterrows():
-            field_name = str(row.iloc[1]).strip()
-            tag_key = str(row.iloc[4]).lower().strip()
-
-            if tag_key not in tag_mapping:
-                continue
-
-            tag_name, tag_value = tag_mapping[tag_key]
-            schema = f"{env_prefix}.{data_domain}{tier_suffix}"
-
-            line = (
-                f"ALTER TABLE {schema}.{table_name} "
-                f"ALTER COLUMN {field_name} "
-                f"SET TAGS ('{tag_name}' = '{tag_value}');"
-            )
-            lines.append(line)
-        sections.append("\n".join(lines))
-
-    # Write output with blank line between sections
+    def tag_lines():
+        # Sections are separated by a blank line.
+        for number, (env_label, env_prefix) in enumerate(environments):
+            if number:
+                yield ""
+            yield f"-- {env_label}"
+            target_schema = f"{env_prefix}.{data_domain}{tier_suffix}"
+            for column in schema:
+                tag_key = column.tag_key.lower()
+                if tag_key not in tag_mapping:
+                    continue
+
+                tag_name, tag_value = tag_mapping[tag_key]
+                yield (
+                    f"ALTER TABLE {target_schema}.{table_name} "
+                    f"ALTER COLUMN {column.field_name} "
+                    f"SET TAGS ('{tag_name}' = '{tag_value}');"
+                )
+
+    # Streamed line by line; the statements are never joined in memory.
     output_path = Path(output_file)
-    output_path.write_text("\n\n".join(sections), encoding="utf-8")
+    (writer or OutputWriter()).write_lines(output_path, tag_lines(), encoding="utf-8")
 
     print(f"✅ TAGS FILE CREATED: {output_path.resolve()}")
 
 
 
 
+@instrumented
 def generate_onboarding_ddl(
-    file_path: str = 'dbx_context_param.xlsx',
-    sheet: str = 'schema',
+    schema: SchemaModel,
     table_name: str = "",
     work_space: str = "",
     data_domain: str = "",
     tier_suffix: str = "",
     p_partition_column: str = "",
     p_retention_key: str = "",
-    output_file: str = ""
+    output_file: str = "",
+    writer: Optional[OutputWriter] = None
 ) -> None:
+    record_rows(len(schema))
     if not table_name or not work_space or not data_domain:
         raise ValueError("table_name, work_space, and data_domain are required.")
 
-    df = pd.read_excel(file_path, sheet_name=sheet)
-    df = df.iloc[:, 0:4]
-
-    lines = []
-
-    for _, row in df.iterrows():
-        field_name = str(row.iloc[1]).strip()
-        data_type = str(row.iloc[2]).strip()
-        comment = str(row.iloc[3]).strip() if not pd.isna(row.iloc[3]) else ""
-        comment = comment.replace("'", "''")  # Escape single quotes
-
-        line = f"{field_name} {data_type} COMMENT '{comment}'"
-        lines.append(line.lower())
-
-
-    last_valid_index = max(i for i, l in enumerate(lines) if "file_id" not in l)
-    sql_lines = []
-    sql_lines.append(f"CREATE TABLE IF NOT EXISTS {work_space}_dev.{data_domain}{tier_suffix}.{table_name} (")
-    for i, line in enumerate(lines):
-        if "file_id" in line:
-            continue
-        suffix = "," if i < last_valid_index else ""
-        sql_lines.append(f"    {line}{suffix}")
-    
-    sql_lines.append(") ")
-    sql_lines.append("USING delta")
-    sql_lines.append(f"PARTITIONED BY ({p_partition_column})")
-    sql_lines.append("COMMENT ''")
-    sql_lines.append("TBLPROPERTIES (")
-    sql_lines.append("    'delta.enableChangeDataFeed' = 'true',")
-    sql_lines.append(f"    'retentionKey' = '{p_retention_key}'")
-    sql_lines.append(");")
+    def column_lines():
+        # One line of lookahead: a column gets its comma once the next
+        # column (file_id excluded) is known to exist.
+        previous = None
+        for column in schema:
+            comment = column.comment.replace("'", "''")  # Escape single quotes
+            line = f"{column.field_name} {column.data_type} COMMENT '{comment}'".lower()
+            if "file_id" in line:
+                continue
+            if previous is not None:
+                yield f"    {previous},"
+            previous = line
+        if previous is None:
+            raise ValueError("The schema has no columns for the onboarding DDL.")
+        yield f"    {previous}"
+
+    def ddl_lines():
+        yield f"CREATE TABLE IF NOT EXISTS {work_space}_dev.{data_domain}{tier_suffix}.{table_name} ("
+        yield from column_lines()
+        yield ") "
+        yield "USING delta"
+        yield f"PARTITIONED BY ({p_partition_column})"
+        yield "COMMENT ''"
+        yield "TBLPROPERTIES ("
+        yield "    'delta.enableChangeDataFeed' = 'true',"
+        yield f"    'retentionKey' = '{p_retention_key}'"
+        yield ");"
 
     output_path = Path(f"{output_file}onboarding_ddl.sql")
-    output_path.write_text("\n".join(sql_lines), encoding="utf-8")
+    (writer or OutputWriter()).write_lines(output_path, ddl_lines(), encoding="utf-8")
 
     print(f"✅ ONBOARDING DDL {output_path.resolve()}")
 
 
 
 
-def generate_json_config(
-    file_path: str = 'dbx_context_param.xlsx',
-    sheet: str = 'schema',
-    output_file: str = "",
-    pipe_line: str = "",
-    template_path: str = "",) -> None:
-
-
-    df = pd.read_excel(file_path, sheet_name=sheet)
-    df = df.iloc[:, 0:4]
-
+@instrumented
+def generate_json_schema(schema: SchemaModel) -> list[dict]:
+    """Expected-schema list for check_schema_consistency."""
     columns = []
 
-    for _, row in df.iterrows():
-        field_name = str(row.iloc[1]).strip()
-        data_type = str(row.iloc[2]).strip()
+    for column in schema:
+        field_name = column.field_name
+        data_type = column.data_type
 
         if not field_name or not data_type:
             continue
@@ -360,256 +340,66 @@ def generate_json_config(
             "data_type": data_type.lower()
         })
 
-
-    pretty_json = json.dumps(columns, indent=4)
-    indented_json = "\n".join("                " + line for line in pretty_json.splitlines())
-
-    template = Path(template_path).read_text(encoding="utf-8")
-    result = template.replace("<schema>", indented_json)
-
-    final_output = Path(f"{output_file}{pipe_line}_config.txt")
-    final_output.write_text(result, encoding="utf-8")
+    return columns
 
 
 
 
+@instrumented
 def generate_json_standardization(
-    file_path: str = 'dbx_context_param.xlsx',
-    sheet: str = 'schema',
-    output_file: str = "",
-    pipe_line: str = "",
-    template_path: str = "",
-    output_path: str = "",
+    schema: SchemaModel,
     p_header: str = '',
-    p_partition_column: str = ''
-) -> None:
-
-    if not template_path:
-        raise ValueError("template_path must be provided")
-    if not output_file:
-        raise ValueError("output_file must be provided")
-
-    df = pd.read_excel(file_path, sheet_name=sheet)
-    df = df.iloc[:, 0:4]
-
-
-    columns = []
-    target_partition_list = []
-    partitions = p_partition_column.split(", ")    
-
-    # FOR TARGET PARTITION LIST
-    for p in partitions:
-        if p == "txn_date" or p == "txn_dt":
-            target_partition_list.append({
-                    "partition_name": "txn_date",
-                    "data_type": "date",
-                    "format": "%Y-%m-%d",
-                    "metadata_table_column_ref": "transaction_timestamp",
-                    "order": 1
-                })
-        elif p == "file_date" or p == "file_dt":
-            target_partition_list.append({
-                    "partition_name": "file_date",
-                    "data_type": "date",
-                    "format": "%Y-%m-%d",
-                    "metadata_table_column_ref": "file_date",
-                    "order": 2
-                })
-        elif p == "file_timestamp_bucket":
-            target_partition_list.append({
-                    "partition_name": "file_timestamp_bucket",
-                    "data_type": "date",
-                    "format": "%Y-%m-%d%H",
-                    "metadata_table_column_ref": "file_timestamp",
-                    "order": 1
-                })
-        else:
-            continue
-
-
-
-    # FOR STANDARDIZATION
-    if p_header == "true":
-        for _, row in df.iterrows():
-            iterator = str(row.iloc[0]).strip()
-            field_name = str(row.iloc[1]).strip()
-            data_type = str(row.iloc[2]).strip()
-            field_name = field_name.lower()
-            if not field_name or not data_type:
-                continue
-
-            if data_type.lower() == "timestamp" and field_name != "dbx_process_dttm":
-                columns.append({
-                    "standardize_function": "standardize_timestamp",
-                    "source_column_name": field_name,
-                    "additional_parameters": {
-                        "timestamp_format": "yyyy-MM-dd HH:mm:ss",
-                        "target_column_name": field_name
-                    }
-                })
-            elif data_type.lower() == "timestamp" and field_name == "file_timestamp_bucket":
-                columns.append({
-                    "standardize_function": "standardize_date",
-                    "additional_parameters": {
-                        "date_format": "yyyy-MM-dd HH:mm:ss",
-                        "target_column_name": field_name
-                    }
-                })
-            elif data_type.lower() == "date" and field_name == "txn_dt":
-                columns.append({
-                    "standardize_function": "standardize_date",
-                    "source_column_name": field_name,
-                    "additional_parameters": {
-                        "date_format": "yyyy-MM-dd",
-                        "target_column_name": "txn_date"
-                    }
-                })
-            elif data_type.lower() == "date" and field_name != "file_date":
-                columns.append({
-                    "standardize_function": "standardize_date",
-                    "source_column_name": field_name,
-                    "additional_parameters": {
-                        "date_format": "yyyy-MM-dd",
-                        "target_column_name": field_name
-                    }
-                })
-            elif data_type.lower() == "date" and field_name == "file_date":
-                columns.append({
-                    "standardize_function": "standardize_date",
-                    "additional_parameters": {
-                        "date_format": "yyyy-MM-dd",
-                        "target_column_name": field_name
-                    }
-                })
-            elif field_name in {
-                "owning_subscriber_id", "msisdn", "subscriber_id", "sub_id",
-                "ret_min", "ret_msisdn", "dsp_min", "dealer_min"}:
-                columns.append({
-                    "standardize_function": "standardize_msisdn",
-                    "source_column_name": field_name,
-                    "additional_parameters": {
-                        "target_column_name": field_name
-                    }
-                })
-            else:
-                continue
-    else:
-        for _, row in df.iterrows():
-            iterator = str(row.iloc[0]).strip()
-            field_name = str(row.iloc[1]).strip()
-            data_type = str(row.iloc[2]).strip()
-
-            if not field_name or not data_type:
-                continue
-
-            if data_type.lower() == "timestamp" and field_name != "dbx_process_dttm":
-                columns.append({
-                    "standardize_function": "standardize_timestamp",
-                    "source_column_name": iterator,
-                    "additional_parameters": {
-                        "timestamp_format": "yyyy-MM-dd HH:mm:ss",
-                        "target_column_name": field_name
-                    }
-                })
-            elif data_type.lower() == "timestamp" and field_name == "file_timestamp_bucket":
-                columns.append({
-                    "standardize_function": "standardize_date",
-                    "additional_parameters": {
-                        "date_format": "yyyy-MM-dd HH:mm:ss",
-                        "target_column_name": field_name
-                    }
-                })
-            elif data_type.lower() == "date" and field_name != "file_date":
-                columns.append({
-                    "standardize_function": "standardize_date",
-                    "source_column_name": iterator,
-                    "additional_parameters": {
-                        "date_format": "yyyy-MM-dd",
-                        "target_column_name": field_name
-                    }
-                })
-            elif data_type.lower() == "date" and field_name == "file_date":
-                columns.append({
-                    "standardize_function": "standardize_date",
-                    "additional_parameters": {
-                        "date_format": "yyyy-MM-dd",
-                        "target_column_name": field_name
-                    }
-                })
-            elif data_type.lower() == "date" and field_name == "txn_dt":
-                columns.append({
-                    "standardize_function": "standardize_date",
-                    "source_column_name": field_name,
-                    "additional_parameters": {
-                        "date_format": "yyyy-MM-dd",
-                        "target_column_name": "txn_date"
-                    }
-                })
-            elif field_name in {
-                "owning_subscriber_id", "msisdn", "subscriber_id", "sub_id",
-                "ret_min", "ret_msisdn", "dsp_min", "dealer_min"
-            }:
-                columns.append({
-                    "standardize_function": "standardize_msisdn",
-                    "source_column_name": iterator,
-                    "additional_parameters": {
-                        "target_column_name": field_name
-                    }
-                })
-            else:
-                continue
-
-    pretty_json = json.dumps(columns, indent=4)
-    indented_json = "\n".join("           " + line for line in pretty_json.splitlines())
-
-    partition_pretty_json = json.dumps(target_partition_list, indent=4)
-    partition_indented_json = "\n".join("           " + line for line in partition_pretty_json.splitlines())
-
-    template = Path(template_path).read_text(encoding="utf-8")
-    result = template.replace("<standardization>", indented_json)
-    result = result.replace("<target_partition_list>", partition_indented_json)
-    final_output = Path(f"{output_path}")
-    final_output.write_text(result, encoding="utf-8")
-
-    print(f"✅ JSON CONFIG {final_output.resolve()}")
+    p_partition_column: str = '',
+    rules_path: Path = DEFAULT_RULES_PATH
+) -> tuple[list[dict], list[dict]]:
+    """
+    Standardization rules and target partition list, from the shared rule
+    table (templates/standardization_rules.json).
+    """
+    rules = load_rule_table(rules_path)
+    return rules.standardization(schema, p_header), rules.target_partitions(p_partition_column, variant="default")
 
 
 
 
-def replace_templated_word_for_json_config(
-    input_path: Path,
+@instrumented
+def generate_json_config(
+    schema: SchemaModel,
+    template_path: Path,
     output_path: Path,
     replacements: dict[str, str],
-    file_path: str = 'dbx_context_param.xlsx',
-    sheet: str = 'schema') -> None:
+    p_header: str = '',
+    p_partition_column: str = '',
+    rules_path: Path = DEFAULT_RULES_PATH,
+    writer: Optional[OutputWriter] = None) -> None:
+    """
+    Build <pipeline>_config.json as a dict from the JSON template (context
+    placeholders, expected schema, column count, standardization rules and
+    target partition list), validate it and serialize it in one call.
+    """
+    record_rows(len(schema))
+    standardization, target_partition_list = generate_json_standardization(
+        schema=schema,
+        p_header=p_header,
+        p_partition_column=p_partition_column,
+        rules_path=rules_path
+    )
 
-    
-    df = pd.read_excel(file_path, sheet_name=sheet)
-    row_count = len(df)
-    row_count_str = str(row_count)
-    
-    try:
-        content = input_path.read_text()
-        for target, replacement in replacements.items():
-            content = content.replace(target, replacement)
-            content = content.replace("<column_count>", row_count_str)
-        output_path.write_text(content)
-    
-    except FileNotFoundError:
-        print(f"❌ Template file not found: {input_path}")
-    except Exception as e:
-        print(f"❌ Unexpected error: {e}")
+    build = build_json_config(load_template(template_path), replacements, {
+        "<schema>": generate_json_schema(schema),
+        "<column_count>": len(schema),
+        "<standardization>": standardization,
+        "<target_partition_list>": target_partition_list
+    })
+    report_placeholders(output_path.name, build, Path(template_path).name)
+    validate_json_config(build.config)
+    (writer or OutputWriter()).write_text(output_path, dump_json_config(build.config), encoding="utf-8")
 
+    print(f"✅ JSON CONFIG {output_path.resolve()}")
 
-def remove_trash(trash_path: Path) -> None:
-    for file in trash_path.glob("*.*"):
-        if file.is_file():
-            file.unlink()
-            print(f"🗑️  Clean-up trash: {file}")
-    
 
 
-def read_excel_file(file_path: str = 'dbx_context_param.xlsx', sheet: str = 'newcontext') -> ContextParam:
+def read_excel_file(file_path: str | pd.ExcelFile = 'dbx_context_param.xlsx', sheet: str = 'newcontext') -> ContextParam:
     df = pd.read_excel(file_path, sheet_name=sheet, usecols="C", skiprows=1, nrows=18)
 
     if df.empty:
@@ -623,36 +413,42 @@ def read_excel_file(file_path: str = 'dbx_context_param.xlsx', sheet: str = 'new
 
 
 
-def dbx_main():
-
-    load_dotenv()
-    BASE_PATH = os.getenv('BASE_PATH')
-    context = read_excel_file(file_path=rf'{BASE_PATH}dbx_context_param.xlsx', sheet='newcontext')
-
-    # print(f"✅ p_work_space: {context.p_work_space}")
-    # print(f"✅ tier_suffix: {context.tier_suffix}")
-    # print(f"✅ p_pipeline: {context.p_pipeline}")
-    # print(f"✅ p_tier: {context.p_tier}")
-    # print(f"✅ p_table_name: {context.p_table_name}")
-    # print(f"✅ p_data_domain: {context.p_data_domain}")
-    # print(f"✅ p_frequency: {context.p_frequency}")
-    # print(f"✅ p_soure_file_format: {context.p_soure_file_format}")
-    # print(f"✅ p_header: {context.p_header}")
-    # print(f"✅ p_delimeter: {context.p_delimeter}")
-    # print(f"✅ p_save_mode: {context.p_save_mode}")
-    # print(f"✅ p_source_directory: {context.p_source_directory}")
-    # print(f"✅ p_file_mask: {context.p_file_mask}")
-    # print(f"✅ p_file_size: {context.p_file_size}")
-    # print(f"✅ p_application_name: {context.p_application_name}")
-    # print(f"✅ p_task_key_name: {context.p_task_key_name}")
-    # print(f"✅ p_partition_column: {context.p_partition_column}")
-    # print(f"✅ p_retention_key: {context.p_retention_key}")
-
-    parent_output_path = rf"{BASE_PATH}output\\"
-    parent_template_path = rf"{BASE_PATH}templates\\phase1\\"
-    parent_trash_path = rf"{BASE_PATH}trash\\"
-
-    config = get_cluster_values(context.p_file_size, context.p_soure_file_format)
+def pipeline_replacements(context: ContextParam, schema: SchemaModel) -> dict[str, str]:
+    """
+    Every <placeholder> value for one pipeline: the context fields plus the
+    cluster size, policy and spark_conf derived from its volume. Normalizes
+    empty (NaN) context cells in place.
+    """
+    # A scan of the mounted source directory, if configured, replaces the typed size.
+    file_size = context.p_file_size
+    max_files_to_process = DEFAULT_MAX_FILES
+    probe = probe_for_context(context.p_source_directory, context.p_file_mask)
+    if probe and probe.file_count:
+        print(f"🔎 SOURCE: {probe.summary(context.p_frequency)}")
+        file_size = f"{probe.bytes_per_run(context.p_frequency)} bytes"
+        max_files_to_process = probe.max_files_per_run(context.p_frequency)
+    elif probe:
+        print(f"⚠️  SOURCE: {probe.summary()}; using p_file_size {context.p_file_size}")
+
+    config = get_cluster_values(
+        file_size,
+        context.p_soure_file_format,
+        column_count=len(schema),
+        frequency=context.p_frequency,
+        file_mask=context.p_file_mask,
+    )
+    config = apply_cluster_policy(config, context.p_frequency)
+    print(f"🧮 CLUSTER: {config['explanation']}")
+    print(f"💰 POLICY: {config['policy_explanation']}")
+    spark_conf = derive_spark_conf(
+        config["effective_gb"],
+        context.p_soure_file_format,
+        partition_columns=context.p_partition_column,
+        node_type_id=config["node_type_id"],
+        max_workers=config["max_workers"],
+        file_mask=context.p_file_mask,
+    )
+    print(f"⚙️  SPARK: {spark_conf.explanation}")
     node_type_id = config["node_type_id"]
     first_on_demand = config["first_on_demand"]
     num_workers = config["num_workers"]
@@ -700,6 +496,12 @@ def dbx_main():
         "<num_workers>": str(num_workers),
         "<min_workers>": str(min_workers),
         "<max_workers>": str(max_workers),
+        "<availability>": config["availability"],
+        "<spot_bid_price_percent>": str(config["spot_bid_price_percent"]),
+        "<timeout_seconds>": str(config["timeout_seconds"]),
+        "<run_duration_warning_seconds>": str(config["run_duration_warning_seconds"]),
+        "<spark_conf>": spark_conf.render(),
+        "<max_files_to_process>": str(max_files_to_process),
         "<job_yml_file>": f"{context.p_pipeline}_job.yml",
         "<alter_tags_file>": f"alter_tags-{context.p_pipeline}.sql",
         "<json_file>": f"{context.p_pipeline}_config.json",
@@ -707,101 +509,281 @@ def dbx_main():
         "<dev_gdm_config>": f"dev_gdm_config-{context.p_pipeline}.json"
     }
 
-    string_to_replace = {
+    return {
         k: "" if v is None or (isinstance(v, float) and math.isnan(v)) else str(v)
         for k, v in string_to_replace.items()
     }
-    
-    generate_job_yml(
-        input_path=Path(rf"{parent_template_path}dbx_job_template.txt"),
-        output_path=Path(rf"{parent_output_path}{context.p_pipeline}_job.yml"),
-        replacements=string_to_replace
-    )
 
 
-    dev_generate_json_config_data_sync(
-        input_path=Path(rf"{parent_template_path}dev_s3_bucket_config_template.txt"),
-        output_path=Path(rf"{parent_output_path}dev_gdm_config-{context.p_pipeline}.json"),
-        replacements=string_to_replace
-    )
+@instrumented
+def generate_pipeline(
+    context: ContextParam,
+    schema: SchemaModel,
+    template_dir: Path,
+    output_dir: Path,
+    incremental: bool = True,
+    writer: Optional[OutputWriter] = None) -> list[StepResult]:
+    """
+    Generate every artifact for a single pipeline into output_dir. With
+    incremental, artifacts whose inputs match output/.kaizen-manifest.json
+    are left untouched. All files go through writer (one is created and
+    flushed here if not given). Returns one result per artifact.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    owns_writer = writer is None
+    writer = writer or OutputWriter(batch_fsync=True)
 
-    pet_generate_json_config_data_sync(
-        input_path=Path(rf"{parent_template_path}pet_s3_pet_json_config_template.txt"),
-        output_path=Path(rf"{parent_output_path}pet_gdm_config-{context.p_pipeline}.json"),
-        replacements=string_to_replace
-    )
+    # print(f"✅ p_work_space: {context.p_work_space}")
+    # print(f"✅ tier_suffix: {context.tier_suffix}")
+    # print(f"✅ p_pipeline: {context.p_pipeline}")
+    # print(f"✅ p_tier: {context.p_tier}")
+    # print(f"✅ p_table_name: {context.p_table_name}")
+    # print(f"✅ p_data_domain: {context.p_data_domain}")
+    # print(f"✅ p_frequency: {context.p_frequency}")
+    # print(f"✅ p_soure_file_format: {context.p_soure_file_format}")
+    # print(f"✅ p_header: {context.p_header}")
+    # print(f"✅ p_delimeter: {context.p_delimeter}")
+    # print(f"✅ p_save_mode: {context.p_save_mode}")
+    # print(f"✅ p_source_directory: {context.p_source_directory}")
+    # print(f"✅ p_file_mask: {context.p_file_mask}")
+    # print(f"✅ p_file_size: {context.p_file_size}")
+    # print(f"✅ p_application_name: {context.p_application_name}")
+    # print(f"✅ p_task_key_name: {context.p_task_key_name}")
+    # print(f"✅ p_partition_column: {context.p_partition_column}")
+    # print(f"✅ p_retention_key: {context.p_retention_key}")
 
-    data_sync_runner(
-        input_path=Path(rf"{parent_template_path}data_sync_runner.txt"),
-        output_path=Path(rf"{parent_output_path}job_runner_{context.p_pipeline}.sh"),
-        replacements=string_to_replace
-    )
+    parent_output_path = f"{output_dir}{os.sep}"
+    parent_template_path = f"{template_dir}{os.sep}"
+
+    string_to_replace = pipeline_replacements(context, schema)
+    p_header = string_to_replace["<header_flag>"]
+
+    steps = [
+        ArtifactStep(
+            name="job_yml",
+            run=partial(
+                generate_job_yml,
+                input_path=Path(rf"{parent_template_path}dbx_job_template.txt"),
+                output_path=Path(rf"{parent_output_path}{context.p_pipeline}_job.yml"),
+                replacements=string_to_replace,
+                writer=writer
+            ),
+            outputs=(Path(rf"{parent_output_path}{context.p_pipeline}_job.yml"),)
+        ),
+
+        ArtifactStep(
+            name="dev_data_sync_config",
+            run=partial(
+                dev_generate_json_config_data_sync,
+                input_path=Path(rf"{parent_template_path}dev_s3_bucket_config_template.txt"),
+                output_path=Path(rf"{parent_output_path}dev_gdm_config-{context.p_pipeline}.json"),
+                replacements=string_to_replace,
+                writer=writer
+            ),
+            outputs=(Path(rf"{parent_output_path}dev_gdm_config-{context.p_pipeline}.json"),)
+        ),
+
+        ArtifactStep(
+            name="pet_data_sync_config",
+            run=partial(
+                pet_generate_json_config_data_sync,
+                input_path=Path(rf"{parent_template_path}pet_s3_pet_json_config_template.txt"),
+                output_path=Path(rf"{parent_output_path}pet_gdm_config-{context.p_pipeline}.json"),
+                replacements=string_to_replace,
+                writer=writer
+            ),
+            outputs=(Path(rf"{parent_output_path}pet_gdm_config-{context.p_pipeline}.json"),)
+        ),
+
+        ArtifactStep(
+            name="data_sync_runner",
+            run=partial(
+                data_sync_runner,
+                input_path=Path(rf"{parent_template_path}data_sync_runner.txt"),
+                output_path=Path(rf"{parent_output_path}job_runner_{context.p_pipeline}.sh"),
+                replacements=string_to_replace,
+                writer=writer
+            ),
+            outputs=(Path(rf"{parent_output_path}job_runner_{context.p_pipeline}.sh"),)
+        ),
+
+        ArtifactStep(
+            name="grants",
+            run=partial(
+                generate_grants,
+                input_path=Path(rf"{parent_template_path}grants_dev_pet_prod.txt"),
+                output_path=Path(rf"{parent_output_path}grants_onboarding-{context.p_pipeline}.sql"),
+                replacements=string_to_replace,
+                writer=writer
+            ),
+            outputs=(Path(rf"{parent_output_path}grants_onboarding-{context.p_pipeline}.sql"),)
+        ),
+
+        ArtifactStep(
+            name="sql",
+            run=partial(
+                generate_sql,
+                schema=schema,
+                table_name = context.p_table_name,
+                output_file = parent_output_path,
+                p_pipeline = context.p_pipeline,
+                p_tier=context.p_tier,
+                p_header=p_header,
+                writer=writer
+            ),
+            outputs=(Path(rf"{parent_output_path}{context.p_pipeline}.sql"),)
+        ),
+
+        ArtifactStep(
+            name="onboarding_ddl",
+            run=partial(
+                generate_onboarding_ddl,
+                schema=schema,
+                table_name=context.p_table_name,
+                work_space=context.p_work_space,
+                data_domain=context.p_data_domain,
+                tier_suffix=context.tier_suffix,
+                p_partition_column=context.p_partition_column,
+                p_retention_key=context.p_retention_key,
+                output_file=parent_output_path,
+                writer=writer
+            ),
+            outputs=(Path(rf"{parent_output_path}onboarding_ddl.sql"),)
+        ),
+
+        ArtifactStep(
+            name="table_tags",
+            run=partial(
+                generate_table_tags,
+                schema=schema,
+                table_name = context.p_table_name,
+                output_file = Path(rf"{parent_output_path}alter_tags-{context.p_pipeline}.sql"),
+                work_space = context.p_work_space,
+                data_domain = context.p_data_domain,
+                tier_suffix = context.tier_suffix,
+                writer=writer
+            ),
+            outputs=(Path(rf"{parent_output_path}alter_tags-{context.p_pipeline}.sql"),)
+        ),
+
+        ArtifactStep(
+            name="json_config",
+            run=partial(
+                generate_json_config,
+                schema=schema,
+                template_path=Path(rf"{parent_template_path}dbx_json_template.txt"),
+                output_path=Path(rf"{parent_output_path}{context.p_pipeline}_config.json"),
+                replacements=string_to_replace,
+                p_header=p_header,
+                p_partition_column=context.p_partition_column,
+                # Passed explicitly so the output manifest hashes the rule file.
+                rules_path=DEFAULT_RULES_PATH,
+                writer=writer
+            ),
+            outputs=(Path(rf"{parent_output_path}{context.p_pipeline}_config.json"),)
+        ),
+
+        ArtifactStep(
+            name="instructions",
+            run=partial(
+                generate_instructions,
+                input_path=Path(rf"{parent_template_path}instructions.txt"),
+                output_path=Path(rf"{parent_output_path}instructions.txt"),
+                replacements=string_to_replace,
+                writer=writer
+            ),
+            outputs=(Path(rf"{parent_output_path}instructions.txt"),)
+        ),
+    ]
 
-    generate_grants(
-        input_path=Path(rf"{parent_template_path}grants_dev_pet_prod.txt"),
-        output_path=Path(rf"{parent_output_path}grants_onboarding-{context.p_pipeline}.sql"),
-        replacements=string_to_replace
-    )
+    if incremental:
+        results, _ = run_incremental_dag(steps, output_dir)
+    else:
+        results = run_artifact_dag(steps)
 
-    generate_sql(
-        table_name = context.p_table_name, 
-        output_file = parent_output_path, 
-        p_pipeline = context.p_pipeline, 
-        p_tier=context.p_tier,
-        p_header=p_header
-    )
+    if owns_writer:
+        writer.flush()
+    return results
 
-    generate_onboarding_ddl(
-        table_name=context.p_table_name, 
-        work_space=context.p_work_space, 
-        data_domain=context.p_data_domain,
-        tier_suffix=context.tier_suffix,
-        p_partition_column=context.p_partition_column,
-        p_retention_key=context.p_retention_key,
-        output_file=parent_output_path
-    )
 
-    generate_table_tags(
-        table_name = context.p_table_name,
-        output_file = Path(rf"{parent_output_path}alter_tags-{context.p_pipeline}.sql"),
-        work_space = context.p_work_space,
-        data_domain = context.p_data_domain,
-        tier_suffix = context.tier_suffix
+@instrumented
+def dbx_main(
+    use_cache: bool = True,
+    incremental: bool = True,
+    workbook_path: Optional[str | Path] = None,
+    template_dir: Optional[str | Path] = None,
+    output_dir: Optional[str | Path] = None,
+    writer: Optional[OutputWriter] = None) -> list[StepResult]:
+    """
+    Generate the pipeline described by the context workbook. Paths default to
+    dbx_context_param.xlsx, templates/phase1 and output under BASE_PATH.
+    """
+    load_dotenv()
+    BASE_PATH = os.getenv('BASE_PATH')
+    set_template_disk_cache(use_cache)
+    workbook = load_workbook_model(
+        file_path=workbook_path or rf'{BASE_PATH}dbx_context_param.xlsx',
+        read_context=read_excel_file,
+        context_sheet='newcontext',
+        schema_sheet='schema',
+        use_cache=use_cache
     )
 
-    generate_json_config(
-        output_file=parent_trash_path, 
-        pipe_line=context.p_pipeline, 
-        template_path=f"{parent_template_path}dbx_json_template.txt"
+    writer = writer or OutputWriter(batch_fsync=True)
+    results = generate_pipeline(
+        context=workbook.context,
+        schema=workbook.schema,
+        template_dir=Path(template_dir or Path(BASE_PATH) / "templates" / "phase1"),
+        output_dir=Path(output_dir or Path(BASE_PATH) / "output"),
+        incremental=incremental,
+        writer=writer
     )
+    writer.flush()
+    print(f"💾 OUTPUT: {writer.stats.summary()}")
 
+    if use_cache:
+        print(f"📦 WORKBOOK CACHE: {workbook_cache_stats.summary()}")
+        print(f"📦 TEMPLATE CACHE: {template_cache_stats.summary()}")
 
-    json_config_p = f"{parent_output_path}{context.p_pipeline}_config.json"
-
+    return results
 
-    replace_templated_word_for_json_config(
-        input_path=Path(f"{parent_trash_path}{context.p_pipeline}_config.txt"),
-        replacements=string_to_replace, 
-        output_path=Path(f"{parent_trash_path}{context.p_pipeline}_config.txt")
-    )
 
-    generate_json_standardization(
-        output_file=parent_trash_path, 
-        pipe_line=context.p_pipeline, 
-        template_path=f"{parent_trash_path}{context.p_pipeline}_config.txt",
-        output_path=Path(f"{json_config_p}"),
-        p_header=p_header,
-        p_partition_column=context.p_partition_column
-    )
 
-    generate_instructions(
-        input_path=Path(rf"{parent_template_path}instructions.txt"),
-        output_path=Path(rf"{parent_output_path}instructions.txt"),
-        replacements=string_to_replace
+@instrumented
+def dbx_batch_main(
+    manifest_path: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    use_cache: bool = True,
+    incremental: bool = True,
+    workbook_path: Optional[str | Path] = None,
+    template_dir: Optional[str | Path] = None,
+    output_dir: Optional[str | Path] = None):
+    """
+    Generate every pipeline listed in the manifest (default: the 'pipelines'
+    sheet of dbx_context_param.xlsx), each into output/<pipeline>/.
+    """
+    load_dotenv()
+    BASE_PATH = os.getenv('BASE_PATH')
+    set_template_disk_cache(use_cache)
+    workbook_path = Path(workbook_path or rf'{BASE_PATH}dbx_context_param.xlsx')
+    manifest_path = Path(manifest_path) if manifest_path else workbook_path
+
+    results = batch_main(
+        manifest_path=manifest_path,
+        context_cls=ContextParam,
+        generate_pipeline=generate_pipeline,
+        template_dir=Path(template_dir or Path(BASE_PATH) / "templates" / "phase1"),
+        output_root=Path(output_dir or Path(BASE_PATH) / "output"),
+        default_workbook=workbook_path if manifest_path.suffix.lower() == ".csv" else None,
+        max_workers=max_workers,
+        use_cache=use_cache,
+        incremental=incremental
     )
 
+    if use_cache:
+        print(f"📦 WORKBOOK CACHE: {workbook_cache_stats.summary()}")
 
-    remove_trash(trash_path=Path(parent_trash_path))
+    return results
 
 
 if __name__ == "__main__":
@@ -0,0 +1,189 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from components.c_instrumentation import record_read
+
+# Overrides the per-user cache directory (see default_cache_dir).
+CACHE_DIR_ENV = "KAIZEN_CACHE_DIR"
+CACHE_FORMAT_VERSION = 2
+
+
+def default_cache_dir() -> Path:
+    """
+    Per-user local cache directory: %LOCALAPPDATA%\\kaizen\\cache on Windows,
+    $XDG_CACHE_HOME/kaizen (~/.cache/kaizen) elsewhere. Never next to the
+    workbook or templates, which live on the shared, synced BASE_PATH.
+    """
+    override = os.getenv(CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+    if sys.platform == "win32" and os.getenv("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "kaizen" / "cache"
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "kaizen"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def summary(self) -> str:
+        return f"{self.hits} hit(s), {self.misses} miss(es), {self.evictions} eviction(s)"
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    Cache of values derived from a source file, stored as JSON in a local
+    per-user directory. Each entry is keyed by the source path and validated
+    against the source size, mtime and content hash, so an edited source is
+    rebuilt and a touched-but-identical one is still a hit.
+
+    encode turns a value into JSON types and decode rebuilds it; nothing in
+    an entry is ever executed or imported. A value encode cannot turn into
+    JSON is returned but not stored.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        cache_dir: Optional[str | Path] = None,
+        encode: Callable[[Any], Any] = lambda value: value,
+        decode: Callable[[Any], Any] = lambda data: data,
+        max_entries: int = 64,
+        max_age_days: float = 30,
+        stats: Optional[CacheStats] = None,
+    ) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self.namespace = namespace
+        self.encode = encode
+        self.decode = decode
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 24 * 60 * 60
+        self.stats = stats if stats is not None else CacheStats()
+
+    def _entry_path(self, source_path: Path) -> Path:
+        key = hashlib.sha256(f"{self.namespace}|{source_path}".encode("utf-8")).hexdigest()[:32]
+        return self.cache_dir / f"{self.namespace}-{key}.json"
+
+    def _read_entry(self, entry_path: Path) -> Optional[dict]:
+        try:
+            data = entry_path.read_bytes()
+            record_read(len(data))
+            entry = json.loads(data)
+            return entry if isinstance(entry, dict) else None
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt or written by an incompatible version: treat as a miss.
+            return None
+
+    def _write_entry(self, entry_path: Path, entry: dict) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, entry_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def get_or_build(self, source_path: str | Path, build: Callable[[], Any]) -> Any:
+        source_path = Path(source_path).resolve()
+        stat = source_path.stat()
+        entry_path = self._entry_path(source_path)
+        entry = self._read_entry(entry_path)
+
+        if entry and entry.get("format") == CACHE_FORMAT_VERSION and entry.get("path") == str(source_path):
+            value = self._decode(entry)
+            if value is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                self._touch(entry_path)
+                self.stats.hits += 1
+                return value
+
+            if value is not None and entry["size"] == stat.st_size:
+                content_hash = file_sha256(source_path)
+                if entry["sha256"] == content_hash:
+                    # Same bytes, new mtime (e.g. a sync client touched it).
+                    entry["mtime_ns"] = stat.st_mtime_ns
+                    self._try_write(entry_path, entry)
+                    self.stats.hits += 1
+                    return value
+
+        self.stats.misses += 1
+        value = build()
+        try:
+            encoded = self.encode(value)
+            json.dumps(encoded)
+        except (TypeError, ValueError):
+            # Not representable as JSON (e.g. a date cell): rebuild next time.
+            return value
+
+        entry = {
+            "format": CACHE_FORMAT_VERSION,
+            "path": str(source_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_sha256(source_path),
+            "value": encoded,
+        }
+        if self._try_write(entry_path, entry):
+            self.evict()
+
+        return value
+
+    def _decode(self, entry: dict) -> Any:
+        try:
+            return self.decode(entry["value"])
+        except Exception:
+            return None
+
+    def _try_write(self, entry_path: Path, entry: dict) -> bool:
+        try:
+            self._write_entry(entry_path, entry)
+            return True
+        except OSError as e:
+            print(f"⚠️  Could not write cache entry {entry_path.name}: {e}")
+            return False
+
+    def _touch(self, entry_path: Path) -> None:
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """Drop entries older than max_age and keep at most max_entries per namespace."""
+        if not self.cache_dir.is_dir():
+            return
+
+        now = time.time()
+        entries = []
+        for path in self.cache_dir.glob(f"{self.namespace}-*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+
+        entries.sort(reverse=True)
+        for index, (mtime, path) in enumerate(entries):
+            if index >= self.max_entries or now - mtime > self.max_age_seconds:
+                path.unlink(missing_ok=True)
+                self.stats.evictions += 1
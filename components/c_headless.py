@@ -0,0 +1,327 @@
+import os
+import sys
+import json
+import argparse
+import importlib
+import contextlib
+from pathlib import Path
+from typing import Callable, Optional
+
+from components.c_instrumentation import print_timings, write_chrome_trace
+from components.c_profiling import add_profiling_arguments, profile_session
+
+# Exit codes of the headless subcommands; 2 is argparse's own usage error.
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INPUT = 3
+EXIT_ERROR = 4
+
+GENERATORS = {
+    "generate": ("components.c_dbx_generator", "dbx_context_param.xlsx"),
+    "generate-optima": ("components.c_dbx_generator_optima", "dbx_context_param_optima.xlsx"),
+}
+
+
+class InputError(Exception):
+    """A missing or unusable input path; reported with EXIT_INPUT."""
+
+
+def _base_path() -> Optional[str]:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return os.getenv('BASE_PATH')
+
+
+def _default(explicit: Optional[str], describe: str, build: Callable[[str], Path]) -> Path:
+    if explicit:
+        return Path(explicit)
+    base_path = _base_path()
+    if not base_path:
+        raise InputError(f"BASE_PATH is not set; pass {describe} explicitly")
+    return build(base_path)
+
+
+def _require_file(path: Path) -> Path:
+    if not path.is_file():
+        raise InputError(f"File not found: {path}")
+    return path
+
+
+def _require_dir(path: Path) -> Path:
+    if not path.is_dir():
+        raise InputError(f"Directory not found: {path}")
+    return path
+
+
+def apply_probe_root(args: argparse.Namespace) -> None:
+    """--probe-root turns the source probe on for this process and its batch workers."""
+    root = getattr(args, "probe_root", None)
+    if root:
+        from components.c_source_probe import PROBE_ROOT_ENV
+
+        os.environ[PROBE_ROOT_ENV] = root
+
+
+def resolve_generator_paths(
+    command: str,
+    context: Optional[str] = None,
+    templates: Optional[str] = None,
+    output: Optional[str] = None,
+) -> tuple[Path, Path, Path]:
+    """(workbook, template_dir, output_dir) for a generator, defaulting to BASE_PATH."""
+    workbook_name = GENERATORS[command][1]
+    workbook = _require_file(_default(context, "--context", lambda base: Path(f"{base}{workbook_name}")))
+    template_dir = _require_dir(_default(templates, "--templates", lambda base: Path(base) / "templates" / "phase1"))
+    output_dir = _default(output, "--output", lambda base: Path(base) / "output")
+    return workbook, template_dir, output_dir
+
+
+def _generate(args: argparse.Namespace) -> dict:
+    module_name = GENERATORS[args.command][0]
+    workbook, template_dir, output_dir = resolve_generator_paths(args.command, args.context, args.templates, args.output)
+    manifest = _require_file(Path(args.manifest)) if args.manifest else None
+
+    generator = importlib.import_module(module_name)
+    use_cache = not args.no_cache
+    incremental = not args.force
+
+    if args.batch or manifest:
+        results = generator.dbx_batch_main(
+            manifest_path=manifest, max_workers=args.workers, use_cache=use_cache, incremental=incremental,
+            workbook_path=workbook, template_dir=template_dir, output_dir=output_dir
+        )
+        return {
+            "ok": all(result.ok for result in results),
+            "mode": "batch",
+            "manifest": str(manifest or workbook),
+            "output_dir": str(output_dir),
+            "pipelines": [
+                {"pipeline": r.pipeline, "ok": r.ok, "seconds": round(r.seconds, 4), "output_dir": r.output_dir, "error": r.error}
+                for r in results
+            ],
+        }
+
+    from components.c_output_writer import OutputWriter
+
+    writer = OutputWriter(batch_fsync=True)
+    results = generator.dbx_main(
+        use_cache=use_cache, incremental=incremental,
+        workbook_path=workbook, template_dir=template_dir, output_dir=output_dir, writer=writer
+    )
+    return {
+        "ok": all(result.ok for result in results),
+        "mode": "single",
+        "workbook": str(workbook),
+        "output_dir": str(output_dir),
+        "written": writer.stats.written,
+        "unchanged": writer.stats.unchanged,
+        "bytes_written": writer.stats.bytes_written,
+        "artifacts": [
+            {"name": r.name, "ok": r.ok, "seconds": round(r.seconds, 4), "error": r.error}
+            for r in results
+        ],
+    }
+
+
+def _mop(args: argparse.Namespace) -> dict:
+    context = _require_file(_default(args.context, "--context", lambda base: Path(f"{base}dbx_context_param.xlsx")))
+    if args.templates:
+        _require_dir(Path(args.templates))
+    if args.output:
+        Path(args.output).mkdir(parents=True, exist_ok=True)
+
+    from create_mop import create_mop
+
+    output_file = create_mop(context_path=str(context), template_dir=args.templates, output_dir=args.output)
+    return {"ok": True, "output_file": str(output_file)}
+
+
+def _xml_ddl(args: argparse.Namespace) -> dict:
+    _require_dir(Path(args.input))
+
+    from xml_to_ddl import xml_folder_to_ddl
+
+    files = xml_folder_to_ddl(args.input, args.output)
+    return {"ok": True, "input": args.input, "output": args.output, "files": files}
+
+
+def _extract_keys(args: argparse.Namespace) -> dict:
+    if args.file == "-":
+        json_data = sys.stdin.read()
+    else:
+        json_data = _require_file(Path(args.file)).read_text(encoding="utf-8")
+
+    from json_extractor import JSONKeyExtractor
+
+    extractor = JSONKeyExtractor()
+    extractor.extract_keys(json_data)
+    keys = extractor.get_keys(show_path=args.show_path, sort_keys=args.sort, filter_by_type=args.filter_type)
+    if not args.json:
+        for key in keys:
+            print(key)
+    return {"ok": True, "keys": keys, "statistics": extractor.get_statistics()}
+
+
+def _session(args: argparse.Namespace) -> dict:
+    from components.c_session import GeneratorSession, session_mode
+
+    session = GeneratorSession(args.variant, args.context, args.templates, args.output, use_cache=not args.no_cache)
+    return {"ok": True, "runs": session_mode(session)}
+
+
+def _watch(args: argparse.Namespace) -> dict:
+    from components.c_session import GeneratorSession
+    from components.c_watch import InputWatcher
+
+    variants = list(GENERATORS) if args.variant == "all" else [args.variant]
+    contexts = {"generate": args.context, "generate-optima": args.context_optima}
+    sessions = []
+    for variant in variants:
+        try:
+            sessions.append(GeneratorSession(variant, contexts[variant], args.templates, args.output, use_cache=not args.no_cache))
+        except InputError as e:
+            if args.variant != "all":
+                raise
+            print(f"⚠️  {variant}: {e}; not watched")
+    if not sessions:
+        raise InputError("No context workbook to watch")
+
+    watcher = InputWatcher(sessions, debounce=args.debounce, poll_interval=args.interval, use_watchdog=not args.poll)
+    stats = watcher.run()
+    return {"ok": True, "rebuilds": stats.rebuilds, "failures": stats.failures}
+
+
+def _calibrate(args: argparse.Namespace) -> dict:
+    history = _require_file(Path(args.history))
+
+    from components.c_cluster_calibration import calibrate
+
+    return {"ok": True, **calibrate(history, args.output, args.target_minutes)}
+
+
+def _simulate_policy(args: argparse.Namespace) -> dict:
+    from components.c_cluster_policy import compare_policies
+
+    return {"ok": True, **compare_policies(args.size, args.format, args.columns, args.frequency, args.file_mask)}
+
+
+def add_headless_commands(parser: argparse.ArgumentParser) -> None:
+    """
+    Non-interactive subcommands for scripts, schedulers and CI. Without a
+    subcommand the CLI shows the menu as before.
+    """
+    # SUPPRESS keeps the value parsed by the main parser when the option is
+    # given before the subcommand instead of after it.
+    diagnostics = argparse.ArgumentParser(add_help=False)
+    diagnostics.add_argument("--timings", action="store_true", default=argparse.SUPPRESS, help="Print a per-stage timing, bytes and rows summary")
+    diagnostics.add_argument("--trace", metavar="OUT_JSON", default=argparse.SUPPRESS, help="Write a Chrome-trace file of every stage")
+    add_profiling_arguments(diagnostics, suppress=True)
+
+    common = argparse.ArgumentParser(add_help=False, parents=[diagnostics])
+    common.add_argument("--json", action="store_true", help="Print a JSON result on stdout; progress goes to stderr")
+
+    generation = argparse.ArgumentParser(add_help=False)
+    generation.add_argument("--context", help="Context workbook (default: BASE_PATH workbook)")
+    generation.add_argument("--templates", help="Template directory (default: BASE_PATH/templates/phase1)")
+    generation.add_argument("--output", help="Output directory (default: BASE_PATH/output)")
+    generation.add_argument("--batch", action="store_true", help="Generate every pipeline of the context workbook's 'pipelines' sheet")
+    generation.add_argument("--manifest", default=argparse.SUPPRESS, help="Batch manifest (.xlsx or .csv); implies --batch")
+    generation.add_argument("--workers", type=int, default=argparse.SUPPRESS, help="Worker processes for batch generation")
+    generation.add_argument("--no-cache", action="store_true", default=argparse.SUPPRESS, help="Ignore the local caches")
+    generation.add_argument("--force", action="store_true", default=argparse.SUPPRESS, help="Regenerate every artifact")
+    generation.add_argument("--probe-root", default=argparse.SUPPRESS, help="Local mount of the source directories; size clusters from a scan of p_source_directory")
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    for name in GENERATORS:
+        sub = subparsers.add_parser(name, parents=[common, generation], help=f"Generate Databricks artifacts ({GENERATORS[name][1]})")
+        sub.set_defaults(handler=_generate)
+
+    sub = subparsers.add_parser("mop", parents=[common], help="Create the MOP workbook")
+    sub.add_argument("--context", help="Context workbook (default: BASE_PATH/dbx_context_param.xlsx)")
+    sub.add_argument("--templates", help="Directory with Alapaap_wde_mop_template.xlsx (default: BASE_PATH/templates/phase1)")
+    sub.add_argument("--output", help="Output directory (default: BASE_PATH/output)")
+    sub.set_defaults(handler=_mop)
+
+    sub = subparsers.add_parser("xml-ddl", parents=[common], help="Convert Talend XML schemas to column lists")
+    sub.add_argument("--input", default="xml", help="Base folder with the XML files (default: xml)")
+    sub.add_argument("--output", default="xml_ddl_output", help="Output base folder (default: xml_ddl_output)")
+    sub.set_defaults(handler=_xml_ddl)
+
+    sub = subparsers.add_parser("extract-keys", parents=[common], help="List the keys of a JSON file")
+    sub.add_argument("file", help="JSON file, or - for stdin")
+    sub.add_argument("--show-path", action="store_true", help="Full paths instead of key names")
+    sub.add_argument("--sort", action="store_true", help="Sort the keys")
+    sub.add_argument("--filter-type", help="Only paths whose value has this type (with --show-path)")
+    sub.set_defaults(handler=_extract_keys)
+
+    sub = subparsers.add_parser("calibrate", parents=[common], help="Fit cluster sizing to a job-run history export")
+    sub.add_argument("history", help="CSV or Parquet export of job runs (pipeline, bytes, format, workers, node type, duration)")
+    sub.add_argument("--output", required=True, help="Where to write the calibrated sizing table; generation only uses it at templates/cluster_calibration.json")
+    sub.add_argument("--target-minutes", type=float, default=30.0, help="Runtime each cluster class is sized to meet (default: 30)")
+    sub.set_defaults(handler=_calibrate)
+
+    sub = subparsers.add_parser("simulate-policy", parents=[common], help="Compare the runtime and cost of the cluster policies for one feed")
+    sub.add_argument("size", help="Input per run, e.g. 500mb, 4gb, 1.5tb")
+    sub.add_argument("--format", default="csv", help="Source file format, e.g. csv, csv.gz, parquet (default: csv)")
+    sub.add_argument("--columns", type=int, default=0, help="Number of columns (default: 0, no width factor)")
+    sub.add_argument("--frequency", default="daily", help="hourly, daily, weekly or monthly (default: daily)")
+    sub.add_argument("--file-mask", default="", help="Source file mask; a compression suffix such as *.gz counts")
+    sub.set_defaults(handler=_simulate_policy)
+
+    sub = subparsers.add_parser("session", parents=[diagnostics], help="Interactive session that keeps the workbook and templates in memory")
+    sub.add_argument("--variant", choices=list(GENERATORS), default="generate", help="Generator to run (default: generate)")
+    sub.add_argument("--context", help="Context workbook (default: BASE_PATH workbook)")
+    sub.add_argument("--templates", help="Template directory (default: BASE_PATH/templates/phase1)")
+    sub.add_argument("--output", help="Output directory (default: BASE_PATH/output)")
+    sub.add_argument("--no-cache", action="store_true", default=argparse.SUPPRESS, help="Ignore the local caches")
+    sub.set_defaults(handler=_session, json=False)
+
+    sub = subparsers.add_parser("watch", parents=[diagnostics], help="Regenerate affected artifacts whenever a workbook or template is saved")
+    sub.add_argument("--variant", choices=["all", *GENERATORS], default="all", help="Generator(s) to run (default: all)")
+    sub.add_argument("--context", help="Context workbook for generate (default: BASE_PATH workbook)")
+    sub.add_argument("--context-optima", help="Context workbook for generate-optima (default: BASE_PATH workbook)")
+    sub.add_argument("--templates", help="Template directory (default: BASE_PATH/templates/phase1)")
+    sub.add_argument("--output", help="Output directory (default: BASE_PATH/output)")
+    sub.add_argument("--debounce", type=float, default=0.3, help="Seconds without further changes before regenerating (default: 0.3)")
+    sub.add_argument("--interval", type=float, default=0.5, help="Polling interval in seconds (default: 0.5)")
+    sub.add_argument("--poll", action="store_true", help="Poll even if watchdog is installed")
+    sub.add_argument("--no-cache", action="store_true", default=argparse.SUPPRESS, help="Ignore the local caches")
+    sub.set_defaults(handler=_watch, json=False)
+
+
+def run_headless(args: argparse.Namespace) -> int:
+    """
+    Run the selected subcommand and return its exit code: EXIT_OK, EXIT_FAILED
+    (an artifact or pipeline failed), EXIT_INPUT (missing or invalid input) or
+    EXIT_ERROR (anything unexpected). With --json, the result is the only thing
+    written to stdout.
+    """
+    stdout = sys.stdout
+    result: dict = {}
+    with contextlib.redirect_stdout(sys.stderr if args.json else stdout):
+        try:
+            apply_probe_root(args)
+            with profile_session(args.profile, args.profile_memory):
+                result = args.handler(args)
+            exit_code = EXIT_OK if result.get("ok", True) else EXIT_FAILED
+        except (InputError, FileNotFoundError, NotADirectoryError, ValueError) as e:
+            exit_code = EXIT_INPUT
+            result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        except Exception as e:
+            exit_code = EXIT_ERROR
+            result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+        if "error" in result:
+            print(f"❌ {args.command}: {result['error']}", file=sys.stderr)
+
+        if args.timings:
+            print_timings()
+        if args.trace:
+            write_chrome_trace(args.trace)
+
+    if args.json:
+        print(json.dumps({"command": args.command, "exit_code": exit_code, **result}, indent=2, default=str), file=stdout)
+    return exit_code
@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import functools
+import threading
+import contextlib
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+# perf_counter has an arbitrary origin per process; anchoring it to the wall
+# clock once lets events from batch worker processes share one timeline.
+_CLOCK_OFFSET = time.time() - time.perf_counter()
+
+
+def _now() -> float:
+    return time.perf_counter() + _CLOCK_OFFSET
+
+
+@dataclass
+class StageEvent:
+    name: str
+    start: float
+    end: float = 0.0
+    pid: int = 0
+    tid: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    rows: int = 0
+    # Net traced allocation over the stage; only filled under --profile-memory.
+    memory: int = 0
+    args: dict = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class StageRecorder:
+    """Collects finished stages from every thread of this process."""
+
+    def __init__(self) -> None:
+        self._events: list[StageEvent] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> list[StageEvent]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self) -> Optional[StageEvent]:
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    @contextlib.contextmanager
+    def stage(self, name: str, **args) -> Iterator[StageEvent]:
+        event = StageEvent(
+            name=name,
+            start=_now(),
+            pid=os.getpid(),
+            tid=threading.get_ident(),
+            args=args,
+        )
+        tracing = tracemalloc.is_tracing()
+        memory_start = tracemalloc.get_traced_memory()[0] if tracing else 0
+        stack = self._stack()
+        stack.append(event)
+        try:
+            yield event
+        finally:
+            stack.pop()
+            event.end = _now()
+            if tracing and tracemalloc.is_tracing():
+                event.memory = tracemalloc.get_traced_memory()[0] - memory_start
+            with self._lock:
+                self._events.append(event)
+
+    def events(self) -> list[StageEvent]:
+        with self._lock:
+            return sorted(self._events, key=lambda e: e.start)
+
+    def extend(self, events: list[StageEvent]) -> None:
+        with self._lock:
+            self._events.extend(events)
+
+    def drain(self) -> list[StageEvent]:
+        with self._lock:
+            events, self._events = self._events, []
+        return events
+
+    def reset(self) -> None:
+        self.drain()
+
+
+recorder = StageRecorder()
+
+
+def stage(name: str, **args):
+    """Context manager timing one stage; bytes/rows recorded inside land on it."""
+    return recorder.stage(name, **args)
+
+
+def instrumented(func: Callable) -> Callable:
+    """Run every call of func as a stage named after the function."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with recorder.stage(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def record_read(num_bytes: int) -> None:
+    event = recorder.current()
+    if event is not None:
+        event.bytes_read += num_bytes
+
+
+def record_written(num_bytes: int) -> None:
+    event = recorder.current()
+    if event is not None:
+        event.bytes_written += num_bytes
+
+
+def record_rows(rows: int) -> None:
+    event = recorder.current()
+    if event is not None:
+        event.rows += rows
+
+
+def print_timings(events: Optional[list[StageEvent]] = None) -> None:
+    """
+    Per-stage console summary. Times are inclusive (a generator's stage
+    contains its render_template and write_output stages); bytes and rows are
+    counted on the innermost stage only.
+    """
+    events = recorder.events() if events is None else events
+    if not events:
+        print("⏱️  No stages recorded.")
+        return
+
+    totals: dict[str, dict] = {}
+    for event in events:
+        total = totals.setdefault(event.name, {"calls": 0, "seconds": 0.0, "read": 0, "written": 0, "rows": 0})
+        total["calls"] += 1
+        total["seconds"] += event.duration
+        total["read"] += event.bytes_read
+        total["written"] += event.bytes_written
+        total["rows"] += event.rows
+
+    wall = max(e.end for e in events) - min(e.start for e in events)
+    print(f"⏱️  {'STAGE':<36} {'CALLS':>6} {'TOTAL ms':>10} {'READ':>12} {'WRITTEN':>12} {'ROWS':>8}")
+    for name, total in sorted(totals.items(), key=lambda item: item[1]["seconds"], reverse=True):
+        print(
+            f"   {name:<36} {total['calls']:>6} {total['seconds'] * 1000:>10.2f} "
+            f"{total['read']:>12,} {total['written']:>12,} {total['rows']:>8,}"
+        )
+    print(f"⏱️  WALL: {wall * 1000:.2f} ms across {len({(e.pid, e.tid) for e in events})} thread(s)")
+
+
+def write_chrome_trace(path: str | Path, events: Optional[list[StageEvent]] = None) -> Path:
+    """Write the stages as a Chrome trace (chrome://tracing, Perfetto, speedscope)."""
+    events = recorder.events() if events is None else events
+    trace_events = [
+        {
+            "name": event.name,
+            "cat": "kaizen",
+            "ph": "X",
+            "ts": event.start * 1_000_000,
+            "dur": event.duration * 1_000_000,
+            "pid": event.pid,
+            "tid": event.tid,
+            "args": {
+                **event.args,
+                "bytes_read": event.bytes_read,
+                "bytes_written": event.bytes_written,
+                "rows": event.rows,
+            },
+        }
+        for event in events
+    ]
+
+    path = Path(path)
+    path.write_text(json.dumps({"traceEvents": trace_events, "displayTimeUnit": "ms"}), encoding="utf-8")
+    print(f"🧭 TRACE: {len(trace_events)} stage(s) written to {path.resolve()}")
+    return path
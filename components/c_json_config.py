@@ -0,0 +1,229 @@
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from components.c_template_engine import CompiledTemplate
+
+# Private-use characters, valid inside JSON strings and never present in templates.
+# Placeholders inside a JSON string and bare placeholders get distinct markers, so
+# "<application_name>" stays a string while <header_flag> can become a boolean.
+_SENTINEL_OPEN = "\ue000"
+_SENTINEL_CLOSE = "\ue001"
+_BARE_OPEN = "\ue002"
+_BARE_CLOSE = "\ue003"
+
+
+class _Splice(list):
+    """Items of a bare placeholder that expand in place inside a JSON array."""
+
+
+@dataclass
+class JsonConfigBuild:
+    config: dict
+    unknown: list[str] = field(default_factory=list)
+    empty: list[str] = field(default_factory=list)
+
+
+def _sentinel(token: str) -> str:
+    return f"{_SENTINEL_OPEN}{token}{_SENTINEL_CLOSE}"
+
+
+def _bare_sentinel(token: str) -> str:
+    return json.dumps(f"{_BARE_OPEN}{token}{_BARE_CLOSE}")
+
+
+@lru_cache(maxsize=32)
+def _parse_skeleton(template: CompiledTemplate) -> Any:
+    """
+    Parse a JSON template once into a Python tree. Placeholders inside JSON
+    strings become inline sentinels; bare placeholders (e.g. <header_flag>,
+    <schema>) become sentinel strings that are swapped for typed values.
+    """
+    parts = [template.literals[0]]
+    in_string = False
+    escaped = False
+
+    def scan(literal: str) -> None:
+        nonlocal in_string, escaped
+        for char in literal:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = in_string
+            elif char == '"':
+                in_string = not in_string
+
+    scan(template.literals[0])
+    for token, literal in zip(template.placeholders, template.literals[1:]):
+        parts.append(_sentinel(token) if in_string else _bare_sentinel(token))
+        parts.append(literal)
+        scan(literal)
+
+    try:
+        return json.loads("".join(parts))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON template is not valid JSON around line {e.lineno}: {e.msg}") from e
+
+
+def _bare_value(token: str, replacements: dict[str, str], values: dict[str, Any], build: JsonConfigBuild) -> Any:
+    if token in values:
+        return values[token]
+
+    if token not in replacements:
+        raise ValueError(f"Bare placeholder {token} has no value; the JSON would be invalid.")
+
+    text = replacements[token]
+    if text == "":
+        build.empty.append(token)
+    try:
+        items = json.loads(f"[{text}]")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Value for {token} is not a JSON literal: {text!r}") from e
+
+    if len(items) == 1:
+        return items[0]
+    return _Splice(items)
+
+
+def _unescape(value: str) -> str:
+    """
+    Workbook values are written as they would appear inside a JSON string
+    (a tab delimiter is typed as \\t), so their escapes are decoded; text that
+    is not a valid JSON string body is kept as-is.
+    """
+    if "\\" not in value:
+        return value
+    try:
+        return json.loads(f'"{value}"')
+    except json.JSONDecodeError:
+        return value
+
+
+def _fill_string(text: str, replacements: dict[str, str], build: JsonConfigBuild) -> str:
+    if _SENTINEL_OPEN not in text:
+        return text
+
+    out = []
+    position = 0
+    while True:
+        start = text.find(_SENTINEL_OPEN, position)
+        if start < 0:
+            out.append(text[position:])
+            return "".join(out)
+        end = text.index(_SENTINEL_CLOSE, start)
+        token = text[start + 1:end]
+        out.append(text[position:start])
+
+        value = replacements.get(token)
+        if value is None:
+            build.unknown.append(token)
+            out.append(token)
+        else:
+            if value == "":
+                build.empty.append(token)
+            out.append(_unescape(value))
+        position = end + 1
+
+
+def _is_bare(node: Any) -> bool:
+    return isinstance(node, str) and node.startswith(_BARE_OPEN) and node.endswith(_BARE_CLOSE)
+
+
+def _fill(node: Any, replacements: dict[str, str], values: dict[str, Any], build: JsonConfigBuild) -> Any:
+    if isinstance(node, dict):
+        return {
+            _fill_string(key, replacements, build): _fill(value, replacements, values, build)
+            for key, value in node.items()
+        }
+
+    if isinstance(node, list):
+        items = []
+        for item in node:
+            if _is_bare(item):
+                value = _bare_value(item[1:-1], replacements, values, build)
+                if isinstance(value, _Splice):
+                    items.extend(value)
+                else:
+                    items.append(value)
+            else:
+                items.append(_fill(item, replacements, values, build))
+        return items
+
+    if isinstance(node, str):
+        if _is_bare(node):
+            value = _bare_value(node[1:-1], replacements, values, build)
+            return list(value) if isinstance(value, _Splice) else value
+        return _fill_string(node, replacements, build)
+
+    return node
+
+
+def build_json_config(
+    template: CompiledTemplate,
+    replacements: dict[str, str],
+    values: dict[str, Any],
+) -> JsonConfigBuild:
+    """
+    Build the pipeline config as a dict from a compiled JSON template.
+    String placeholders are filled from replacements; bare placeholders take
+    typed values from values, or are parsed as JSON literals from replacements
+    (so "true" becomes a boolean and '"a", "b"' expands inside an array).
+    """
+    skeleton = _parse_skeleton(template)
+    build = JsonConfigBuild(config={})
+
+    config = _fill(skeleton, replacements, values, build)
+    if not isinstance(config, dict):
+        raise ValueError("JSON template must describe an object at the top level.")
+
+    build.config = config
+    build.unknown = list(dict.fromkeys(build.unknown))
+    build.empty = list(dict.fromkeys(build.empty))
+    return build
+
+
+def validate_json_config(config: dict) -> None:
+    """Raise ValueError listing every problem that would break the loader."""
+    problems = []
+
+    if not config.get("application_name"):
+        problems.append("application_name is empty")
+
+    task = config.get("task_configuration")
+    if not isinstance(task, dict):
+        problems.append("task_configuration is missing")
+        task = {}
+
+    datasource = task.get("datasource_configuration", {})
+    if not isinstance(datasource.get("header_flag"), bool):
+        problems.append(f"header_flag must be true/false, got {datasource.get('header_flag')!r}")
+    if not isinstance(datasource.get("delimiter", ""), str):
+        problems.append(f"delimiter must be a string, got {datasource.get('delimiter')!r}")
+    if not datasource.get("file_format"):
+        problems.append("file_format is empty")
+
+    endpoint = task.get("endpoint_configuration", {})
+    if not endpoint.get("table_name") or ".." in endpoint.get("table_name", ""):
+        problems.append(f"endpoint table_name is incomplete: {endpoint.get('table_name')!r}")
+    if not isinstance(endpoint.get("target_partition_list", []), list):
+        problems.append("target_partition_list must be a list")
+
+    standardization = task.get("data_standardization_configuration", [])
+    if not isinstance(standardization, list):
+        problems.append("data_standardization_configuration must be a list")
+
+    for rule in task.get("data_quality_configuration", []):
+        parameters = rule.get("parameters") or {}
+        if "expected_count" in parameters and not isinstance(parameters["expected_count"], int):
+            problems.append(f"{rule.get('rule_name')}: expected_count must be an integer")
+        if "expected_schema" in parameters and not isinstance(parameters["expected_schema"], list):
+            problems.append(f"{rule.get('rule_name')}: expected_schema must be a list")
+
+    if problems:
+        raise ValueError("Invalid JSON config: " + "; ".join(problems))
+
+
+def dump_json_config(config: dict) -> str:
+    # One serializer and layout everywhere, so unchanged inputs give unchanged bytes.
+    return json.dumps(config, indent=4, ensure_ascii=False)
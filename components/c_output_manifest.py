@@ -0,0 +1,233 @@
+import sys
+import json
+import math
+import hashlib
+import threading
+import dataclasses
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any, Optional
+
+from components.c_artifact_dag import ArtifactStep, StepResult, run_artifact_dag
+from components.c_disk_cache import file_sha256
+from components.c_instrumentation import stage
+from components.c_output_writer import OutputWriter
+
+MANIFEST_NAME = ".kaizen-manifest.json"
+MANIFEST_FORMAT_VERSION = 1
+
+
+@dataclass
+class IncrementalSummary:
+    rebuilt: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+    def summary(self) -> str:
+        return f"{self.rebuilt} rebuilt, {self.skipped} skipped, {self.failed} failed"
+
+
+_file_hashes: dict[Path, tuple[int, int, str]] = {}
+_file_hashes_lock = threading.Lock()
+
+
+def _cached_file_sha256(path: Path) -> str:
+    """file_sha256 memoized per process on (mtime, size); templates are hashed once per run."""
+    stat = path.stat()
+    with _file_hashes_lock:
+        cached = _file_hashes.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    digest = file_sha256(path)
+    with _file_hashes_lock:
+        _file_hashes[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+@lru_cache(maxsize=None)
+def _source_sha256(module_name: str) -> str:
+    """
+    Hash of a generator's module plus the components it calls into, so a code
+    change to a generator (or e.g. the template engine) rebuilds its artifacts.
+    """
+    module = sys.modules.get(module_name)
+    files = {getattr(module, "__file__", None)}
+
+    for value in (vars(module).values() if module else ()):
+        dependency = getattr(value, "__module__", None) or getattr(value, "__name__", "")
+        if isinstance(dependency, str) and dependency.startswith("components."):
+            files.add(getattr(sys.modules.get(dependency), "__file__", None))
+
+    digest = hashlib.sha256()
+    for file in sorted(f for f in files if f):
+        digest.update(file_sha256(Path(file)).encode("ascii"))
+    return digest.hexdigest()
+
+
+def _canonical(value: Any, outputs: frozenset[Path]) -> Any:
+    """JSON-friendly form of a generator argument; input files stand in by content hash."""
+    if isinstance(value, Path):
+        if value not in outputs and value.is_file():
+            return {"file": value.name, "sha256": _cached_file_sha256(value)}
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            f.name: _canonical(getattr(value, f.name), outputs)
+            for f in dataclasses.fields(value)
+        }
+    if isinstance(value, dict):
+        return {str(k): _canonical(v, outputs) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_canonical(v, outputs) for v in value]
+    if isinstance(value, float) and math.isnan(value):
+        return "nan"
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+
+def step_fingerprint(step: ArtifactStep) -> Optional[str]:
+    """
+    Hash of everything that determines a step's output: the generator and its
+    source, every argument (context replacements, schema rows, ...) and the
+    content of every input file (templates). None when the step's callable is
+    not a partial, in which case it is always rebuilt.
+    """
+    if not isinstance(step.run, partial):
+        return None
+
+    func = step.run.func
+    outputs = frozenset(step.outputs)
+    payload = {
+        "generator": f"{func.__module__}.{func.__qualname__}",
+        "source": _source_sha256(func.__module__),
+        "args": _canonical(step.run.args, outputs),
+        "kwargs": _canonical(step.run.keywords, outputs),
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class OutputManifest:
+    """
+    Per output directory record (output/.kaizen-manifest.json) of which inputs
+    produced each artifact, and the size/mtime/hash the artifact had then.
+    """
+
+    def __init__(self, output_dir: str | Path) -> None:
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_NAME
+        self.artifacts: dict[str, dict] = {}
+
+    def load(self) -> "OutputManifest":
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return self
+
+        if data.get("format") == MANIFEST_FORMAT_VERSION:
+            self.artifacts = data.get("artifacts", {})
+        return self
+
+    def save(self) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(
+            {"format": MANIFEST_FORMAT_VERSION, "artifacts": self.artifacts},
+            indent=2, sort_keys=True
+        )
+        # Atomic, and not rewritten at all when nothing was rebuilt.
+        OutputWriter().write_text(self.path, data, encoding="utf-8", newline="\n")
+
+    def artifact_id(self, step: ArtifactStep) -> str:
+        # Keyed by output file as well as step, so looping over several
+        # pipelines into the same output/ keeps one entry per pipeline.
+        return f"{step.name}:" + "|".join(sorted(self._relative(p) for p in step.outputs))
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return Path(path).resolve().relative_to(self.output_dir.resolve()).as_posix()
+        except ValueError:
+            return str(Path(path).resolve())
+
+    def is_fresh(self, step: ArtifactStep, fingerprint: str) -> bool:
+        entry = self.artifacts.get(self.artifact_id(step))
+        if not entry or entry.get("inputs") != fingerprint:
+            return False
+
+        for path in step.outputs:
+            recorded = entry["outputs"].get(self._relative(path))
+            try:
+                stat = Path(path).stat()
+            except FileNotFoundError:
+                return False
+            if not recorded or recorded["size"] != stat.st_size:
+                return False
+            if recorded["mtime_ns"] != stat.st_mtime_ns and recorded["sha256"] != file_sha256(Path(path)):
+                return False
+        return True
+
+    def record(self, step: ArtifactStep, fingerprint: str) -> None:
+        outputs = {}
+        for path in step.outputs:
+            path = Path(path)
+            stat = path.stat()
+            outputs[self._relative(path)] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": file_sha256(path),
+            }
+        self.artifacts[self.artifact_id(step)] = {"inputs": fingerprint, "outputs": outputs}
+
+    def forget(self, step: ArtifactStep) -> None:
+        self.artifacts.pop(self.artifact_id(step), None)
+
+
+def _skip(name: str) -> None:
+    print(f"⏭️  {name}: unchanged")
+
+
+def run_incremental_dag(
+    steps: list[ArtifactStep],
+    output_dir: str | Path,
+    max_workers: Optional[int] = None,
+) -> tuple[list[StepResult], IncrementalSummary]:
+    """
+    Run the artifact DAG, skipping every step whose inputs and outputs match
+    the manifest in output_dir. Rebuilt steps are recorded once they succeed;
+    failed ones are dropped so the next run retries them.
+    """
+    with stage("check_manifest", steps=len(steps)):
+        manifest = OutputManifest(output_dir).load()
+        fingerprints = {step.name: step_fingerprint(step) for step in steps}
+        skipped = {
+            step.name for step in steps
+            if step.outputs and fingerprints[step.name] and manifest.is_fresh(step, fingerprints[step.name])
+        }
+
+    planned = [
+        dataclasses.replace(step, run=partial(_skip, step.name)) if step.name in skipped else step
+        for step in steps
+    ]
+    results = run_artifact_dag(planned, max_workers=max_workers)
+
+    summary = IncrementalSummary()
+    for step, result in zip(steps, results):
+        if step.name in skipped:
+            summary.skipped += 1
+        elif not result.ok:
+            summary.failed += 1
+            manifest.forget(step)
+        else:
+            summary.rebuilt += 1
+            if step.outputs and fingerprints[step.name]:
+                manifest.record(step, fingerprints[step.name])
+
+    try:
+        manifest.save()
+    except OSError as e:
+        print(f"⚠️  Could not write output manifest {manifest.path}: {e}")
+
+    print(f"♻️  INCREMENTAL: {summary.summary()}")
+    return results, summary
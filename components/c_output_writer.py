@@ -0,0 +1,266 @@
+import os
+import locale
+import hashlib
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from components.c_disk_cache import file_sha256
+from components.c_instrumentation import record_read, record_written, stage
+
+# Characters encoded per write when streaming; bounds memory at one chunk.
+STREAM_CHUNK_SIZE = 1 << 16
+
+# Read once at import: os.umask can only be queried by setting it.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@dataclass
+class WriteStats:
+    written: int = 0
+    unchanged: int = 0
+    bytes_written: int = 0
+
+    def summary(self) -> str:
+        return f"{self.written} written ({self.bytes_written:,} bytes), {self.unchanged} unchanged"
+
+
+class OutputWriter:
+    """
+    Single write path for generated artifacts. A file whose bytes would not
+    change is left alone (size first, then hash), so sync clients such as
+    OneDrive see no modification. Changed files are written to a temp file in
+    the same directory and swapped in with os.replace, so a half-written file
+    is never visible.
+
+    With batch_fsync the fsyncs are deferred to flush(), which syncs every
+    written file and its directory once at the end of the run; otherwise each
+    write is synced immediately. Safe to share between the DAG's threads.
+    """
+
+    def __init__(self, batch_fsync: bool = False) -> None:
+        self.batch_fsync = batch_fsync
+        self.stats = WriteStats()
+        self._pending: list[Path] = []
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        # Stable across runs: the output manifest fingerprints generator arguments.
+        return f"OutputWriter(batch_fsync={self.batch_fsync})"
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
+
+    def write_text(
+        self,
+        path: str | Path,
+        text: str,
+        encoding: Optional[str] = None,
+        newline: Optional[str] = None,
+    ) -> bool:
+        """
+        Same encoding and newline handling as Path.write_text (locale encoding,
+        os.linesep line endings unless newline is given). Returns True if the
+        file was written, False if it already had this content.
+        """
+        if newline is None:
+            newline = os.linesep
+        if newline != "\n":
+            text = text.replace("\n", newline)
+        return self.write_bytes(path, text.encode(encoding or locale.getpreferredencoding(False)))
+
+    def write_lines(
+        self,
+        path: str | Path,
+        lines: Iterable[str],
+        encoding: Optional[str] = None,
+        newline: Optional[str] = None,
+    ) -> bool:
+        """
+        Streaming write_text("\n".join(lines)): the same bytes, but the text
+        is never built. Lines are encoded a chunk at a time and compared with
+        the existing file as they arrive; a temp file is only opened at the
+        first difference, so memory stays flat however many lines there are.
+        """
+        path = Path(path)
+        with stage("write_output", file=path.name):
+            return self._write_chunks(path, _encode_lines(lines, encoding, newline))
+
+    def write_bytes(self, path: str | Path, data: bytes) -> bool:
+        path = Path(path)
+        with stage("write_output", file=path.name):
+            return self._write_bytes(path, data)
+
+    def _write_bytes(self, path: Path, data: bytes) -> bool:
+        if self._unchanged(path, data):
+            self._count_unchanged()
+            return False
+
+        f, tmp_name = self._open_temp(path)
+        try:
+            with f:
+                f.write(data)
+                self._sync(f)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self._count_written(path, len(data))
+        return True
+
+    def _write_chunks(self, path: Path, chunks: Iterator[bytes]) -> bool:
+        try:
+            existing = open(path, "rb")
+        except FileNotFoundError:
+            existing = None
+
+        f = tmp_name = None
+        size = matched = 0
+        try:
+            for chunk in chunks:
+                size += len(chunk)
+                if f is None and existing is not None:
+                    if existing.read(len(chunk)) == chunk:
+                        matched += len(chunk)
+                        continue
+                if f is None:
+                    f, tmp_name = self._open_temp(path)
+                    _copy_prefix(existing, f, matched)
+                f.write(chunk)
+
+            if existing is not None:
+                record_read(matched)
+                if f is None and not existing.read(1):
+                    self._count_unchanged()
+                    return False
+                if f is None:
+                    # The old file is longer: keep the matched prefix only.
+                    f, tmp_name = self._open_temp(path)
+                    _copy_prefix(existing, f, matched)
+                existing.close()
+            elif f is None:
+                f, tmp_name = self._open_temp(path)
+
+            with f:
+                self._sync(f)
+            os.replace(tmp_name, path)
+        except BaseException:
+            if f is not None:
+                f.close()
+                Path(tmp_name).unlink(missing_ok=True)
+            raise
+        finally:
+            if existing is not None:
+                existing.close()
+
+        self._count_written(path, size)
+        return True
+
+    @staticmethod
+    def _open_temp(path: Path):
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".tmp-{path.name}-")
+        # mkstemp creates 0600 and os.replace carries that over: give the temp
+        # file the target's mode, or what a plain open() would have created.
+        if hasattr(os, "fchmod"):
+            try:
+                mode = path.stat().st_mode & 0o7777
+            except FileNotFoundError:
+                mode = 0o666 & ~_UMASK
+            os.fchmod(fd, mode)
+        return os.fdopen(fd, "wb"), tmp_name
+
+    def _sync(self, f) -> None:
+        if not self.batch_fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _count_unchanged(self) -> None:
+        with self._lock:
+            self.stats.unchanged += 1
+
+    def _count_written(self, path: Path, size: int) -> None:
+        record_written(size)
+        with self._lock:
+            self.stats.written += 1
+            self.stats.bytes_written += size
+            if self.batch_fsync:
+                self._pending.append(path)
+
+    def _unchanged(self, path: Path, data: bytes) -> bool:
+        try:
+            if path.stat().st_size != len(data):
+                return False
+            record_read(len(data))
+            return file_sha256(path) == hashlib.sha256(data).hexdigest()
+        except FileNotFoundError:
+            return False
+
+    def flush(self) -> None:
+        """fsync every file written since the last flush, then their directories."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        for path in pending:
+            try:
+                with open(path, "rb") as f:
+                    os.fsync(f.fileno())
+            except OSError:
+                pass
+
+        # Directory fsync makes the renames durable; not supported on Windows.
+        if os.name == "posix":
+            for directory in {path.parent for path in pending}:
+                try:
+                    fd = os.open(directory, os.O_RDONLY)
+                except OSError:
+                    continue
+                try:
+                    os.fsync(fd)
+                except OSError:
+                    pass
+                finally:
+                    os.close(fd)
+
+
+def _encode_lines(lines: Iterable[str], encoding: Optional[str], newline: Optional[str]) -> Iterator[bytes]:
+    """Newline-joined lines as encoded chunks of about STREAM_CHUNK_SIZE characters."""
+    encoding = encoding or locale.getpreferredencoding(False)
+    if newline is None:
+        newline = os.linesep
+
+    chunk = []
+    size = 0
+    separator = ""
+    for line in lines:
+        chunk.append(line)
+        size += len(line) + 1
+        if size >= STREAM_CHUNK_SIZE:
+            yield _encode_chunk(separator + "\n".join(chunk), encoding, newline)
+            chunk, size, separator = [], 0, "\n"
+    if chunk:
+        yield _encode_chunk(separator + "\n".join(chunk), encoding, newline)
+
+
+def _encode_chunk(text: str, encoding: str, newline: str) -> bytes:
+    if newline != "\n":
+        text = text.replace("\n", newline)
+    return text.encode(encoding)
+
+
+def _copy_prefix(source, target, size: int) -> None:
+    """Copy the first size bytes of the (partly read) source file into target."""
+    if source is None or not size:
+        return
+    source.seek(0)
+    while size:
+        block = source.read(min(size, 1 << 20))
+        if not block:
+            break
+        target.write(block)
+        size -= len(block)
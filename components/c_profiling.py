@@ -0,0 +1,209 @@
+import io
+import pstats
+import cProfile
+import argparse
+import threading
+import tracemalloc
+import contextlib
+from pathlib import Path
+from typing import Iterator, Optional
+
+from components.c_instrumentation import recorder
+
+# Frames kept per allocation; enough to tell a pandas call site from ours.
+MEMORY_FRAMES = 10
+TOP_N = 15
+
+
+def add_profiling_arguments(parser: argparse.ArgumentParser, suppress: bool = False) -> None:
+    """
+    The common --profile / --profile-memory options of every CLI entry point.
+    suppress leaves the attributes unset when the option is not given, for
+    subcommand parsers that must not overwrite the top-level value.
+    """
+    default = {"default": argparse.SUPPRESS} if suppress else {}
+    parser.add_argument(
+        "--profile", nargs="?", const="profile", metavar="PREFIX",
+        help="Run under cProfile; writes PREFIX.pstats and PREFIX.collapsed (flamegraph input). Default prefix: profile",
+        **default,
+    )
+    parser.add_argument(
+        "--profile-memory", action="store_true",
+        help="Trace allocations with tracemalloc; report peak memory, top allocation sites and memory per stage",
+        **default,
+    )
+
+
+class _ProfileSession:
+    def __init__(self) -> None:
+        self.profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def add(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            self.profiles.append(profile)
+
+    def stats(self) -> pstats.Stats:
+        stats = pstats.Stats(self.profiles[0], stream=io.StringIO())
+        for profile in self.profiles[1:]:
+            stats.add(profile)
+        return stats
+
+
+_active_session: Optional[_ProfileSession] = None
+
+
+@contextlib.contextmanager
+def profile_thread() -> Iterator[None]:
+    """
+    cProfile only sees the thread it was enabled in. Worker threads (the
+    artifact DAG) wrap their work in this so it is merged into the session.
+    """
+    session = _active_session
+    if session is None:
+        yield
+        return
+
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Python 3.12+ profiles all threads from the main profiler already.
+        yield
+        return
+    try:
+        yield
+    finally:
+        profile.disable()
+        session.add(profile)
+
+
+def _label(func: tuple) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name.strip("<>").replace(" ", "_")
+    return f"{Path(filename).stem}:{name}:{line}"
+
+
+def write_collapsed_stacks(stats: pstats.Stats, path: Path, max_depth: int = 64) -> None:
+    """
+    Collapsed stacks ("a;b;c <microseconds>") for flamegraph.pl, speedscope or
+    inferno. cProfile keeps caller/callee edges rather than full stacks, so
+    each edge's time is split over the paths that reach it in proportion to
+    their share of the callee's total; recursion is cut at the first repeat.
+    """
+    entries = stats.stats
+    callees: dict[tuple, list[tuple[tuple, float]]] = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    lines: dict[str, float] = {}
+
+    def walk(func: tuple, stack: list[str], seen: set, share: float) -> None:
+        _, _, tt, ct, _ = entries[func]
+        if ct * share < 1e-6:
+            # Below a microsecond; also keeps wide call graphs (pandas) tractable.
+            return
+        frame = stack + [_label(func)]
+        key = ";".join(frame)
+        lines[key] = lines.get(key, 0.0) + tt * share
+
+        if len(frame) >= max_depth:
+            return
+        for callee, edge_ct in callees.get(func, ()):
+            if callee in seen:
+                continue
+            callee_ct = entries[callee][3]
+            if callee_ct > 0:
+                walk(callee, frame, seen | {callee}, share * edge_ct / callee_ct)
+
+    # A stack starts wherever a function's time is not covered by its callers
+    # (the profiled block's entry frames, thread entry points).
+    for func, (_, _, _, ct, callers) in entries.items():
+        uncovered = ct - sum(edge[3] for edge in callers.values())
+        if ct > 0 and uncovered > 1e-6:
+            walk(func, [], {func}, uncovered / ct)
+
+    with open(path, "w", encoding="utf-8") as f:
+        for key, seconds in sorted(lines.items()):
+            micros = int(seconds * 1_000_000)
+            if micros > 0:
+                f.write(f"{key} {micros}\n")
+
+
+def _memory_by_stage() -> list[tuple[str, int, int]]:
+    totals: dict[str, list[int]] = {}
+    for event in recorder.events():
+        total = totals.setdefault(event.name, [0, 0])
+        total[0] += event.memory
+        total[1] = max(total[1], event.memory)
+    return sorted(((name, t[0], t[1]) for name, t in totals.items()), key=lambda item: item[2], reverse=True)
+
+
+def print_memory_report(snapshot: tracemalloc.Snapshot, peak: int) -> None:
+    print(f"🧠 PEAK TRACED MEMORY: {peak / 1024 / 1024:,.1f} MiB")
+
+    print(f"🧠 TOP {TOP_N} ALLOCATION SITES (live at end of run)")
+    for stat in snapshot.statistics("lineno")[:TOP_N]:
+        frame = stat.traceback[0]
+        print(f"   {stat.size / 1024:>10,.1f} KiB {stat.count:>8,} blocks  {frame.filename}:{frame.lineno}")
+
+    stages = _memory_by_stage()
+    if stages:
+        print(f"🧠 {'STAGE':<36} {'NET KiB':>12} {'MAX KiB':>12}")
+        for name, total, largest in stages[:TOP_N]:
+            print(f"   {name:<36} {total / 1024:>12,.1f} {largest / 1024:>12,.1f}")
+
+
+@contextlib.contextmanager
+def profile_session(profile: Optional[str] = None, profile_memory: bool = False) -> Iterator[None]:
+    """
+    Run the enclosed command under cProfile and/or tracemalloc, as selected by
+    --profile / --profile-memory. Reports are written even if the command exits
+    via sys.exit. Batch workers run in other processes and are not included.
+    """
+    global _active_session
+
+    if not profile and not profile_memory:
+        yield
+        return
+
+    session = None
+    main_profile = None
+    if profile:
+        session = _active_session = _ProfileSession()
+        main_profile = cProfile.Profile()
+
+    if profile_memory:
+        tracemalloc.start(MEMORY_FRAMES)
+
+    if main_profile:
+        main_profile.enable()
+    try:
+        yield
+    finally:
+        if main_profile:
+            main_profile.disable()
+            session.add(main_profile)
+            _active_session = None
+
+        if profile_memory:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print_memory_report(snapshot, peak)
+
+        if session:
+            stats = session.stats()
+            pstats_path = Path(f"{profile}.pstats")
+            collapsed_path = Path(f"{profile}.collapsed")
+            stats.dump_stats(pstats_path)
+            write_collapsed_stacks(stats, collapsed_path)
+
+            summary = io.StringIO()
+            stats.stream = summary
+            stats.sort_stats("cumulative").print_stats(TOP_N)
+            print(summary.getvalue().rstrip())
+            print(f"🔬 PROFILE: {pstats_path.resolve()}")
+            print(f"🔬 FLAMEGRAPH INPUT: {collapsed_path.resolve()}")
@@ -0,0 +1,147 @@
+import time
+import importlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from components.c_headless import GENERATORS, resolve_generator_paths
+from components.c_instrumentation import print_timings, recorder
+
+# Rule tables shared by every generator (standardization, cluster sizing,
+# calibration, cluster policy, spark_conf); an edit affects every session.
+RULE_TABLE_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+
+def rule_tables() -> list[Path]:
+    return sorted(RULE_TABLE_DIR.glob("*.json"))
+
+
+@dataclass
+class SessionRun:
+    results: list
+    seconds: float
+    changed: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.results)
+
+
+class GeneratorSession:
+    """
+    A long-lived generator. The generator module (and pandas with it) is
+    imported once; the parsed workbook and compiled templates stay in memory
+    and are re-read only when their size or mtime changes, so a regeneration
+    after editing one cell costs one workbook parse plus the changed artifacts.
+    """
+
+    def __init__(
+        self,
+        command: str = "generate",
+        context: Optional[str] = None,
+        templates: Optional[str] = None,
+        output: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> None:
+        self.command = command
+        self.workbook, self.template_dir, self.output_dir = resolve_generator_paths(command, context, templates, output)
+        self.use_cache = use_cache
+        self.generator = importlib.import_module(GENERATORS[command][0])
+        self._snapshot: dict[str, tuple[int, int]] = {}
+
+    def _inputs(self) -> dict[str, tuple[int, int]]:
+        inputs = {}
+        for path in [self.workbook, *sorted(self.template_dir.glob("*.txt")), *rule_tables()]:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            inputs[path.name] = (stat.st_mtime_ns, stat.st_size)
+        return inputs
+
+    def changed_inputs(self) -> list[str]:
+        """Inputs added, removed or modified since the last run."""
+        current = self._inputs()
+        names = set(current) | set(self._snapshot)
+        return sorted(name for name in names if current.get(name) != self._snapshot.get(name))
+
+    def warm_up(self) -> float:
+        """Parse the workbook and compile every template ahead of the first run."""
+        from components.c_template_engine import load_template, set_template_disk_cache
+        from components.c_workbook_loader import load_workbook_model
+
+        start = time.perf_counter()
+        set_template_disk_cache(self.use_cache)
+        load_workbook_model(
+            file_path=self.workbook,
+            read_context=self.generator.read_excel_file,
+            context_sheet='newcontext',
+            schema_sheet='schema',
+            use_cache=self.use_cache
+        )
+        for path in self.template_dir.glob("*.txt"):
+            load_template(path)
+        return time.perf_counter() - start
+
+    def generate(self, incremental: bool = True) -> SessionRun:
+        changed = self.changed_inputs()
+        self._snapshot = self._inputs()
+        recorder.reset()
+
+        start = time.perf_counter()
+        results = self.generator.dbx_main(
+            use_cache=self.use_cache, incremental=incremental,
+            workbook_path=self.workbook, template_dir=self.template_dir, output_dir=self.output_dir
+        )
+        return SessionRun(results=results, seconds=time.perf_counter() - start, changed=changed)
+
+
+def print_session_help():
+    print("""
+Available commands:
+  gen (or Enter)       - Regenerate what changed since the last run
+  force                - Regenerate every artifact
+  status               - Show inputs changed since the last run
+  timings              - Per-stage timings of the last run
+  help                 - Show this help message
+  quit/exit/q          - Leave the session
+""")
+
+
+def session_mode(session: GeneratorSession) -> int:
+    """Interactive loop around a GeneratorSession; returns the number of runs."""
+    print(f"🔥 Warm-up: {session.warm_up() * 1000:.0f} ms ({session.workbook.name}, {session.template_dir})")
+    print("Enter 'help' for commands\n")
+
+    runs = 0
+    while True:
+        try:
+            command = input(f"kaizen {session.command}> ").strip().lower()
+        except (KeyboardInterrupt, EOFError):
+            print("\nGoodbye!")
+            break
+
+        if command in ['quit', 'exit', 'q']:
+            print("Goodbye!")
+            break
+        elif command == 'help':
+            print_session_help()
+        elif command == 'status':
+            changed = session.changed_inputs()
+            print(f"📝 Changed: {', '.join(changed)}" if changed else "📝 Nothing changed since the last run.")
+        elif command == 'timings':
+            print_timings()
+        elif command in ['', 'gen', 'force']:
+            try:
+                run = session.generate(incremental=command != 'force')
+            except Exception as e:
+                print(f"❌ {type(e).__name__}: {e}")
+                continue
+            runs += 1
+            status = "✅" if run.ok else "❌"
+            changed = f" after changes to {', '.join(run.changed)}" if run.changed and runs > 1 else ""
+            print(f"{status} Regenerated in {run.seconds * 1000:.0f} ms{changed}")
+        else:
+            print(f"Unknown command: {command}. Try 'help'.")
+
+    return runs
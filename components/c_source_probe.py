@@ -0,0 +1,221 @@
+import os
+import re
+import math
+import time
+import fnmatch
+import statistics
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+# Where p_source_directory is mounted locally (e.g. /mnt/datahub); probing is
+# off unless it is set. An environment variable so batch worker processes see it too.
+PROBE_ROOT_ENV = "SOURCE_PROBE_ROOT"
+# Files stat'ed per task; with at most 2·max_workers tasks in flight, memory
+# stays bounded however many files a directory holds.
+CHUNK_SIZE = 256
+MAX_WORKERS = 16
+# Re-scanning a large mount on every regeneration is wasteful.
+PROBE_MAX_AGE = 300.0
+RUNS_PER_DAY = {"hourly": 24.0, "daily": 1.0, "weekly": 1 / 7, "monthly": 1 / 30}
+DEFAULT_MAX_FILES = 50
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@dataclass
+class SourceProbe:
+    """
+    Streaming aggregates of the files matching a mask: no file list is kept.
+    size_histogram[i] counts files of [2^(i-1), 2^i) bytes (bucket 0: empty
+    files); daily_bytes and daily_files are keyed by UTC day number of mtime.
+    """
+    directory: str
+    file_mask: str
+    file_count: int = 0
+    total_bytes: int = 0
+    largest_bytes: int = 0
+    size_histogram: list[int] = field(default_factory=lambda: [0] * 64)
+    daily_bytes: dict[int, int] = field(default_factory=dict)
+    daily_files: dict[int, int] = field(default_factory=dict)
+    directories: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+    def add(self, size: int, mtime: float) -> None:
+        day = int(mtime // 86400)
+        self.file_count += 1
+        self.total_bytes += size
+        self.largest_bytes = max(self.largest_bytes, size)
+        self.size_histogram[size.bit_length()] += 1
+        self.daily_bytes[day] = self.daily_bytes.get(day, 0) + size
+        self.daily_files[day] = self.daily_files.get(day, 0) + 1
+
+    def merge(self, other: "SourceProbe") -> None:
+        self.file_count += other.file_count
+        self.total_bytes += other.total_bytes
+        self.largest_bytes = max(self.largest_bytes, other.largest_bytes)
+        self.size_histogram = [a + b for a, b in zip(self.size_histogram, other.size_histogram)]
+        for day, size in other.daily_bytes.items():
+            self.daily_bytes[day] = self.daily_bytes.get(day, 0) + size
+        for day, count in other.daily_files.items():
+            self.daily_files[day] = self.daily_files.get(day, 0) + count
+        self.errors += other.errors
+
+    def _runs_per_day(self, frequency: str) -> float:
+        frequency = frequency.strip().lower() if isinstance(frequency, str) else ""
+        return RUNS_PER_DAY.get(frequency, 1.0)
+
+    def bytes_per_run(self, frequency: str = "daily") -> int:
+        """Median daily volume (days with files) spread over the day's runs."""
+        if not self.daily_bytes:
+            return 0
+        return int(statistics.median(self.daily_bytes.values()) / self._runs_per_day(frequency))
+
+    def max_files_per_run(self, frequency: str = "daily") -> int:
+        """Files of the busiest day per run, with 50% headroom; never below the template default."""
+        if not self.daily_files:
+            return DEFAULT_MAX_FILES
+        peak = max(self.daily_files.values()) / self._runs_per_day(frequency)
+        return max(DEFAULT_MAX_FILES, math.ceil(peak * 1.5))
+
+    def median_file_bytes(self) -> int:
+        """Lower bound of the histogram bucket holding the median file."""
+        middle, seen = self.file_count / 2, 0
+        for bucket, count in enumerate(self.size_histogram):
+            seen += count
+            if count and seen >= middle:
+                return 0 if bucket == 0 else 1 << (bucket - 1)
+        return 0
+
+    def summary(self, frequency: str = "daily") -> str:
+        if not self.file_count:
+            return f"no files matching {self.file_mask} in {self.directory} ({self.directories} dirs, {self.seconds:.2f}s)"
+        days = sorted(self.daily_bytes)
+        span = f"{date.fromordinal(_EPOCH_ORDINAL + days[0])} → {date.fromordinal(_EPOCH_ORDINAL + days[-1])}"
+        return (
+            f"{self.file_count:,} files, {_format_bytes(self.total_bytes)} in {self.directories} dirs "
+            f"(median file ≥{_format_bytes(self.median_file_bytes())}, largest {_format_bytes(self.largest_bytes)}), "
+            f"{len(days)} days {span}, {_format_bytes(self.bytes_per_run(frequency))} per run, "
+            f"{self.seconds:.2f}s"
+        )
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024 or unit == "TB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def _mask_pattern(file_mask: str) -> re.Pattern:
+    # A mask without wildcards is a filename prefix, as in the data-sync config.
+    file_mask = file_mask or "*"
+    if not any(char in file_mask for char in "*?["):
+        file_mask += "*"
+    return re.compile(fnmatch.translate(file_mask))
+
+
+def _stat_chunk(entries: list[os.DirEntry], probe: SourceProbe, lock: threading.Lock, slots: threading.Semaphore) -> None:
+    partial = SourceProbe(probe.directory, probe.file_mask)
+    try:
+        for entry in entries:
+            try:
+                stat = entry.stat()
+            except OSError:
+                partial.errors += 1
+                continue
+            partial.add(stat.st_size, stat.st_mtime)
+        with lock:
+            probe.merge(partial)
+    finally:
+        slots.release()
+
+
+def probe_source(
+    directory: str | Path,
+    file_mask: str = "*",
+    recursive: bool = True,
+    max_workers: int = MAX_WORKERS,
+) -> SourceProbe:
+    """
+    Walk directory depth-first with os.scandir and aggregate the files whose name matches
+    file_mask. The listing runs on this thread (d_type needs no stat); the
+    per-file stat calls, the slow part on a network mount, run in chunks on a
+    thread pool, with at most 2·max_workers chunks in flight.
+    """
+    start = time.perf_counter()
+    directory = str(directory)
+    probe = SourceProbe(directory, file_mask)
+    match = _mask_pattern(file_mask).match
+    lock = threading.Lock()
+    slots = threading.Semaphore(max_workers * 2)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        def submit(chunk: list) -> None:
+            slots.acquire()
+            pool.submit(_stat_chunk, chunk, probe, lock, slots)
+
+        # Depth-first: the stack holds the unvisited siblings along one path,
+        # not a whole level of a wide date-partitioned tree.
+        pending = [directory]
+        while pending:
+            path = pending.pop()
+            chunk = []
+            try:
+                with os.scandir(path) as entries:
+                    probe.directories += 1
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if recursive:
+                                    pending.append(entry.path)
+                                continue
+                        except OSError:
+                            continue
+                        if match(entry.name):
+                            chunk.append(entry)
+                            if len(chunk) == CHUNK_SIZE:
+                                submit(chunk)
+                                chunk = []
+            except OSError:
+                with lock:
+                    probe.errors += 1
+            if chunk:
+                submit(chunk)
+
+    probe.seconds = time.perf_counter() - start
+    return probe
+
+
+_probes: dict[tuple[str, str], tuple[float, SourceProbe]] = {}
+_probes_lock = threading.Lock()
+
+
+def probe_for_context(source_directory, file_mask, root: Optional[str] = None) -> Optional[SourceProbe]:
+    """
+    Probe root + source_directory if a probe root is configured (argument or
+    SOURCE_PROBE_ROOT) and the directory exists there; None otherwise, so the
+    typed p_file_size is used. Results are reused for PROBE_MAX_AGE seconds.
+    """
+    root = root or os.getenv(PROBE_ROOT_ENV)
+    if not root or not isinstance(source_directory, str) or not source_directory.strip():
+        return None
+    directory = Path(root) / source_directory.strip().lstrip("/\\")
+    if not directory.is_dir():
+        print(f"⚠️  Source probe: {directory} not found; using the typed file size")
+        return None
+
+    file_mask = file_mask if isinstance(file_mask, str) else "*"
+    key = (str(directory), file_mask)
+    with _probes_lock:
+        cached = _probes.get(key)
+    if cached and time.monotonic() - cached[0] < PROBE_MAX_AGE:
+        return cached[1]
+
+    probe = probe_source(directory, file_mask)
+    with _probes_lock:
+        _probes[key] = (time.monotonic(), probe)
+    return probe
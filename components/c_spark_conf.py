@@ -0,0 +1,185 @@
+import json
+import math
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from components.c_cluster_calibration import node_vcpus
+from components.c_cluster_compute import split_format
+
+# Size classes and the job cluster spark_conf each one gets (see SparkConfRules).
+DEFAULT_SPARK_RULES_PATH = Path(__file__).resolve().parent.parent / "templates" / "spark_conf_rules.json"
+
+
+@dataclass(frozen=True)
+class SizeClass:
+    """
+    Settings for inputs up to max_gb effective GB (None: no upper bound).
+    target_partition_mb sizes shuffle partitions and the AQE advisory size;
+    max_partition_mb is the read split (spark.sql.files.maxPartitionBytes).
+    """
+    name: str
+    max_gb: Optional[float]
+    target_partition_mb: int
+    max_partition_mb: int
+    skew_join: bool = False
+    optimize_write: bool = True
+    auto_compact: bool = True
+    description: str = ""
+
+
+@dataclass(frozen=True)
+class SparkConfRules:
+    """
+    The rule table, applied by derive_spark_conf:
+
+    - size class: the first whose max_gb holds the effective GB
+    - spark.sql.shuffle.partitions: effective GB / target_partition_mb, at
+      least partitions_per_core per core of the cluster at max_workers,
+      rounded up to whole waves of those cores, at most max_shuffle_partitions
+    - spark.sql.files.maxPartitionBytes: max_partition_mb × the format's
+      split factor (parquet and orc expand in memory, so they split smaller)
+    - AQE: on, coalescing partitions towards target_partition_mb, skew-join
+      handling as the class says
+    - Delta optimized writes: as the class says, and always for tables with
+      partition columns, which otherwise get small files in every partition
+    - Delta auto compaction: as the class says
+    - static: copied as-is, on top of the derived keys
+
+    The rendered map replaces the bundle's ${var.default_spark_conf} in the job
+    templates (YAML cannot merge keys into a bundle variable), so any of its
+    keys that jobs still need belong in static.
+    """
+    size_classes: tuple[SizeClass, ...]
+    format_split_factors: dict = field(hash=False)
+    partitions_per_core: int = 2
+    max_shuffle_partitions: int = 8192
+    static: dict = field(default_factory=dict, hash=False)
+
+    def size_class(self, effective_gb: float) -> SizeClass:
+        for size_class in self.size_classes:
+            if size_class.max_gb is None or effective_gb <= size_class.max_gb:
+                return size_class
+        return self.size_classes[-1]
+
+
+@dataclass
+class SparkConf:
+    size_class: str
+    conf: dict[str, str]
+
+    @property
+    def explanation(self) -> str:
+        return (
+            f"{self.size_class}: {self.conf['spark.sql.shuffle.partitions']} shuffle partitions, "
+            f"{self.conf['spark.sql.files.maxPartitionBytes']} splits, "
+            f"optimized writes {self.conf['spark.databricks.delta.optimizeWrite.enabled']}, "
+            f"auto compaction {self.conf['spark.databricks.delta.autoCompact.enabled']}"
+        )
+
+    def render(self, indent: int = 14) -> str:
+        """What follows 'spark_conf:' in the job template: YAML mapping lines indented by indent spaces."""
+        return "".join(f'\n{" " * indent}"{key}": "{value}"' for key, value in self.conf.items())
+
+
+def parse_spark_conf_rules(data: dict) -> SparkConfRules:
+    size_classes = []
+    for rule in data["size_classes"]:
+        size_class = SizeClass(
+            name=rule["name"],
+            max_gb=rule.get("max_gb"),
+            target_partition_mb=int(rule["target_partition_mb"]),
+            max_partition_mb=int(rule["max_partition_mb"]),
+            skew_join=bool(rule.get("skew_join", False)),
+            optimize_write=bool(rule.get("optimize_write", True)),
+            auto_compact=bool(rule.get("auto_compact", True)),
+            description=rule.get("description", ""),
+        )
+        if size_class.target_partition_mb <= 0 or size_class.max_partition_mb <= 0:
+            raise ValueError(f"Spark conf size class {size_class.name!r}: partition sizes must be positive")
+        size_classes.append(size_class)
+    if not size_classes:
+        raise ValueError("Spark conf rules need at least one size class")
+
+    return SparkConfRules(
+        size_classes=tuple(size_classes),
+        format_split_factors={k.lower(): float(v) for k, v in data.get("format_split_factors", {}).items()},
+        partitions_per_core=int(data.get("partitions_per_core", 2)),
+        max_shuffle_partitions=int(data.get("max_shuffle_partitions", 8192)),
+        static={k: str(v) for k, v in data.get("static", {}).items()},
+    )
+
+
+_spark_rules: dict[Path, tuple[int, int, SparkConfRules]] = {}
+_spark_rules_lock = threading.Lock()
+
+
+def load_spark_conf_rules(path: str | Path = DEFAULT_SPARK_RULES_PATH) -> SparkConfRules:
+    """Parse the rule table once, again only after it changes."""
+    path = Path(path).resolve()
+    stat = path.stat()
+
+    with _spark_rules_lock:
+        cached = _spark_rules.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    rules = parse_spark_conf_rules(json.loads(path.read_text(encoding="utf-8")))
+    with _spark_rules_lock:
+        _spark_rules[path] = (stat.st_mtime_ns, stat.st_size, rules)
+    return rules
+
+
+def derive_spark_conf(
+    effective_gb: float,
+    file_format: str = "csv",
+    partition_columns: str = "",
+    node_type_id: str = "i3.xlarge",
+    max_workers: int = 1,
+    file_mask: str = "",
+    path: str | Path = DEFAULT_SPARK_RULES_PATH,
+) -> SparkConf:
+    """spark_conf for the job cluster, by the SparkConfRules table."""
+    rules = load_spark_conf_rules(path)
+    size_class = rules.size_class(effective_gb)
+    file_format, _ = split_format(file_format, file_mask)
+    # Empty Excel cells arrive as NaN.
+    partitioned = isinstance(partition_columns, str) and any(c.strip() for c in partition_columns.split(","))
+
+    cores = max(1, max_workers) * node_vcpus(node_type_id)
+    by_size = math.ceil(effective_gb * 1024 / size_class.target_partition_mb)
+    waves = math.ceil(max(by_size, rules.partitions_per_core * cores) / cores)
+    shuffle_partitions = min(waves * cores, rules.max_shuffle_partitions)
+    split_mb = max(1, round(size_class.max_partition_mb * rules.format_split_factors.get(file_format, 1.0)))
+
+    conf = {
+        "spark.sql.shuffle.partitions": str(shuffle_partitions),
+        "spark.sql.files.maxPartitionBytes": f"{split_mb}m",
+        "spark.sql.adaptive.enabled": "true",
+        "spark.sql.adaptive.coalescePartitions.enabled": "true",
+        "spark.sql.adaptive.advisoryPartitionSizeInBytes": f"{size_class.target_partition_mb}m",
+        "spark.sql.adaptive.skewJoin.enabled": str(size_class.skew_join).lower(),
+        "spark.databricks.delta.optimizeWrite.enabled": str(size_class.optimize_write or partitioned).lower(),
+        "spark.databricks.delta.autoCompact.enabled": str(size_class.auto_compact).lower(),
+    }
+    conf.update(rules.static)
+    return SparkConf(size_class=size_class.name, conf=conf)
+
+
+if __name__ == "__main__":
+    # One feed per size class, plus the format and partitioning rules.
+    rules = load_spark_conf_rules()
+    for size_class in rules.size_classes:
+        print(f"{size_class.name:<7} ≤ {size_class.max_gb or '∞'} GB  {size_class.description}")
+    print()
+    for effective_gb, file_format, partition_columns, node_type_id, max_workers in [
+        (0.3, "csv", "", "i3.xlarge", 1),
+        (0.3, "csv", "file_date", "i3.xlarge", 1),
+        (4.0, "csv.gz", "", "i3.4xlarge", 8),
+        (4.0, "parquet", "", "i3.4xlarge", 8),
+        (40.0, "csv", "file_date, region", "i3.16xlarge", 64),
+        (600.0, "parquet", "", "i3.16xlarge", 512),
+    ]:
+        spark_conf = derive_spark_conf(effective_gb, file_format, partition_columns, node_type_id, max_workers)
+        print(f"{effective_gb:g} GB {file_format} ({partition_columns or 'unpartitioned'}, {node_type_id} × {max_workers}) → {spark_conf.explanation}")
@@ -0,0 +1,163 @@
+import json
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from components.c_workbook_loader import SchemaModel
+
+# Shared by every generator variant (standard, optima, genz).
+DEFAULT_RULES_PATH = Path(__file__).resolve().parent.parent / "templates" / "standardization_rules.json"
+
+
+@dataclass(frozen=True)
+class ColumnRule:
+    """
+    One standardization rule. A column matches when its data type (if given)
+    and field name (field_names if given, minus exclude_fields) match; the
+    first matching rule in table order wins, so specific rules come first.
+    """
+    name: str
+    function: str
+    data_type: Optional[str] = None
+    field_names: frozenset[str] = frozenset()
+    exclude_fields: frozenset[str] = frozenset()
+    with_source: bool = True
+    target: Optional[str] = None
+    parameters: dict = field(default_factory=dict, hash=False)
+
+
+@dataclass(frozen=True)
+class PartitionRule:
+    partitions: frozenset[str]
+    entry: dict = field(hash=False)
+
+
+def _first_match(rules: tuple[ColumnRule, ...], data_type: Optional[str], field_name: Optional[str]) -> int:
+    for index, rule in enumerate(rules):
+        if rule.data_type and rule.data_type != data_type:
+            continue
+        if rule.field_names and field_name not in rule.field_names:
+            continue
+        if field_name in rule.exclude_fields:
+            continue
+        return index
+    return -1
+
+
+def compile_column_rules(rules: tuple[ColumnRule, ...]) -> dict:
+    """
+    Precompile the ordered rules into {data_type: (overrides, default)}: a
+    column resolves to overrides.get(field_name, default), one dict lookup
+    instead of walking the rules. Only names some rule mentions can differ
+    from the default. The None key covers data types no rule names.
+    """
+    compiled = {}
+    for data_type in {rule.data_type for rule in rules if rule.data_type} | {None}:
+        named = set()
+        for rule in rules:
+            if rule.data_type in (None, data_type):
+                named |= rule.field_names | rule.exclude_fields
+        compiled[data_type] = (
+            {name: _first_match(rules, data_type, name) for name in named},
+            _first_match(rules, data_type, None),
+        )
+    return compiled
+
+
+@dataclass(frozen=True)
+class RuleTable:
+    column_rules: tuple[ColumnRule, ...]
+    partition_rules: dict = field(hash=False)
+    compiled: dict = field(init=False, repr=False, compare=False, hash=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "compiled", compile_column_rules(self.column_rules))
+
+    def standardization(self, schema: SchemaModel, p_header: str = '') -> list[dict]:
+        """
+        Standardization entries, one per column that matches a rule, in schema
+        order, in a single pass over the schema. A header file reads columns by
+        (lower-cased) name, a headerless one by its positional iterator.
+        """
+        header = p_header == "true"
+        rules, compiled = self.column_rules, self.compiled
+        other = compiled[None]
+
+        entries = []
+        for column in schema:
+            if not (column.field_name and column.data_type):
+                continue
+            field_name = column.field_name.lower() if header else column.field_name
+            overrides, default = compiled.get(column.data_type.lower(), other)
+            index = overrides.get(field_name, default)
+            if index < 0:
+                continue
+
+            rule = rules[index]
+            parameters = {**rule.parameters, "target_column_name": rule.target or field_name}
+            if rule.with_source:
+                entries.append({
+                    "standardize_function": rule.function,
+                    "source_column_name": field_name if header else column.iterator,
+                    "additional_parameters": parameters,
+                })
+            else:
+                entries.append({"standardize_function": rule.function, "additional_parameters": parameters})
+        return entries
+
+    def target_partitions(self, p_partition_column: str = '', variant: str = "default") -> list[dict]:
+        rules = self.partition_rules.get(variant, self.partition_rules["default"])
+        partitions = []
+        for name in p_partition_column.split(", "):
+            for rule in rules:
+                if name in rule.partitions:
+                    partitions.append(dict(rule.entry))
+                    break
+        return partitions
+
+
+def parse_rule_table(data: dict) -> RuleTable:
+    column_rules = []
+    for rule in data["column_rules"]:
+        if not rule.get("function"):
+            raise ValueError(f"Standardization rule {rule.get('name', '?')!r} has no function")
+        column_rules.append(ColumnRule(
+            name=rule.get("name", rule["function"]),
+            function=rule["function"],
+            data_type=rule["data_type"].lower() if rule.get("data_type") else None,
+            field_names=frozenset(rule.get("field_names", ())),
+            exclude_fields=frozenset(rule.get("exclude_fields", ())),
+            with_source=rule.get("with_source", True),
+            target=rule.get("target"),
+            parameters=dict(rule.get("parameters", {})),
+        ))
+
+    partition_rules = {
+        variant: [PartitionRule(partitions=frozenset(rule["partitions"]), entry=rule["entry"]) for rule in rules]
+        for variant, rules in data.get("partition_rules", {}).items()
+    }
+    if "default" not in partition_rules:
+        raise ValueError("Standardization rules need a 'default' partition_rules list")
+
+    return RuleTable(column_rules=tuple(column_rules), partition_rules=partition_rules)
+
+
+_rule_tables: dict[Path, tuple[int, int, RuleTable]] = {}
+_rule_tables_lock = threading.Lock()
+
+
+def load_rule_table(path: str | Path = DEFAULT_RULES_PATH) -> RuleTable:
+    """Parse the rule file once, again only after it changes."""
+    path = Path(path).resolve()
+    stat = path.stat()
+
+    with _rule_tables_lock:
+        cached = _rule_tables.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    table = parse_rule_table(json.loads(path.read_text(encoding="utf-8")))
+    with _rule_tables_lock:
+        _rule_tables[path] = (stat.st_mtime_ns, stat.st_size, table)
+    return table
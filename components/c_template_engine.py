@@ -0,0 +1,152 @@
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from components.c_disk_cache import CacheStats, DiskCache
+from components.c_instrumentation import record_read, stage
+
+# <placeholder> tokens as used across templates/phase1 (e.g. <pipeline>, <p_tier>).
+PLACEHOLDER_PATTERN = re.compile(r"<[A-Za-z_][A-Za-z0-9_]*>")
+
+# Tokens that look like placeholders but are meant to stay in the output,
+# by template file name: usage text in the runner script, and the sample
+# column of the check_null rule in the JSON config templates.
+LITERAL_TOKENS: dict[str, frozenset[str]] = {
+    "data_sync_runner.txt": frozenset({"<process_mode>", "<environment>"}),
+    "dbx_json_template.txt": frozenset({"<column>"}),
+    "dbx_json_template_genz.txt": frozenset({"<column>"}),
+    "dbx_json_template_optima.txt": frozenset({"<column>"}),
+}
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    A template split once into alternating literal and placeholder segments:
+    literals[0] placeholders[0] literals[1] ... placeholders[n-1] literals[n]
+    """
+    literals: tuple[str, ...]
+    placeholders: tuple[str, ...]
+
+    @property
+    def inventory(self) -> frozenset[str]:
+        return frozenset(self.placeholders)
+
+
+@dataclass
+class RenderResult:
+    text: str
+    unknown: list[str] = field(default_factory=list)
+    empty: list[str] = field(default_factory=list)
+
+
+def compile_template_text(text: str) -> CompiledTemplate:
+    literals = []
+    placeholders = []
+    position = 0
+
+    for match in PLACEHOLDER_PATTERN.finditer(text):
+        literals.append(text[position:match.start()])
+        placeholders.append(match.group(0))
+        position = match.end()
+    literals.append(text[position:])
+
+    return CompiledTemplate(literals=tuple(literals), placeholders=tuple(placeholders))
+
+
+def _template_from_json(data: dict) -> CompiledTemplate:
+    literals, placeholders = data["literals"], data["placeholders"]
+    if len(literals) != len(placeholders) + 1 or not all(isinstance(s, str) for s in (*literals, *placeholders)):
+        raise ValueError("Cached template is malformed")
+    return CompiledTemplate(literals=tuple(literals), placeholders=tuple(placeholders))
+
+
+_compiled_templates: dict[Path, tuple[int, int, CompiledTemplate]] = {}
+_compiled_templates_lock = threading.Lock()
+
+# Tokenized templates are also kept in the local per-user cache directory,
+# so a fresh process does not re-tokenize a template that has not changed.
+template_cache_stats = CacheStats()
+_disk_cache_enabled = True
+
+
+def set_template_disk_cache(enabled: bool) -> None:
+    global _disk_cache_enabled
+    _disk_cache_enabled = enabled
+
+
+def load_template(path: str | Path, encoding: str = "utf-8") -> CompiledTemplate:
+    """Compile a template file, reusing the compiled form until the file changes."""
+    path = Path(path).resolve()
+    stat = path.stat()
+
+    with _compiled_templates_lock:
+        cached = _compiled_templates.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    def build() -> CompiledTemplate:
+        record_read(stat.st_size)
+        return compile_template_text(path.read_text(encoding=encoding))
+
+    with stage("load_template", file=path.name):
+        if _disk_cache_enabled:
+            cache = DiskCache(
+                namespace=f"template-{encoding}",
+                encode=lambda t: {"literals": list(t.literals), "placeholders": list(t.placeholders)},
+                decode=_template_from_json,
+                max_entries=256,
+                stats=template_cache_stats,
+            )
+            template = cache.get_or_build(path, build)
+        else:
+            template = build()
+
+    with _compiled_templates_lock:
+        _compiled_templates[path] = (stat.st_mtime_ns, stat.st_size, template)
+
+    return template
+
+
+def render_template(template: CompiledTemplate, replacements: dict[str, str]) -> RenderResult:
+    """
+    Fill every placeholder in a single pass. Placeholders with no entry in
+    replacements are left as-is and reported as unknown; entries that are
+    present but empty are reported as empty.
+    """
+    with stage("render_template"):
+        parts = [template.literals[0]]
+        unknown = []
+        empty = []
+
+        for token, literal in zip(template.placeholders, template.literals[1:]):
+            value = replacements.get(token)
+            if value is None:
+                unknown.append(token)
+                parts.append(token)
+            else:
+                if value == "":
+                    empty.append(token)
+                parts.append(value)
+            parts.append(literal)
+
+        return RenderResult(
+            text="".join(parts),
+            unknown=list(dict.fromkeys(unknown)),
+            empty=list(dict.fromkeys(empty)),
+        )
+
+
+def report_placeholders(name: str, result: RenderResult, template_name: Optional[str] = None) -> None:
+    """
+    Warn about placeholders left unfilled or filled with nothing. Tokens the
+    template (template_name, default name) keeps on purpose are not reported.
+    """
+    literal = LITERAL_TOKENS.get(template_name or name, frozenset())
+    unknown = [token for token in result.unknown if token not in literal]
+    if unknown:
+        print(f"⚠️  {name}: unknown placeholder(s) left as-is: {', '.join(unknown)}")
+    if result.empty:
+        print(f"⚠️  {name}: placeholder(s) filled with empty value: {', '.join(result.empty)}")
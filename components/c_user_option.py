@@ -1,15 +1,17 @@
-from InquirerPy import inquirer
+DEFAULT_CHOICES = ["Run databricks generator!", "Run databricks batch generator!", "Create MOP", "Create Sharepoint"]
 
 
-def ai_options():
+def ai_options(choices=None):
+    # Imported here so --help and --startup-report never load prompt_toolkit.
+    from InquirerPy import inquirer
 
     pick = inquirer.select(
         message="I got you, what do you want? :",
-        choices=["Run databricks generator!", "Create MOP", "Create Sharepoint"],
+        choices=choices or DEFAULT_CHOICES,
         default="bright",
     ).execute()
 
     return pick
 
 if __name__ == "__main__":
-    ai_options()
\ No newline at end of file
+    ai_options()
@@ -0,0 +1,175 @@
+import time
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from components.c_session import RULE_TABLE_DIR, GeneratorSession, rule_tables
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # optional; fall back to polling
+    FileSystemEventHandler = object
+    Observer = None
+
+POLL_INTERVAL = 0.5
+DEBOUNCE = 0.3
+# Excel's owner/lock files and editor swap files are written while a file is open.
+IGNORED_PREFIXES = ("~$", ".~", ".#")
+
+
+@dataclass
+class WatchStats:
+    rebuilds: int = 0
+    failures: int = 0
+    latencies: list[float] = field(default_factory=list)
+
+    def summary(self) -> str:
+        if not self.latencies:
+            return f"{self.rebuilds} rebuild(s), {self.failures} failure(s)"
+        latencies = sorted(self.latencies)
+        median = latencies[len(latencies) // 2]
+        return (
+            f"{self.rebuilds} rebuild(s), {self.failures} failure(s), "
+            f"save → output median {median * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms"
+        )
+
+
+class _ChangeSignal(FileSystemEventHandler):
+    """watchdog handler that only wakes the watch loop; the snapshot diff decides what changed."""
+
+    def __init__(self, event: threading.Event) -> None:
+        super().__init__()
+        self._event = event
+
+    def on_any_event(self, event) -> None:
+        self._event.set()
+
+
+class InputWatcher:
+    """
+    Watches the context workbooks and the template directory of one or more
+    generator sessions, plus the shared rule tables, and regenerates only the
+    sessions an edit affects: a workbook change reruns its own generator, a
+    template or rule table change reruns all of them. Inside each run the
+    output manifest skips every artifact whose inputs did not change.
+    """
+
+    def __init__(
+        self,
+        sessions: list[GeneratorSession],
+        debounce: float = DEBOUNCE,
+        poll_interval: float = POLL_INTERVAL,
+        use_watchdog: bool = True,
+    ) -> None:
+        self.sessions = sessions
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_watchdog = use_watchdog and Observer is not None
+        self.stats = WatchStats()
+        self._wake = threading.Event()
+
+    def _watched(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        paths = set(rule_tables())
+        for session in self.sessions:
+            paths.add(session.workbook)
+            paths.update(session.template_dir.iterdir() if session.template_dir.is_dir() else ())
+        for path in paths:
+            if path.name.startswith(IGNORED_PREFIXES) or not path.is_file():
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    @staticmethod
+    def _diff(before: dict, after: dict) -> set[Path]:
+        return {path for path in set(before) | set(after) if before.get(path) != after.get(path)}
+
+    def affected(self, changed: set[Path]) -> list[GeneratorSession]:
+        if any(path.parent == RULE_TABLE_DIR for path in changed):
+            return list(self.sessions)
+        return [
+            session for session in self.sessions
+            if session.workbook in changed or any(path.parent == session.template_dir for path in changed)
+        ]
+
+    def _wait_for_change(self, snapshot: dict) -> tuple[dict, set[Path]]:
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            current = self._watched()
+            changed = self._diff(snapshot, current)
+            if changed:
+                return current, changed
+
+    def _settle(self, snapshot: dict, changed: set[Path]) -> tuple[dict, set[Path]]:
+        # Debounce: wait until the inputs stop changing (Excel saves in several writes).
+        while True:
+            time.sleep(self.debounce)
+            current = self._watched()
+            more = self._diff(snapshot, current)
+            if not more:
+                return snapshot, changed
+            snapshot, changed = current, changed | more
+
+    def _rebuild(self, changed: set[Path]) -> None:
+        saved_at = max((path.stat().st_mtime for path in changed if path.exists()), default=time.time())
+        names = ", ".join(sorted(path.name for path in changed))
+        sessions = self.affected(changed)
+        if not sessions:
+            return
+
+        print(f"📝 Changed: {names}")
+        for session in sessions:
+            try:
+                run = session.generate(incremental=True)
+                ok = run.ok
+            except Exception as e:
+                print(f"❌ {session.command}: {type(e).__name__}: {e}")
+                ok = False
+
+            latency = time.time() - saved_at
+            self.stats.rebuilds += 1
+            if ok:
+                self.stats.latencies.append(latency)
+                print(f"✅ {session.command}: save → output {latency * 1000:.0f} ms (generate {run.seconds * 1000:.0f} ms)")
+            else:
+                self.stats.failures += 1
+                print(f"❌ {session.command}: regeneration failed, still watching")
+
+    def run(self, max_rebuilds: Optional[int] = None) -> WatchStats:
+        observer = None
+        if self.use_watchdog:
+            observer = Observer()
+            directories = {session.workbook.parent for session in self.sessions}
+            directories.update(session.template_dir for session in self.sessions)
+            directories.add(RULE_TABLE_DIR)
+            for directory in directories:
+                observer.schedule(_ChangeSignal(self._wake), str(directory), recursive=False)
+            observer.start()
+
+        mode = "watchdog events" if observer else f"polling every {self.poll_interval:g}s"
+        for session in self.sessions:
+            print(f"👀 Watching {session.workbook.name}, {session.template_dir} and the rule tables for {session.command} ({mode})")
+            session.warm_up()
+
+        snapshot = self._watched()
+        try:
+            while max_rebuilds is None or self.stats.rebuilds < max_rebuilds:
+                snapshot, changed = self._wait_for_change(snapshot)
+                snapshot, changed = self._settle(snapshot, changed)
+                self._rebuild(changed)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if observer:
+                observer.stop()
+                observer.join()
+
+        print(f"👋 WATCH: {self.stats.summary()}")
+        return self.stats
@@ -0,0 +1,160 @@
+import threading
+import typing
+import pandas as pd
+from dataclasses import dataclass, field, fields, is_dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from components.c_disk_cache import CacheStats, DiskCache
+from components.c_instrumentation import record_read, record_rows, stage
+
+
+# Hit/miss counters for the parsed-workbook cache, accumulated per process.
+workbook_cache_stats = CacheStats()
+
+# Models already parsed by this process, validated by mtime and size, so a
+# long-running session only re-reads a workbook after it is saved again.
+_resident_models: dict[tuple, tuple[int, int, "WorkbookModel"]] = {}
+_resident_models_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class SchemaColumn:
+    iterator: str
+    field_name: str
+    data_type: str
+    comment: str = ""
+    tag_key: str = ""
+
+
+@dataclass
+class SchemaModel:
+    columns: list[SchemaColumn] = field(default_factory=list)
+
+    def __iter__(self) -> Iterator[SchemaColumn]:
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+
+@dataclass
+class WorkbookModel:
+    context: Any
+    schema: SchemaModel
+
+
+def schema_to_json(schema: SchemaModel) -> list[list[str]]:
+    return [[c.iterator, c.field_name, c.data_type, c.comment, c.tag_key] for c in schema]
+
+
+def schema_from_json(data: list) -> SchemaModel:
+    columns = []
+    for row in data:
+        if len(row) != 5 or not all(isinstance(value, str) for value in row):
+            raise ValueError("Cached schema row is not five strings")
+        columns.append(SchemaColumn(*row))
+    return SchemaModel(columns=columns)
+
+
+def _context_type(read_context: Callable) -> Optional[type]:
+    """The dataclass read_context is annotated to return, if any."""
+    try:
+        context_type = typing.get_type_hints(read_context).get("return")
+    except Exception:
+        return None
+    return context_type if isinstance(context_type, type) and is_dataclass(context_type) else None
+
+
+def _workbook_codec(context_type: type) -> tuple[Callable, Callable]:
+    names = [f.name for f in fields(context_type)]
+
+    def encode(model: WorkbookModel) -> dict:
+        return {
+            "context": {name: getattr(model.context, name) for name in names},
+            "schema": schema_to_json(model.schema),
+        }
+
+    def decode(data: dict) -> WorkbookModel:
+        context = {name: data["context"][name] for name in names if name in data["context"]}
+        return WorkbookModel(context=context_type(**context), schema=schema_from_json(data["schema"]))
+
+    return encode, decode
+
+
+def _cell_to_str(value) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    return str(value).strip()
+
+
+def read_schema(file_path, sheet: str = 'schema') -> SchemaModel:
+    """
+    Read the schema sheet (A iterator, B field, C type, D comment, E tag key)
+    into an ordered SchemaModel. Accepts a path or an open pd.ExcelFile.
+    """
+    df = pd.read_excel(file_path, sheet_name=sheet).iloc[:, 0:5]
+    df = df.dropna(how="all")
+
+    columns = []
+    for row in df.itertuples(index=False):
+        values = [_cell_to_str(v) for v in row] + [""] * (5 - len(row))
+        columns.append(SchemaColumn(*values[:5]))
+
+    return SchemaModel(columns=columns)
+
+
+def load_workbook_model(
+    file_path,
+    read_context: Callable[[Any, str], Any],
+    context_sheet: str = 'newcontext',
+    schema_sheet: str = 'schema',
+    use_cache: bool = True,
+) -> WorkbookModel:
+    """
+    Open the context workbook once and build both the ContextParam (via the
+    caller's read_context) and the SchemaModel from the same parsed file.
+
+    With use_cache the parsed model is kept in the local per-user cache, so
+    a warm start skips openpyxl entirely until the file changes, and in
+    memory for the rest of the process.
+    """
+    def build() -> WorkbookModel:
+        with stage("parse_workbook"):
+            record_read(Path(file_path).stat().st_size)
+            with pd.ExcelFile(file_path) as xls:
+                context = read_context(xls, context_sheet)
+                schema = read_schema(xls, schema_sheet)
+            record_rows(len(schema))
+
+        return WorkbookModel(context=context, schema=schema)
+
+    with stage("load_workbook", file=Path(file_path).name):
+        if not use_cache:
+            return build()
+
+        reader = f"{read_context.__module__}.{read_context.__qualname__}"
+        key = (str(Path(file_path).resolve()), reader, context_sheet, schema_sheet)
+        stat = Path(file_path).stat()
+        with _resident_models_lock:
+            resident = _resident_models.get(key)
+        if resident and resident[0] == stat.st_mtime_ns and resident[1] == stat.st_size:
+            workbook_cache_stats.hits += 1
+            return resident[2]
+
+        context_type = _context_type(read_context)
+        if context_type is None:
+            # Only dataclass contexts can be rebuilt from the JSON entry.
+            model = build()
+        else:
+            encode, decode = _workbook_codec(context_type)
+            cache = DiskCache(
+                namespace=f"workbook-{reader}-{context_sheet}-{schema_sheet}",
+                encode=encode,
+                decode=decode,
+                stats=workbook_cache_stats,
+            )
+            model = cache.get_or_build(file_path, build)
+        with _resident_models_lock:
+            _resident_models[key] = (stat.st_mtime_ns, stat.st_size, model)
+        return model
@@ -1,6 +1,8 @@
 import os
+import argparse
 import pandas as pd
 from components.c_generate_mop  import replace_placeholders_in_excel
+from components.c_profiling import add_profiling_arguments, profile_session
 from dotenv import load_dotenv
 from dataclasses import dataclass, fields
 from typing import Optional
@@ -28,14 +30,15 @@ def read_excel_file(file_path: str = 'dbx_context_param.xlsx', sheet: str = 'new
 
 
 
-def create_mop():
+def create_mop(context_path: Optional[str] = None, template_dir: Optional[str] = None, output_dir: Optional[str] = None) -> str:
+    """Paths default to dbx_context_param.xlsx, templates/phase1 and output under BASE_PATH."""
     load_dotenv()
     BASE_PATH = os.getenv('BASE_PATH')
 
     parent_output_path = rf"{BASE_PATH}output\\"
     parent_template_path = rf"{BASE_PATH}templates\\phase1\\"
 
-    context = read_excel_file(file_path=rf'{BASE_PATH}dbx_context_param.xlsx', sheet = 'newcontext')
+    context = read_excel_file(file_path=context_path or rf'{BASE_PATH}dbx_context_param.xlsx', sheet = 'newcontext')
     # print(context.p_project_name)
     # print(context.p_jobs_to_deploy)
     # print(context.p_dev)
@@ -47,13 +50,22 @@ def create_mop():
         "<dev>": context.p_dev
     }
 
-    output_file = replace_placeholders_in_excel(
-        rf"{parent_template_path}\Alapaap_wde_mop_template.xlsx", 
-        replacements, 
-        rf"{parent_output_path}\{context.p_project_name}-mop.xlsx"
-    )
+    template_file = rf"{parent_template_path}\Alapaap_wde_mop_template.xlsx"
+    if template_dir:
+        template_file = os.path.join(template_dir, "Alapaap_wde_mop_template.xlsx")
+    output_file = rf"{parent_output_path}\{context.p_project_name}-mop.xlsx"
+    if output_dir:
+        output_file = os.path.join(output_dir, f"{context.p_project_name}-mop.xlsx")
+
+    output_file = replace_placeholders_in_excel(template_file, replacements, output_file)
     print(f"✅ MOP Created: {output_file}")
+    return output_file
 
 if __name__ == "__main__":
-    create_mop()
+    parser = argparse.ArgumentParser(description="Create the MOP workbook from dbx_context_param.xlsx")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    with profile_session(args.profile, args.profile_memory):
+        create_mop()
 
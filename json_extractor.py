@@ -4,6 +4,8 @@ import argparse
 import sys
 import os
 
+from components.c_profiling import add_profiling_arguments, profile_session
+
 class JSONKeyExtractor:
     """
     A class to extract keys from JSON data with various options.
@@ -353,9 +355,16 @@ Examples:
                        help='Show statistics')
     parser.add_argument('--quiet', '-q', action='store_true',
                        help='Suppress informational messages')
+    add_profiling_arguments(parser)
     
     args = parser.parse_args()
     
+    with profile_session(args.profile, args.profile_memory):
+        run(args, parser)
+
+
+def run(args: argparse.Namespace, parser: argparse.ArgumentParser):
+    """Run the extractor for already parsed command line arguments."""
     # Interactive mode
     if args.interactive:
         interactive_mode()
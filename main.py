@@ -1,24 +1,70 @@
-from components.c_data_tech_cli import data_tech_cli
-from components.c_user_option import ai_options
-from components.c_dbx_generator import dbx_main
-from create_mop import create_mop
-from components.c_create_sharepoint import open_link_safe
-from components.c_execution_procedure import open_file_maximized
-from dotenv import load_dotenv
-import os
-
-# data_tech_cli()
-user_choice = ai_options()
-load_dotenv()
-BASE_PATH = os.getenv('BASE_PATH')
-
-if user_choice == "Run databricks generator!":
-    runner = dbx_main()
-elif user_choice == "Create MOP":
-    print("Creating MOP...")
-    create_mop()
-elif user_choice == "Create Sharepoint":
-    print("Create Sharepoint...")
-    open_link_safe("https://pldt365.sharepoint.com/sites/ITDataTechnologies/DataEngineering/SitePages/GDM-Alapaap.aspx")
-else:
-    print(f"That feature(s) {user_choice} is not yet available!")
\ No newline at end of file
+from components.c_command_registry import Command, print_startup_report, run_command
+from components.c_headless import add_headless_commands, apply_probe_root, run_headless
+from components.c_instrumentation import print_timings, write_chrome_trace
+from components.c_profiling import add_profiling_arguments, profile_session
+import argparse
+import sys
+
+SHAREPOINT_URL = "https://pldt365.sharepoint.com/sites/ITDataTechnologies/DataEngineering/SitePages/GDM-Alapaap.aspx"
+
+# Menu label -> implementation, imported only when the entry is selected.
+COMMANDS = {
+    "Run databricks generator!": Command(
+        "components.c_dbx_generator:dbx_main",
+        lambda args: {"use_cache": not args.no_cache, "incremental": not args.force},
+    ),
+    "Run databricks batch generator!": Command(
+        "components.c_dbx_generator:dbx_batch_main",
+        lambda args: {"manifest_path": args.manifest, "max_workers": args.workers,
+                      "use_cache": not args.no_cache, "incremental": not args.force},
+    ),
+    "Create MOP": Command("create_mop:create_mop", announce="Creating MOP..."),
+    "Create Sharepoint": Command(
+        "components.c_create_sharepoint:open_link_safe",
+        lambda args: {"url": SHAREPOINT_URL},
+        announce="Create Sharepoint...",
+    ),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DAE Kaizen CLI. Without a COMMAND an interactive menu is shown.")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-parse the context workbook instead of using the local cache")
+    parser.add_argument("--force", action="store_true", help="Regenerate every artifact, ignoring output/.kaizen-manifest.json")
+    parser.add_argument("--timings", action="store_true", help="Print a per-stage timing, bytes and rows summary")
+    parser.add_argument("--trace", metavar="OUT_JSON", help="Write a Chrome-trace file (chrome://tracing, Perfetto) of every stage")
+    parser.add_argument("--manifest", help="Batch manifest (.xlsx with a 'pipelines' sheet, or .csv); defaults to dbx_context_param.xlsx")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for batch generation (default: CPU count)")
+    parser.add_argument("--probe-root", help="Local mount of the source directories; size clusters from a scan of p_source_directory")
+    parser.add_argument("--startup-report", action="store_true", help="Print the import-time breakdown of the menu and of each command, then exit")
+    add_profiling_arguments(parser)
+    add_headless_commands(parser)
+    args = parser.parse_args()
+
+    if args.startup_report:
+        print_startup_report(COMMANDS)
+        return
+
+    if args.command:
+        sys.exit(run_headless(args))
+
+    apply_probe_root(args)
+
+    # Imported lazily, pyfiglet is only needed if the banner is re-enabled.
+    # from components.c_data_tech_cli import data_tech_cli
+    # data_tech_cli()
+    from components.c_user_option import ai_options
+    user_choice = ai_options(list(COMMANDS))
+
+    # Profile only the selected command, not the time spent in the menu.
+    with profile_session(args.profile, args.profile_memory):
+        run_command(COMMANDS, user_choice, args)
+
+    if args.timings:
+        print_timings()
+    if args.trace:
+        write_chrome_trace(args.trace)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+
+from components.c_batch_generator import EXAMPLE_MANIFEST_PATH, read_pipeline_manifest
+
+
+def _csv(tmp_path, names: list[str]):
+    path = tmp_path / "pipelines.csv"
+    pd.DataFrame({"p_pipeline": names, "p_table_name": ["t"] * len(names)}).to_csv(path, index=False)
+    return path
+
+
+def test_example_manifest_reads():
+    df = read_pipeline_manifest(EXAMPLE_MANIFEST_PATH)
+    assert list(df["p_pipeline"]) == ["opt_dly_descriptions", "opt_wkly_descriptions"]
+
+
+@pytest.mark.parametrize("name", ["../escape", "a/b", "..", "", " padded"])
+def test_unsafe_pipeline_names_are_rejected(tmp_path, name):
+    with pytest.raises(ValueError, match="p_pipeline must be a plain name"):
+        read_pipeline_manifest(_csv(tmp_path, ["ok_one", name]))
+
+
+def test_missing_pipelines_sheet_explains_the_manifest(tmp_path):
+    path = tmp_path / "context.xlsx"
+    pd.DataFrame({"a": [1]}).to_excel(path, sheet_name="newcontext", index=False)
+    with pytest.raises(ValueError, match="no 'pipelines' sheet.*pipelines_example.csv"):
+        read_pipeline_manifest(path)
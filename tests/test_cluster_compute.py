@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+from components.c_cluster_compute import load_calibration, parse_file_size
+
+
+@pytest.mark.parametrize("text, gb", [
+    ("1,000mb", 1000 / 1024),
+    ("1,500,000 bytes", 1_500_000 / 1024 ** 3),
+    ("12,345.5mb", 12345.5 / 1024),
+    ("1,5gb", 1.5),
+    ("1.5TB", 1536.0),
+    ("500mb", 500 / 1024),
+    ("4", 4.0),
+    ("", 0.0),
+])
+def test_parse_file_size(text, gb):
+    assert parse_file_size(text) == pytest.approx(gb)
+
+
+@pytest.mark.parametrize("classes", [
+    [],
+    [{"warehouse_size": "Huge", "max_gb": 10}],
+    [{"warehouse_size": "Small"}],
+])
+def test_malformed_calibration_is_rejected(tmp_path, classes):
+    path = tmp_path / "cluster_calibration.json"
+    path.write_text(json.dumps({"formats": {"csv": {"runs": 9, "classes": classes}}}), encoding="utf-8")
+    with pytest.raises(ValueError, match="'csv'"):
+        load_calibration(path)
+
+
+def test_missing_calibration_keeps_the_ladder(tmp_path):
+    assert load_calibration(tmp_path / "cluster_calibration.json") is None
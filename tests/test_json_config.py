@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from components.c_json_config import build_json_config, dump_json_config
+from components.c_template_engine import compile_template_text
+
+TEMPLATE = compile_template_text('{"delimiter": "<delimeter>", "header_flag": <header_flag>}')
+
+
+def _config(delimiter: str) -> dict:
+    return build_json_config(TEMPLATE, {"<delimeter>": delimiter, "<header_flag>": "true"}, {}).config
+
+
+@pytest.mark.parametrize("typed, expected", [
+    ("\\t", "\t"),
+    ("\\u0001", "\x01"),
+    ("\\\\", "\\"),
+    ("|", "|"),
+    (",", ","),
+])
+def test_delimiter_escapes_are_decoded(typed, expected):
+    assert _config(typed)["delimiter"] == expected
+
+
+def test_tab_delimiter_is_written_as_a_json_tab():
+    assert '"delimiter": "\\t"' in dump_json_config(_config("\\t"))
+
+
+def test_invalid_escape_is_kept_as_typed():
+    assert _config("\\x")["delimiter"] == "\\x"
+
+
+def test_dump_uses_four_space_indent():
+    text = dump_json_config({"a": {"b": "é"}})
+    assert text == json.dumps({"a": {"b": "é"}}, indent=4, ensure_ascii=False)
+    assert '\n        "b": "é"' in text
@@ -0,0 +1,44 @@
+import os
+import stat
+
+import pytest
+
+from components.c_output_writer import OutputWriter
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+
+
+def _mode(path) -> int:
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+@pytest.mark.parametrize("write", [
+    lambda writer, path: writer.write_text(path, "a\nb\n"),
+    lambda writer, path: writer.write_lines(path, ["a", "b"]),
+])
+def test_new_file_gets_the_umask_mode(tmp_path, write):
+    umask = os.umask(0o022)
+    os.umask(umask)
+    path = tmp_path / "job.yml"
+    write(OutputWriter(), path)
+    assert _mode(path) == 0o666 & ~umask
+
+
+@pytest.mark.parametrize("write", [
+    lambda writer, path: writer.write_text(path, "changed\n"),
+    lambda writer, path: writer.write_lines(path, ["changed"]),
+])
+def test_rewritten_file_keeps_its_mode(tmp_path, write):
+    path = tmp_path / "job_runner_daily.sh"
+    path.write_text("old\n")
+    path.chmod(0o755)
+    assert write(OutputWriter(), path)
+    assert _mode(path) == 0o755
+
+
+def test_unchanged_file_is_not_touched(tmp_path):
+    path = tmp_path / "ddl.sql"
+    path.write_text("x\n")
+    path.chmod(0o640)
+    assert not OutputWriter().write_text(path, "x\n", newline="\n")
+    assert _mode(path) == 0o640
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from components.c_spark_conf import DEFAULT_SPARK_RULES_PATH, derive_spark_conf, load_spark_conf_rules
+
+SHUFFLE = "spark.sql.shuffle.partitions"
+SPLIT = "spark.sql.files.maxPartitionBytes"
+OPTIMIZE_WRITE = "spark.databricks.delta.optimizeWrite.enabled"
+AUTO_COMPACT = "spark.databricks.delta.autoCompact.enabled"
+
+
+@pytest.mark.parametrize("effective_gb, size_class", [
+    (0.05, "tiny"),
+    (1.0, "tiny"),
+    (1.001, "small"),
+    (10.0, "small"),
+    (10.5, "medium"),
+    (100.0, "medium"),
+    (100.5, "large"),
+    (5000.0, "large"),
+])
+def test_size_class_boundaries(effective_gb, size_class):
+    assert derive_spark_conf(effective_gb).size_class == size_class
+
+
+@pytest.mark.parametrize("effective_gb, split, advisory, skew_join, optimize_write, auto_compact", [
+    (0.5, "64m", "64m", "false", "false", "true"),
+    (5.0, "128m", "128m", "false", "true", "true"),
+    (50.0, "256m", "200m", "true", "true", "true"),
+    (500.0, "512m", "256m", "true", "true", "false"),
+])
+def test_size_class_settings(effective_gb, split, advisory, skew_join, optimize_write, auto_compact):
+    conf = derive_spark_conf(effective_gb).conf
+    assert conf[SPLIT] == split
+    assert conf["spark.sql.adaptive.advisoryPartitionSizeInBytes"] == advisory
+    assert conf["spark.sql.adaptive.skewJoin.enabled"] == skew_join
+    assert conf[OPTIMIZE_WRITE] == optimize_write
+    assert conf[AUTO_COMPACT] == auto_compact
+    assert conf["spark.sql.adaptive.enabled"] == "true"
+
+
+@pytest.mark.parametrize("file_format, split", [
+    ("csv", "128m"),
+    ("csv.gz", "128m"),
+    ("parquet", "64m"),
+    ("orc", "64m"),
+])
+def test_columnar_formats_split_smaller(file_format, split):
+    assert derive_spark_conf(5.0, file_format).conf[SPLIT] == split
+
+
+@pytest.mark.parametrize("partition_columns, optimize_write", [
+    ("", "false"),
+    (float("nan"), "false"),
+    ("file_date", "true"),
+    ("file_date, region", "true"),
+])
+def test_partitioned_tables_always_optimize_writes(partition_columns, optimize_write):
+    assert derive_spark_conf(0.5, partition_columns=partition_columns).conf[OPTIMIZE_WRITE] == optimize_write
+
+
+def test_shuffle_partitions_floor_is_two_per_core():
+    # 0.3 GB needs 5 partitions of 64 MB; one i3.xlarge worker has 4 cores.
+    assert derive_spark_conf(0.3, node_type_id="i3.xlarge", max_workers=1).conf[SHUFFLE] == "8"
+
+
+def test_shuffle_partitions_round_up_to_whole_waves():
+    # 50 GB / 200 MB = 256 partitions; 3 × i3.4xlarge = 48 cores → 6 waves of 48.
+    conf = derive_spark_conf(50.0, node_type_id="i3.4xlarge", max_workers=3).conf
+    assert int(conf[SHUFFLE]) == 288
+    assert int(conf[SHUFFLE]) % 48 == 0
+
+
+def test_shuffle_partitions_are_capped():
+    rules = load_spark_conf_rules()
+    conf = derive_spark_conf(5000.0, node_type_id="i3.16xlarge", max_workers=512).conf
+    assert int(conf[SHUFFLE]) == rules.max_shuffle_partitions
+
+
+def test_render_emits_the_derived_keys():
+    spark_conf = derive_spark_conf(50.0, "parquet", "file_date", "i3.4xlarge", 3)
+    lines = spark_conf.render().split("\n")
+    assert lines[0] == ""
+    assert len(lines) == len(spark_conf.conf) + 1
+    for key, value in spark_conf.conf.items():
+        assert f'              "{key}": "{value}"' in lines
+    assert "${var." not in spark_conf.render()
+
+
+def test_static_keys_are_rendered_on_top_of_the_derived_ones(tmp_path):
+    data = json.loads(DEFAULT_SPARK_RULES_PATH.read_text(encoding="utf-8"))
+    data["static"] = {"spark.databricks.io.cache.enabled": "true", SPLIT: "96m"}
+    path = tmp_path / "spark_conf_rules.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    lines = derive_spark_conf(5.0, path=path).render(indent=4).split("\n")
+    assert '    "spark.databricks.io.cache.enabled": "true"' in lines
+    assert '    "spark.sql.files.maxPartitionBytes": "96m"' in lines
+    assert '    "spark.sql.files.maxPartitionBytes": "128m"' not in lines
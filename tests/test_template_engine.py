@@ -0,0 +1,24 @@
+from components.c_template_engine import compile_template_text, render_template, report_placeholders
+
+TEMPLATE = compile_template_text("./data_move.sh <process_mode> <environment> # <pipeline> <tier>")
+
+
+def test_literal_tokens_are_not_reported(capsys):
+    result = render_template(TEMPLATE, {"<pipeline>": "opt_dly_items"})
+    report_placeholders("data_sync_runner.txt", result)
+    out = capsys.readouterr().out
+    assert "<tier>" in out
+    assert "<process_mode>" not in out and "<environment>" not in out
+
+
+def test_literal_tokens_are_looked_up_by_template_name(capsys):
+    result = render_template(compile_template_text('"<column>" "<schema>"'), {})
+    report_placeholders("opt_dly_items_config.json", result, "dbx_json_template.txt")
+    out = capsys.readouterr().out
+    assert "<schema>" in out and "<column>" not in out
+
+
+def test_every_placeholder_filled_reports_nothing(capsys):
+    result = render_template(TEMPLATE, {"<pipeline>": "p", "<tier>": "t"})
+    report_placeholders("data_sync_runner.txt", result)
+    assert capsys.readouterr().out == ""
@@ -1,7 +1,10 @@
 import os
 import glob
+import argparse
 import xml.etree.ElementTree as ET
 
+from components.c_profiling import add_profiling_arguments, profile_session
+
 def extract_columns(xml_file):
     tree = ET.parse(xml_file)
     root = tree.getroot()
@@ -40,10 +43,9 @@ def extract_columns(xml_file):
     return results
 
 
-if __name__ == "__main__":
-    input_base_folder = "xml"        # base folder with subfolders
-    output_base_folder = "xml_ddl_output"
-
+def xml_folder_to_ddl(input_base_folder="xml", output_base_folder="xml_ddl_output"):
+    """Convert every .xml under input_base_folder; returns the files written."""
+    written = []
     for root_dir, _, files in os.walk(input_base_folder):
         for file_name in files:
             if file_name.endswith(".xml"):
@@ -65,3 +67,17 @@ if __name__ == "__main__":
                         f.write(row + "\n")
 
                 print(f"✅ Processed {xml_file} → {output_file}")
+                written.append(output_file)
+
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert Talend XML schemas to column lists")
+    parser.add_argument("--input", default="xml", help="Base folder with the XML files (default: xml)")
+    parser.add_argument("--output", default="xml_ddl_output", help="Output base folder (default: xml_ddl_output)")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    with profile_session(args.profile, args.profile_memory):
+        xml_folder_to_ddl(args.input, args.output)